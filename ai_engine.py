@@ -0,0 +1,259 @@
+# ai_engine.py
+from itertools import chain
+from operator import attrgetter
+import numpy as np
+from pathfinding import FIELD_RANGE
+
+# Step options, in the order of the policy score columns: up, down, left, right, hold.
+STEPS = np.array([(0, -1), (0, 1), (-1, 0), (1, 0), (0, 0)])
+HOLD = 4
+# Without a policy of its own or an engine-wide default, the AI civ with id i
+# follows DEFAULT_POLICIES[i % 3]: the first AI civ (id 2) expands, the next
+# attacks, the next defends, and so on.
+DEFAULT_POLICIES = ("attack", "defend", "expand")
+DEFEND_RADIUS = 3   # defenders this close to their capital patrol instead of closing in
+TARGET_BLOCK = 16   # attackers pick targets per TARGET_BLOCK x TARGET_BLOCK block of tiles
+
+class AITurn:
+    """
+    The AI units that can move this turn as parallel arrays: position, civ id,
+    move points, and for each of the five step options its tile, owner, entry
+    cost and whether it is allowed. Policies score the options of some rows;
+    the engine takes the best allowed one.
+    """
+    def __init__(self, game, units, civ):
+        world = game.world
+        self.world = world
+        self.paths = game.paths
+        self.turn = game.turn
+        self.units = units
+        self.civ = civ
+        state = np.fromiter(chain.from_iterable(map(attrgetter("x", "y", "remaining_move"), units)),
+                            dtype=np.float64, count=3 * len(units)).reshape(-1, 3)
+        self.x = state[:, 0].astype(np.int64)
+        self.y = state[:, 1].astype(np.int64)
+        moves = state[:, 2]
+        step_x = self.x[:, None] + STEPS[:, 0]
+        step_y = self.y[:, None] + STEPS[:, 1]
+        inside = (step_x >= 0) & (step_x < world.width) & (step_y >= 0) & (step_y < world.height)
+        self.step_x = np.clip(step_x, 0, world.width - 1)
+        self.step_y = np.clip(step_y, 0, world.height - 1)
+        self.step_cost = game.paths.cost_grid[self.step_y, self.step_x].astype(np.float64)
+        self.step_cost[:, HOLD] = 0
+        self.allowed = inside & (self.step_cost <= moves[:, None])
+        self.step_owner = world.owner[self.step_y, self.step_x]
+        self.capital_x = np.full(len(world.civs), -1, dtype=np.int64)
+        self.capital_y = np.full(len(world.civs), -1, dtype=np.int64)
+        for civ in game.civs:
+            if civ.capital is not None:
+                self.capital_x[world.civ_ids[civ]], self.capital_y[world.civ_ids[civ]] = civ.capital
+
+    def __len__(self):
+        return len(self.units)
+
+    def enemy_field(self, rows):
+        """
+        Route cost from the nearest enemy unit to each step option of rows,
+        read from the pathfinder's "enemy_units" distance field; options with
+        no enemy within FIELD_RANGE read FIELD_RANGE + 1.
+        """
+        cost = self.paths.field("enemy_units", self.civ[rows, None], self.step_x[rows], self.step_y[rows], self.turn)
+        return np.minimum(cost, FIELD_RANGE + 1)
+
+    def enemy_targets(self, rows):
+        """
+        For each of rows, the centroid of the enemy units in the nearest block
+        (Manhattan distance between blocks) that holds any, as (x, y, found).
+        """
+        world = self.world
+        x, y, civ = world.occupancy.unit_arrays(world.civ_ids)
+        blocks_x = -(-world.width // TARGET_BLOCK)
+        blocks_y = -(-world.height // TARGET_BLOCK)
+        blocks = blocks_x * blocks_y
+        block = (y // TARGET_BLOCK) * blocks_x + x // TARGET_BLOCK
+        total = np.bincount(block, minlength=blocks)
+        total_x = np.bincount(block, weights=x, minlength=blocks)
+        total_y = np.bincount(block, weights=y, minlength=blocks)
+        # Per-civ sums only over the (civ, block) pairs that hold units.
+        keys, inverse = np.unique(civ * blocks + block, return_inverse=True)
+        own = np.bincount(inverse)
+        own_x = np.bincount(inverse, weights=x)
+        own_y = np.bincount(inverse, weights=y)
+        # One layer of the block grid per civ among the rows: blocks holding units of any other civ.
+        layer_civs, layer = np.unique(self.civ[rows], return_inverse=True)
+        occupied = np.broadcast_to(total > 0, (len(layer_civs), blocks)).copy()
+        mine = np.isin(keys // blocks, layer_civs)
+        alone = mine & (own == total[keys % blocks])
+        occupied[np.searchsorted(layer_civs, keys[alone] // blocks), keys[alone] % blocks] = False
+        target_by, target_bx, found = nearest_occupied(occupied.reshape(-1, blocks_y, blocks_x))
+        target = (target_by[layer, self.y[rows] // TARGET_BLOCK, self.x[rows] // TARGET_BLOCK] * blocks_x
+                  + target_bx[layer, self.y[rows] // TARGET_BLOCK, self.x[rows] // TARGET_BLOCK])
+        found = found[layer]
+        # Subtract the row's own civ from the target block's totals, where it has units there.
+        pair = self.civ[rows] * blocks + target
+        at = np.minimum(np.searchsorted(keys, pair), len(keys) - 1)
+        has_own = keys[at] == pair
+        n = total[target] - np.where(has_own, own[at], 0)
+        n = np.maximum(n, 1)
+        target_x = (total_x[target] - np.where(has_own, own_x[at], 0)) / n
+        target_y = (total_y[target] - np.where(has_own, own_y[at], 0)) / n
+        return target_x, target_y, found
+
+def nearest_occupied(occupied):
+    """
+    For a (layers, rows, cols) boolean grid, the row and column of the nearest
+    True cell of the same layer (Manhattan distance) for every cell, and
+    whether each layer has any. A separable distance transform: the nearest
+    cell within each row, then the best row for each column, both in two
+    accumulate passes, so memory stays at a few copies of the grid.
+    """
+    layers, rows, cols = occupied.shape
+    far = rows + cols  # farther than any real cell
+    col = np.arange(cols)
+    left = np.maximum.accumulate(np.where(occupied, col, -far), axis=2)
+    right = np.minimum.accumulate(np.where(occupied, col, 2 * far)[:, :, ::-1], axis=2)[:, :, ::-1]
+    row_col = np.where(col - left <= right - col, left, right)
+    row_distance = np.minimum(np.abs(col - row_col), far)
+    # min over r' of |r - r'| + row_distance[r'], carrying r' in the low digits of a packed key.
+    row = np.arange(rows)[:, None]
+    down = np.minimum.accumulate((row_distance - row + rows) * rows + row, axis=1)
+    up = np.minimum.accumulate(((row_distance + row) * rows + row)[:, ::-1], axis=1)[:, ::-1]
+    down_distance = down // rows - rows + row
+    up_distance = up // rows - row
+    best_row = np.where(down_distance <= up_distance, down % rows, up % rows)
+    best_col = np.take_along_axis(row_col, best_row, axis=1)
+    found = occupied.any(axis=(1, 2))
+    best_row[~found] = 0  # any real cell, so lookups stay in range
+    best_col[~found] = 0
+    return best_row, best_col, found
+
+def random_policy(turn, rows, rng):
+    # A random allowed step, as the AI always did.
+    scores = rng.random((len(rows), len(STEPS)))
+    scores[:, HOLD] = -1
+    return scores
+
+def expand_policy(turn, rows, rng):
+    # Push out of the civ's own territory, preferring unowned land over enemy land.
+    owner = turn.step_owner[rows]
+    scores = rng.random((len(rows), len(STEPS))) + 2 * (owner != turn.civ[rows, None]) + (owner == 0)
+    scores[:, HOLD] = -1
+    return scores
+
+def defend_policy(turn, rows, rng):
+    # Fall back on the capital, then patrol the civ's own tiles around it and
+    # close in on enemy units that come within reach.
+    civ = turn.civ[rows]
+    cx, cy = turn.capital_x[civ, None], turn.capital_y[civ, None]
+    distance = np.abs(turn.step_x[rows] - cx) + np.abs(turn.step_y[rows] - cy)
+    noise = rng.random(distance.shape)
+    enemy = turn.enemy_field(rows)
+    threatened = (enemy <= FIELD_RANGE).any(axis=1)
+    patrol = (np.where(threatened[:, None], 0.5 * noise - enemy, noise + 2 * (turn.step_owner[rows] == civ[:, None]))
+              - 4 * (distance > DEFEND_RADIUS))
+    approach = 0.5 * noise - distance
+    scores = np.where(distance[:, HOLD, None] <= DEFEND_RADIUS, patrol, approach)
+    no_capital = cx[:, 0] < 0
+    scores[no_capital] = random_policy(turn, rows[no_capital], rng)
+    return scores
+
+def attack_policy(turn, rows, rng):
+    # Close in on enemy units: down the enemy distance field when one is in
+    # reach, else towards the nearest block that holds any.
+    enemy = turn.enemy_field(rows)
+    scores = 0.5 * rng.random(enemy.shape) - enemy
+    far = ~(enemy <= FIELD_RANGE).any(axis=1)
+    if far.any():
+        target_x, target_y, found = turn.enemy_targets(rows[far])
+        distance = (np.abs(turn.step_x[rows[far]] - target_x[:, None])
+                    + np.abs(turn.step_y[rows[far]] - target_y[:, None]))
+        far_scores = 0.5 * rng.random(distance.shape) - distance
+        far_scores[~found] = random_policy(turn, rows[far][~found], rng)
+        scores[far] = far_scores
+    return scores
+
+# policy(turn, rows, rng) -> (len(rows), len(STEPS)) scores; higher is better.
+POLICIES = {
+    "random": random_policy,
+    "expand": expand_policy,
+    "defend": defend_policy,
+    "attack": attack_policy,
+}
+
+class AIEngine:
+    """
+    Moves the units of every AI civ as one batch per turn. Each civ follows
+    a policy from POLICIES; units step at most one tile and pay the terrain
+    cost of the tile entered. default_policy, when given, replaces the
+    DEFAULT_POLICIES rotation for every civ without a policy of its own.
+    """
+    def __init__(self, game, default_policy=None):
+        if default_policy is not None and default_policy not in POLICIES:
+            raise ValueError(f"Unknown AI policy: {default_policy!r}")
+        self.game = game
+        self.default_policy = default_policy
+        self.policies = {}  # civ -> policy name, for civs not on the default
+
+    def set_policy(self, civ, policy):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown AI policy: {policy!r}")
+        self.policies[civ] = policy
+
+    def policy_of(self, civ):
+        if civ in self.policies:
+            return self.policies[civ]
+        if self.default_policy is not None:
+            return self.default_policy
+        return DEFAULT_POLICIES[self.game.world.civ_ids[civ] % len(DEFAULT_POLICIES)]
+
+    def move_units(self, rng):
+        # Returns how many units moved.
+        game = self.game
+        world = game.world
+        units, civ_ids, counts = [], [], []
+        for civ in game.civs:
+            if civ.alive and not civ.is_human:
+                movable = [unit for unit in civ.units if unit.remaining_move > 0]
+                units += movable
+                civ_ids.append(world.civ_ids[civ])
+                counts.append(len(movable))
+        if not units:
+            return 0
+        turn = AITurn(game, units, np.repeat(np.array(civ_ids, dtype=np.int64), counts))
+        names = list(POLICIES)
+        civ_policy = np.zeros(len(world.civs), dtype=np.int64)
+        for civ, civ_id in world.civ_ids.items():
+            civ_policy[civ_id] = names.index(self.policy_of(civ))
+        unit_policy = civ_policy[turn.civ]
+        scores = np.empty((len(turn), len(STEPS)))
+        for k, name in enumerate(names):
+            rows = np.flatnonzero(unit_policy == k)
+            if len(rows):
+                scores[rows] = POLICIES[name](turn, rows, rng)
+        scores[~turn.allowed] = -np.inf
+        choice = scores.argmax(axis=1)
+        moved = np.flatnonzero(choice != HOLD)
+        xs = turn.step_x[moved, choice[moved]].tolist()
+        ys = turn.step_y[moved, choice[moved]].tolist()
+        movers = [units[i] for i in moved.tolist()]
+        world.occupancy.move_many(movers, xs, ys)
+        for unit, cost in zip(movers, turn.step_cost[moved, choice[moved]].astype(np.int64).tolist()):
+            unit.remaining_move -= cost
+        return len(moved)
+
+    def place_capitals(self, rng):
+        # Each AI civ marks a random tile of its territory as a capital, drawn
+        # in row-major order from the owner grid inside the civ's bounding box.
+        game = self.game
+        world = game.world
+        for civ in game.civs:
+            if not civ.alive or civ.is_human or not civ.territory:
+                continue
+            civ_id = world.civ_ids[civ]
+            x0, y0, x1, y1 = civ.territory.bbox
+            owned = np.flatnonzero(world.owner[y0:y1 + 1, x0:x1 + 1] == civ_id)
+            i = int(owned[rng.integers(len(owned))])
+            x, y = x0 + i % (x1 - x0 + 1), y0 + i // (x1 - x0 + 1)
+            tile = game.map[y][x]
+            if tile and tile.building is None:
+                tile.building = "Capital"
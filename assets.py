@@ -0,0 +1,119 @@
+# assets.py
+import os
+from functools import lru_cache
+import pygame
+
+GFX_DIR = "gfx"
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+ATLAS_PAGE_SIZE = 1024
+
+@lru_cache(maxsize=16)
+def circle_mask(size):
+    # White opaque disc on a transparent background, built once per size.
+    mask_surface = pygame.Surface(size, pygame.SRCALPHA)
+    mask_surface.fill((0, 0, 0, 0))
+    pygame.draw.circle(mask_surface, (255, 255, 255, 255), (size[0] // 2, size[1] // 2), min(size) // 2)
+    return mask_surface
+
+def mask_to_circle(surface):
+    result = surface.copy()
+    result.blit(circle_mask(surface.get_size()), (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+    return result
+
+class CircularViewport:
+    """
+    Persistent SRCALPHA target for the main map view. begin() hands out the
+    cleared surface, finish() masks it to a circle in place, so a frame
+    allocates nothing and never copies the whole map.
+    """
+    def __init__(self):
+        self.surface = None
+        self.mask = None
+
+    def begin(self, size):
+        if self.surface is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size, pygame.SRCALPHA)
+            self.mask = circle_mask(size)
+        self.surface.fill((0, 0, 0, 0))
+        return self.surface
+
+    def finish(self):
+        self.surface.blit(self.mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+        return self.surface
+
+class SpriteAtlas:
+    """
+    Packs sprites into shared SRCALPHA pages with a simple shelf packer and hands
+    out subsurfaces, so every scaled sprite lives in a few large textures.
+    """
+    def __init__(self, page_size=ATLAS_PAGE_SIZE):
+        self.page_size = page_size
+        self.pages = []
+        self.shelf_x = self.shelf_y = self.shelf_height = 0
+
+    def _new_page(self):
+        self.pages.append(pygame.Surface((self.page_size, self.page_size), pygame.SRCALPHA))
+        self.shelf_x = self.shelf_y = self.shelf_height = 0
+
+    def add(self, surface):
+        w, h = surface.get_size()
+        if w > self.page_size or h > self.page_size:
+            return surface
+        if not self.pages:
+            self._new_page()
+        if self.shelf_x + w > self.page_size:
+            self.shelf_x = 0
+            self.shelf_y += self.shelf_height
+            self.shelf_height = 0
+        if self.shelf_y + h > self.page_size:
+            self._new_page()
+        page = self.pages[-1]
+        rect = pygame.Rect(self.shelf_x, self.shelf_y, w, h)
+        page.blit(surface, rect)
+        self.shelf_x += w
+        self.shelf_height = max(self.shelf_height, h)
+        return page.subsurface(rect)
+
+class AssetManager:
+    """
+    Loads every image in gfx/ once and keeps scaled (optionally circle-masked)
+    versions keyed by (asset, size, circle) in a sprite atlas. Images outside
+    gfx/ (e.g. castle.png) are loaded on first request.
+    """
+    def __init__(self, gfx_dir=GFX_DIR):
+        self.gfx_dir = gfx_dir
+        self.images = {}
+        self.sprites = {}
+        self.atlas = SpriteAtlas()
+        if os.path.isdir(gfx_dir):
+            for filename in sorted(os.listdir(gfx_dir)):
+                if filename.lower().endswith(IMAGE_EXTENSIONS):
+                    self.images[filename] = self._load(os.path.join(gfx_dir, filename))
+
+    def _load(self, path):
+        image = pygame.image.load(path)
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        return image
+
+    def has(self, name):
+        return self.image(name) is not None
+
+    def image(self, name):
+        # name is a file in gfx/ or any other path relative to the working directory.
+        if name not in self.images:
+            self.images[name] = self._load(name) if os.path.exists(name) else None
+        return self.images[name]
+
+    def sprite(self, name, size, circle=True):
+        key = (name, tuple(size), circle)
+        if key not in self.sprites:
+            image = self.image(name)
+            if image is None:
+                self.sprites[key] = None
+            else:
+                scaled = pygame.transform.scale(image, key[1])
+                if circle:
+                    scaled = mask_to_circle(scaled)
+                self.sprites[key] = self.atlas.add(scaled)
+        return self.sprites[key]
@@ -0,0 +1,93 @@
+# batch.py
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from map_ import ClimateGrid, CLIMATE_RASTER_FILENAME, CLIMATE_MAPPING
+from map_cache import cache_key, cache_paths, load_cached_map_arrays
+from engine import Game, default_civ_names
+
+BATCH_OUTPUT = "batch_results.jsonl"
+TASKS_PER_WORKER = 8  # seeds are handed out in chunks; more chunks per worker evens out the load
+
+# Per-process map, memory-mapped from the map cache by init_worker.
+_worker_map = None
+
+def init_worker(climate_path, land_path, width, height, quiet=True):
+    global _worker_map
+    # Every worker maps the same cached .npy files, so the grids are shared
+    # through the page cache instead of being pickled per task.
+    climate_codes = np.load(climate_path, mmap_mode="r")
+    land_mask = np.load(land_path, mmap_mode="r")
+    _worker_map = (ClimateGrid(climate_codes), land_mask, width, height)
+    if quiet:
+        sys.stdout = open(os.devnull, "w")
+
+def game_result(game, seed, elapsed):
+    alive = [civ for civ in game.civs if civ.alive]
+    # The largest surviving territory wins; a tie for the lead is a draw (None).
+    leaders = sorted(alive, key=lambda civ: len(civ.territory), reverse=True)[:2]
+    winner = leaders[0] if len(leaders) == 1 or (leaders and len(leaders[0].territory) > len(leaders[1].territory)) else None
+    return {
+        "seed": seed,
+        "winner": winner.name if winner else None,
+        "turns": game.turn,
+        "territory": {civ.name: len(civ.territory) for civ in game.civs},
+        "population": {civ.name: civ.population for civ in game.civs},
+        "alive": [civ.name for civ in alive],
+        "seconds": round(elapsed, 6),
+    }
+
+def play_game(seed, turns, ai_civs):
+    climate_grid, land_mask, width, height = _worker_map
+    start = time.perf_counter()
+    game = Game(width, height, default_civ_names(ai_civs), climate_grid, land_mask, seed)
+    while game.turn < turns and sum(civ.alive for civ in game.civs) > 1:
+        game.step()
+    return game_result(game, seed, time.perf_counter() - start)
+
+def play_games(seeds, turns, ai_civs):
+    return [play_game(seed, turns, ai_civs) for seed in seeds]
+
+def run_batch(games, turns=200, workers=None, downsample_factor=10, ai_civs=4,
+              output=BATCH_OUTPUT, first_seed=0):
+    """
+    Plays seeds first_seed .. first_seed + games - 1 on a process pool and
+    appends one JSON line per game to output as results arrive. Returns a
+    summary dict with the win counts and throughput.
+    """
+    workers = workers or os.cpu_count() or 1
+    # Make sure the cache entry exists before the workers map it.
+    _, _, width, height = load_cached_map_arrays(CLIMATE_RASTER_FILENAME, downsample_factor, CLIMATE_MAPPING)
+    paths = cache_paths(cache_key(CLIMATE_RASTER_FILENAME, downsample_factor, CLIMATE_MAPPING))
+    seeds = list(range(first_seed, first_seed + games))
+    chunk = max(1, len(seeds) // (workers * TASKS_PER_WORKER))
+    wins = {}
+    done = 0
+    start = time.perf_counter()
+    with open(output, "a", encoding="utf-8") as out, \
+            ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                initargs=(paths["climate"], paths["land"], width, height)) as pool:
+        futures = [pool.submit(play_games, seeds[i:i + chunk], turns, ai_civs) for i in range(0, len(seeds), chunk)]
+        for future in as_completed(futures):
+            for result in future.result():
+                out.write(json.dumps(result) + "\n")
+                wins[result["winner"]] = wins.get(result["winner"], 0) + 1
+                done += 1
+            out.flush()
+    elapsed = time.perf_counter() - start
+    return {"games": done, "workers": workers, "seconds": elapsed,
+            "games_per_second": done / elapsed if elapsed else 0.0, "wins": wins}
+
+if __name__ == "__main__":
+    # python batch.py [games] [turns] [workers] [downsample_factor] [output.jsonl]
+    args = sys.argv[1:]
+    output = args.pop() if args and not args[-1].isdigit() else BATCH_OUTPUT
+    games, turns, workers, factor = ([int(arg) for arg in args] + [100, 200, 0, 10][len(args):])[:4]
+    summary = run_batch(games, turns, workers or None, factor, output=output)
+    print(f"{summary['games']} games on {summary['workers']} workers in {summary['seconds']:.2f}s "
+          f"({summary['games_per_second']:.1f} games/s) -> {output}")
+    for name, count in sorted(summary["wins"].items(), key=lambda item: -item[1]):
+        print(f"  {name or 'draw'}: {count}")
@@ -0,0 +1,62 @@
+# benchmarks/ai_engine.py
+# AI turn time with many civs and units, per policy and for the whole AI phase.
+#   python -m benchmarks.ai_engine [civs] [units] [turns] [downsample_factor]
+import contextlib
+import io
+import sys
+import time
+import numpy as np
+from map_ import CLIMATE_RASTER_FILENAME, CLIMATE_MAPPING
+from map_cache import load_cached_map_data
+from engine import Game, default_civ_names, MOVE_MULTIPLIER
+from ai_engine import POLICIES
+
+TARGET_MS = 50
+
+def build(civs, units, factor):
+    climate_grid, land_mask, width, height = load_cached_map_data(CLIMATE_RASTER_FILENAME, factor, CLIMATE_MAPPING)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(width, height, default_civ_names(ai_civs=civs - 1), climate_grid, land_mask, seed=1)
+    rng = np.random.default_rng(1)
+    ys, xs = game.world.land.nonzero()
+    ai_civs = [civ for civ in game.civs if not civ.is_human]
+    for i in rng.choice(len(xs), units - sum(len(civ.units) for civ in game.civs)).tolist():
+        civ = ai_civs[i % len(ai_civs)]
+        unit = game.create_unit(civ, "Archer", int(xs[i]), int(ys[i]))
+        game.world.occupancy.add(unit)
+        civ.units.append(unit)
+    return game
+
+def time_turns(game, turns):
+    times = []
+    for _ in range(turns):
+        rng = np.random.default_rng(game.rng.getrandbits(64))
+        start = time.perf_counter()
+        game.ai.move_units(rng)
+        game.ai.place_capitals(rng)
+        times.append(time.perf_counter() - start)
+        for civ in game.civs:
+            for unit in civ.units:
+                unit.remaining_move = unit.base_move * MOVE_MULTIPLIER
+    return np.median(times) * 1000, max(times) * 1000
+
+def run(civs, units, turns, factor):
+    game = build(civs, units, factor)
+    print(f"{game.full_width}x{game.full_height} map, {civs} civs, {len(game.world.occupancy)} units, {turns} turns")
+    for name in POLICIES:
+        game.ai.default_policy = name
+        median, worst = time_turns(game, turns)
+        print(f"  {name:<7} median {median:6.1f} ms  max {worst:6.1f} ms")
+    game.ai.default_policy = None  # the DEFAULT_POLICIES rotation a new game starts with
+    median, worst = time_turns(game, turns)
+    print(f"  {'default':<7} median {median:6.1f} ms  max {worst:6.1f} ms  (target {TARGET_MS} ms)")
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(turns):
+            game.step()
+    print(f"  full step() {(time.perf_counter() - start) / turns * 1000:6.1f} ms/turn")
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    civs, units, turns, factor = (args + [64, 10000, 20, 10][len(args):])[:4]
+    run(civs, units, turns, factor)
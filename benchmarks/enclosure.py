@@ -0,0 +1,69 @@
+# benchmarks/enclosure.py
+# Differential check and timing of the incremental enclosure index against the
+# original whole-map flood fill.
+#   python -m benchmarks.enclosure [games] [turns] [downsample_factor]
+import random
+import sys
+import time
+from map_ import CLIMATE_RASTER_FILENAME, CLIMATE_MAPPING
+from map_cache import load_cached_map_arrays
+from enclosure import EnclosureIndex, full_enclosure_scan
+from world import World
+
+class Civ:
+    def __init__(self, name):
+        self.name = name
+
+def paint_walls(world, civs, rng, strokes):
+    # Random rectangle outlines and lines of ownership, which close off unowned pockets.
+    for _ in range(strokes):
+        civ = rng.choice(civs)
+        x0, y0 = rng.randrange(world.width), rng.randrange(world.height)
+        w, h = rng.randint(2, 12), rng.randint(2, 12)
+        outline = [(x, y) for x in range(x0, x0 + w) for y in (y0, y0 + h - 1)]
+        outline += [(x, y) for y in range(y0, y0 + h) for x in (x0, x0 + w - 1)]
+        for x, y in outline:
+            if 0 <= x < world.width and 0 <= y < world.height and world.land[y, x]:
+                world.set_owner(x, y, civ)
+
+def run(games, turns, factor):
+    climate_codes, land_mask, _, _ = load_cached_map_arrays(CLIMATE_RASTER_FILENAME, factor, CLIMATE_MAPPING)
+    full_time = incremental_time = 0.0
+    claimed_total = 0
+    for game in range(games):
+        rng = random.Random(game)
+        world = World(climate_codes, land_mask)
+        civs = [Civ(f"civ {i}") for i in range(rng.randint(2, 6))]
+        for civ in civs:
+            world.add_civ(civ)
+        index = EnclosureIndex(world)
+        for turn in range(turns):
+            paint_walls(world, civs, rng, rng.randint(1, 40))
+            civ = rng.choice(civs)
+            civ_id = world.civ_id(civ)
+            start = time.perf_counter()
+            expected = full_enclosure_scan(world, civ_id)
+            full_time += time.perf_counter() - start
+            start = time.perf_counter()
+            actual = index.enclosed_cells(civ_id)
+            incremental_time += time.perf_counter() - start
+            if actual != expected:
+                raise AssertionError(f"game {game} turn {turn}: incremental enclosure differs from full scan")
+            for group in expected:
+                for i in group:
+                    world.set_owner(i % world.width, i // world.width, civ)
+                claimed_total += len(group)
+        index.refresh()
+        check = EnclosureIndex(world)
+        summary = lambda regions: sorted((sorted(r.cells), sorted(r.edges.items())) for r in regions.values())
+        if summary(check.regions) != summary(index.regions):
+            raise AssertionError(f"game {game}: incremental regions drifted from a fresh index")
+    calls = games * turns
+    print(f"{games} games x {turns} turns at factor {factor}: identical results, {claimed_total} tiles claimed")
+    print(f"full scan:   {full_time / calls * 1000:7.2f} ms/turn")
+    print(f"incremental: {incremental_time / calls * 1000:7.2f} ms/turn")
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    games, turns, factor = (args + [20, 30, 10][len(args):])[:3]
+    run(games, turns, factor)
@@ -0,0 +1,78 @@
+# benchmarks/journal.py
+# Records a seeded game with scripted player actions, then checks that the
+# journal replays to the same state at every turn and times seeking.
+#   python -m benchmarks.journal [turns] [seed] [downsample_factor]
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from map_ import CLIMATE_RASTER_FILENAME, CLIMATE_MAPPING
+from map_cache import load_cached_map_data
+from engine import Game, default_civ_names
+from journal import JournalWriter, Replay, SNAPSHOT_INTERVAL
+
+BUILDINGS = ("Residence", "Barracks", "Igluvijaq")
+
+def state_digest(game):
+    state = game.snapshot()
+    state["owner"] = state["owner"].tobytes()
+    state["building"] = state["building"].tobytes()
+    return state
+
+def play_scripted(game, turns, script_rng):
+    # Random player input inside the map, as clicks would give: move orders, builds and training.
+    digests = [state_digest(game)]
+    player = game.civs[0]
+    for _ in range(turns):
+        for unit in list(player.units):
+            if script_rng.random() < 0.7:
+                x = min(max(unit.x + script_rng.randint(-3, 3), 0), game.full_width - 1)
+                y = min(max(unit.y + script_rng.randint(-3, 3), 0), game.full_height - 1)
+                game.move_selected_unit(unit, x, y)
+        if player.territory and script_rng.random() < 0.3:
+            x, y = script_rng.choice(sorted(player.territory))
+            game.build_building(script_rng.choice(BUILDINGS), x, y, player)
+        if player.territory and script_rng.random() < 0.2:
+            x, y = script_rng.choice(sorted(player.territory))
+            game.train_unit_from_barracks(x, y, player)
+        game.step()
+        digests.append(state_digest(game))
+    return digests
+
+def run(turns, seed, factor):
+    map_data = load_cached_map_data(CLIMATE_RASTER_FILENAME, factor, CLIMATE_MAPPING)
+    climate_grid, land_mask, width, height = map_data
+    path = os.path.join(tempfile.mkdtemp(), "check.journal")
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(width, height, default_civ_names(), climate_grid, land_mask, seed)
+        game.journal = JournalWriter(path, game, factor)
+        start = time.perf_counter()
+        digests = play_scripted(game, turns, random.Random(seed))
+        play_time = time.perf_counter() - start
+        game.journal.close()
+        replay = Replay(path, map_data=map_data)
+        start = time.perf_counter()
+        for turn in range(turns + 1):
+            if state_digest(replay.seek(turn)) != digests[turn]:
+                raise AssertionError(f"replay diverged at turn {turn}")
+        replay_time = time.perf_counter() - start
+        targets = random.Random(seed).sample(range(turns + 1), min(50, turns + 1))
+        start = time.perf_counter()
+        for turn in targets:
+            if state_digest(replay.seek(turn)) != digests[turn]:
+                raise AssertionError(f"random seek to turn {turn} diverged")
+        seek_time = (time.perf_counter() - start) / len(targets)
+    print(f"{turns} turns, seed {seed}, factor {factor}: replay identical at every turn")
+    print(f"journal size: {os.path.getsize(path)} bytes")
+    print(f"live play:    {play_time / turns * 1000:7.3f} ms/turn")
+    print(f"replay:       {replay_time / turns * 1000:7.3f} ms/turn")
+    print(f"random seek:  {seek_time * 1000:7.3f} ms (snapshot every {SNAPSHOT_INTERVAL} turns)")
+    os.remove(path)
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    turns, seed, factor = (args + [200, 1, 10][len(args):])[:3]
+    run(turns, seed, factor)
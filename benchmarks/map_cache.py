@@ -0,0 +1,26 @@
+# benchmarks/map_cache.py
+# Cold versus warm map loading. Run from the project root:
+#   python -m benchmarks.map_cache [downsample_factor ...]
+import sys
+import tempfile
+import time
+from map_ import load_map_arrays, CLIMATE_RASTER_FILENAME, CLIMATE_MAPPING
+from map_cache import load_cached_map_arrays, clear_map_cache
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def run(factors):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        print(f"{'factor':>6} {'no cache':>10} {'cold':>10} {'warm':>10}")
+        for factor in factors:
+            uncached, _ = time_call(load_map_arrays, CLIMATE_RASTER_FILENAME, factor, CLIMATE_MAPPING)
+            clear_map_cache(cache_dir)
+            cold, _ = time_call(load_cached_map_arrays, CLIMATE_RASTER_FILENAME, factor, CLIMATE_MAPPING, cache_dir)
+            warm, _ = time_call(load_cached_map_arrays, CLIMATE_RASTER_FILENAME, factor, CLIMATE_MAPPING, cache_dir)
+            print(f"{factor:>6} {uncached * 1000:>8.1f}ms {cold * 1000:>8.1f}ms {warm * 1000:>8.1f}ms")
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [10, 5, 2, 1])
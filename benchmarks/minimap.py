@@ -0,0 +1,93 @@
+# benchmarks/minimap.py
+# Live minimap: the incrementally painted buffer must match a full repaint
+# after every turn, and per-frame cost against the old per-civ flag blits.
+#   python -m benchmarks.minimap [turns] [frames] [downsample_factor]
+import contextlib
+import io
+import os
+import sys
+import time
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import numpy as np
+import pygame
+from map_ import CLIMATE_RASTER_FILENAME, CLIMATE_MAPPING, create_minimap_surface
+from map_cache import load_cached_map_data
+from engine import default_civ_names
+from minimap import LiveMinimap
+from play import Game, PLAYER_UNIT_COLOR, AI_UNIT_COLOR
+
+def legacy_draw(game, screen, mini_surface, flags):
+    # What draw_minimap did before: the static terrain plus every civ's flag
+    # scaled and alpha-blitted over its bounding box, every frame.
+    screen.blit(mini_surface, (0, 0))
+    for civ in game.civs:
+        if civ.territory:
+            min_x, min_y, max_x, max_y = civ.territory.bbox
+            rect = pygame.Rect(min_x, min_y, max_x - min_x + 1, max_y - min_y + 1)
+            flag_scaled = pygame.transform.scale(flags[civ.name], (rect.width, rect.height))
+            flag_scaled.set_alpha(100)
+            screen.blit(flag_scaled, rect.topleft)
+
+def check(minimap, label):
+    expected = LiveMinimap(minimap.world, minimap.player_color, minimap.ai_color, minimap.colors, minimap.scale)
+    minimap.world.remove_listener(expected.tile_changed)
+    expected.update()
+    if not np.array_equal(pygame.surfarray.array3d(expected.surface), pygame.surfarray.array3d(minimap.surface)):
+        raise AssertionError(f"{label}: incremental minimap differs from a full repaint")
+
+def run(turns, frames, factor):
+    pygame.init()
+    climate_grid, land_mask, width, height = load_cached_map_data(CLIMATE_RASTER_FILENAME, factor, CLIMATE_MAPPING)
+    screen = pygame.display.set_mode((width * 2, height * 2))
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(width, height, default_civ_names(ai_civs=8), climate_grid, land_mask, seed=1)
+    flag = pygame.Surface((32, 32), pygame.SRCALPHA)
+    flag.fill((200, 40, 40, 255))
+    flags = {civ.name: flag for civ in game.civs}
+    mini_surface = create_minimap_surface(game, 1.0)
+    minimaps = [LiveMinimap(game.world, PLAYER_UNIT_COLOR, AI_UNIT_COLOR, scale=scale) for scale in (1, 2)]
+    for minimap in minimaps:
+        minimap.update()
+    painted = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for turn in range(turns):
+            game.step()
+            for minimap in minimaps:
+                painted += minimap.update()
+                check(minimap, f"turn {turn} scale {minimap.scale}")
+        game.restore(game.snapshot())
+        game.world.transfer_owner(game.civs[1], game.civs[2])
+        for minimap in minimaps:
+            minimap.update()
+            check(minimap, f"transfer scale {minimap.scale}")
+    print(f"{width}x{height} map, {len(game.civs)} civs, {turns} turns: incremental minimap matches a full repaint "
+          f"({painted / turns / len(minimaps):.0f} tiles repainted per turn)")
+    minimap = minimaps[0]
+    start = time.perf_counter()
+    for _ in range(frames):
+        legacy_draw(game, screen, mini_surface, flags)
+    legacy = (time.perf_counter() - start) / frames
+    start = time.perf_counter()
+    for _ in range(frames):
+        minimap.update()
+        screen.blit(minimap.surface, (0, 0))
+    idle = (time.perf_counter() - start) / frames
+    owned = np.argwhere(game.world.owner != 0)[:, ::-1].tolist()
+    start = time.perf_counter()
+    for i in range(frames):
+        x, y = owned[i % len(owned)]
+        game.world.tile_changed(x, y)
+        minimap.update()
+        screen.blit(minimap.surface, (0, 0))
+    changed = (time.perf_counter() - start) / frames
+    minimap.full = True
+    start = time.perf_counter()
+    minimap.update()
+    full = time.perf_counter() - start
+    print(f"per frame: flag blits {legacy * 1000:6.3f} ms, live idle {idle * 1000:6.3f} ms, "
+          f"live one tile changed {changed * 1000:6.3f} ms (full repaint {full * 1000:6.3f} ms)")
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    turns, frames, factor = (args + [30, 200, 10][len(args):])[:3]
+    run(turns, frames, factor)
@@ -0,0 +1,124 @@
+# benchmarks/occupancy.py
+# Differential check and timing of the unit occupancy index against per-tile
+# unit lists scanned with list.remove / list comprehensions, and of a batch
+# move_many against the same moves made one at a time.
+#   python -m benchmarks.occupancy [units] [steps] [civs] [map_side]
+# Without map_side both layouts run: units spread over the game map, where a
+# lone unit's move costs more with the index than with a list, and a 10x10 map
+# that stacks them, where the list scans for a defender dominate.
+import random
+import sys
+import time
+from occupancy import OccupancyIndex
+
+WIDTH, HEIGHT = 360, 180  # overridden by map_side
+DENSE_SIDE = 10  # second layout when no map_side is given
+
+class Unit:
+    def __init__(self, unit_id, civ, x, y):
+        self.id = unit_id
+        self.civ = civ
+        self.x = x
+        self.y = y
+
+def make_units(rng, count, civs):
+    return [Unit(i, rng.randrange(civs), rng.randrange(WIDTH), rng.randrange(HEIGHT)) for i in range(count)]
+
+def random_step(rng, unit):
+    dx, dy = rng.choice([(0, -1), (0, 1), (-1, 0), (1, 0)])
+    return min(max(unit.x + dx, 0), WIDTH - 1), min(max(unit.y + dy, 0), HEIGHT - 1)
+
+def run_lists(units, steps, seed):
+    rng = random.Random(seed)
+    tiles = [[[] for _ in range(WIDTH)] for _ in range(HEIGHT)]
+    for unit in units:
+        tiles[unit.y][unit.x].append(unit)
+    found = []
+    start = time.perf_counter()
+    for _ in range(steps):
+        unit = rng.choice(units)
+        x, y = random_step(rng, unit)
+        enemies = [e for e in tiles[y][x] if e.civ != unit.civ]
+        found.append(enemies[0].id if enemies else None)
+        tiles[unit.y][unit.x].remove(unit)
+        unit.x, unit.y = x, y
+        tiles[y][x].append(unit)
+    return found, time.perf_counter() - start
+
+def run_index(units, steps, seed):
+    rng = random.Random(seed)
+    index = OccupancyIndex()
+    for unit in units:
+        index.add(unit)
+    found = []
+    start = time.perf_counter()
+    for _ in range(steps):
+        unit = rng.choice(units)
+        x, y = random_step(rng, unit)
+        enemy = index.first_enemy(x, y, unit.civ)
+        found.append(enemy.id if enemy else None)
+        index.move(unit, x, y)
+    return found, time.perf_counter() - start, index
+
+def check_radius(index, units, rng, queries, radius):
+    brute_time = index_time = 0.0
+    for _ in range(queries):
+        x, y, civ = rng.randrange(WIDTH), rng.randrange(HEIGHT), rng.randrange(3)
+        start = time.perf_counter()
+        expected = sorted(u.id for u in units if abs(u.x - x) + abs(u.y - y) <= radius and u.civ != civ)
+        brute_time += time.perf_counter() - start
+        start = time.perf_counter()
+        actual = sorted(u.id for u in index.units_in_radius(x, y, radius, enemies_of=civ))
+        index_time += time.perf_counter() - start
+        if actual != expected:
+            raise AssertionError(f"radius query at ({x}, {y}) differs from brute force")
+    return brute_time / queries, index_time / queries
+
+def check_batch(count, civs, seed):
+    # Moves most units one step, as an AI turn does, in one batch and one at a time.
+    tables = []
+    times = []
+    for batch in (False, True):
+        rng = random.Random(seed)
+        units = make_units(rng, count, civs)
+        index = OccupancyIndex()
+        for unit in units:
+            index.add(unit)
+        movers = [unit for unit in units if rng.random() < 0.9]
+        steps = [random_step(rng, unit) for unit in movers]
+        start = time.perf_counter()
+        if batch:
+            index.move_many(movers, [x for x, _ in steps], [y for _, y in steps])
+        else:
+            for unit, (x, y) in zip(movers, steps):
+                index.move(unit, x, y)
+        times.append(time.perf_counter() - start)
+        tables.append(({key: list(tile) for key, tile in index.tiles.items()}, index.tile_civs, index.buckets, index.positions))
+    if tables[0] != tables[1]:
+        raise AssertionError("move_many left different tables than moving one unit at a time")
+    return len(movers), times
+
+def run(count, steps, civs, width, height):
+    global WIDTH, HEIGHT
+    WIDTH, HEIGHT = width, height
+    seed = 1
+    legacy_found, legacy_time = run_lists(make_units(random.Random(seed), count, civs), steps, seed)
+    units = make_units(random.Random(seed), count, civs)
+    found, index_time, index = run_index(units, steps, seed)
+    if found != legacy_found:
+        raise AssertionError("occupancy index picked different defenders than the list scans")
+    brute, indexed = check_radius(index, units, random.Random(seed), 200, 6)
+    moved, (single_time, batch_time) = check_batch(count, civs, seed)
+    print(f"{count} units, {civs} civs, {steps} moves on {WIDTH}x{HEIGHT} "
+          f"({count / (WIDTH * HEIGHT):.1f} units/tile): identical defenders")
+    print(f"tile lists: {legacy_time / steps * 1e6:7.2f} us/move")
+    print(f"index:      {index_time / steps * 1e6:7.2f} us/move ({index_time / legacy_time:.2f}x lists)")
+    print(f"radius 6 enemies: brute force {brute * 1000:.3f} ms, index {indexed * 1000:.3f} ms")
+    print(f"batch of {moved} moves: one at a time {single_time * 1000:.1f} ms, move_many {batch_time * 1000:.1f} ms, same tables")
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    count, steps, civs, side = (args + [20000, 200000, 8, 0][len(args):])[:4]
+    layouts = [(side, side)] if side else [(WIDTH, HEIGHT), (DENSE_SIDE, DENSE_SIDE)]
+    for width, height in layouts:
+        run(count, steps, civs, width, height)
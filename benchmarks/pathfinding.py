@@ -0,0 +1,86 @@
+# benchmarks/pathfinding.py
+# Path query throughput, with A* checked against Dijkstra for short and long
+# routes, and the enemy-unit distance field checked against a Python Dijkstra
+# search per civ, built and read from the cache.
+#   python -m benchmarks.pathfinding [short_queries] [long_queries] [downsample_factor]
+import random
+import sys
+import time
+import numpy as np
+from map_ import CLIMATE_RASTER_FILENAME, CLIMATE_MAPPING
+from map_cache import load_cached_map_arrays
+from pathfinding import Pathfinder, FIELD_RANGE
+from unit import Unit
+from world import World
+
+SHORT_RANGE = 6  # a Cavalry's effective move
+FIELD_CIVS = 64
+FIELD_UNITS = 10000
+
+class Civ:
+    def __init__(self, name):
+        self.name = name
+
+def run(short_queries, long_queries, factor):
+    climate_codes, land_mask, _, _ = load_cached_map_arrays(CLIMATE_RASTER_FILENAME, factor, CLIMATE_MAPPING)
+    world = World(climate_codes, land_mask)
+    paths = Pathfinder(world)
+    rng = random.Random(1)
+    ys, xs = world.land.nonzero()
+    land = list(zip(xs.tolist(), ys.tolist()))
+
+    pairs = []
+    for _ in range(short_queries):
+        x, y = rng.choice(land)
+        gx = min(max(x + rng.randint(-SHORT_RANGE, SHORT_RANGE), 0), world.width - 1)
+        gy = min(max(y + rng.randint(-SHORT_RANGE, SHORT_RANGE), 0), world.height - 1)
+        pairs.append(((x, y), (gx, gy)))
+    start = time.perf_counter()
+    results = [paths.path(a, b, SHORT_RANGE) for a, b in pairs]
+    short_time = time.perf_counter() - start
+    for (a, b), result in list(zip(pairs, results))[:500]:
+        expected = paths.reachable(a, SHORT_RANGE).get(b)
+        if (result[0] if result else None) != expected:
+            raise AssertionError(f"A* from {a} to {b} gave {result and result[0]}, Dijkstra {expected}")
+
+    long_pairs = [(rng.choice(land), rng.choice(land)) for _ in range(long_queries)]
+    start = time.perf_counter()
+    long_results = [paths.path(a, b) for a, b in long_pairs]
+    long_time = time.perf_counter() - start
+    for (a, b), result in list(zip(long_pairs, long_results))[:20]:
+        expected = paths.reachable(a, None).get(b)
+        if (result[0] if result else None) != expected:
+            raise AssertionError(f"A* from {a} to {b} gave {result and result[0]}, Dijkstra {expected}")
+
+    civs = [Civ(f"civ {k}") for k in range(FIELD_CIVS)]
+    for civ in civs:
+        world.add_civ(civ)
+    for unit_id, (x, y) in enumerate(rng.sample(land, FIELD_UNITS)):
+        world.occupancy.add(Unit(unit_id, civs[unit_id % FIELD_CIVS], "Archer", x, y, 1))
+    land_x, land_y = np.array(xs), np.array(ys)
+    start = time.perf_counter()
+    paths.field("enemy_units", 1, land_x, land_y, 0)
+    build_time = time.perf_counter() - start
+    sources = [(unit.y * world.width + unit.x, world.civ_id(unit.civ)) for unit in world.occupancy.units.values()]
+    for civ in civs[:8]:
+        civ_id = world.civ_id(civ)
+        start = time.perf_counter()
+        field = paths.field("enemy_units", civ_id, land_x, land_y, 0)
+        read_time = time.perf_counter() - start
+        best = paths._dijkstra([i for i, source_civ in sources if source_civ != civ_id], FIELD_RANGE)
+        expected = np.array([best.get(i, np.inf) for i in (land_y * world.width + land_x).tolist()])
+        if not np.array_equal(field, expected):
+            raise AssertionError(f"the enemy_units field of civ {civ_id} disagrees with Dijkstra")
+
+    found = sum(result is not None for result in results)
+    print(f"{world.width}x{world.height} map, A* agrees with Dijkstra")
+    print(f"short paths (range {SHORT_RANGE}): {short_queries} queries, {short_time / short_queries * 1e6:7.1f} us/query, "
+          f"{found} reachable")
+    print(f"long paths: {long_queries} queries, {long_time / long_queries * 1000:7.2f} ms/query")
+    print(f"enemy_units field ({FIELD_UNITS} units, {FIELD_CIVS} civs, range {FIELD_RANGE}): agrees with Dijkstra, "
+          f"build {build_time * 1000:.1f} ms, cached read of {len(land_x)} tiles {read_time * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    short_queries, long_queries, factor = (args + [5000, 100, 10][len(args):])[:3]
+    run(short_queries, long_queries, factor)
@@ -0,0 +1,72 @@
+# benchmarks/placement.py
+# Capital placement for many civs: the old random-retry loop against the
+# land index, counting civs left without a capital and the closest pair, and
+# a full Game setup with that many civs.
+#   python -m benchmarks.placement [civs] [downsample_factor ...]
+import contextlib
+import io
+import random
+import sys
+import time
+import numpy as np
+from map_ import CLIMATE_RASTER_FILENAME, CLIMATE_MAPPING
+from map_cache import load_cached_map_arrays, load_cached_map_data
+from engine import Game, default_civ_names
+from placement import LandIndex, CapitalPlacer
+from world import World
+
+def retry_capitals(world, civs, rng):
+    # The placement init_civs used before the land index: random map positions, 1000 tries.
+    capitals = []
+    for _ in range(civs):
+        for _ in range(1000):
+            x, y = rng.randint(0, world.width - 1), rng.randint(0, world.height - 1)
+            if world.land[y, x] and (x, y) not in capitals:
+                capitals.append((x, y))
+                break
+        else:
+            capitals.append(None)
+    return capitals
+
+def closest_pair(capitals):
+    sites = np.array([site for site in capitals if site is not None], dtype=np.float64)
+    if len(sites) < 2:
+        return float("inf")
+    distance = np.hypot(sites[:, None, 0] - sites[None, :, 0], sites[:, None, 1] - sites[None, :, 1])
+    distance[np.diag_indices(len(sites))] = np.inf
+    return float(distance.min())
+
+def index_capitals(world, land, civs, rng):
+    placer = CapitalPlacer(world, land, civs)
+    capitals = []
+    for _ in range(civs):
+        site = placer.place(rng)
+        if site is not None:
+            world.owner[site[1], site[0]] = 1  # taken, as init_civs would mark it
+        capitals.append(site)
+    return capitals, placer.spacing
+
+def run(civs, factors):
+    print(f"{civs} civs")
+    print(f"{'factor':>6} {'map':>10} {'retry':>9} {'missing':>7} {'closest':>7} "
+          f"{'index':>9} {'missing':>7} {'closest':>7} {'spacing':>7} {'game':>9}")
+    for factor in factors:
+        climate_codes, land_mask, width, height = load_cached_map_arrays(CLIMATE_RASTER_FILENAME, factor, CLIMATE_MAPPING)
+        world = World(climate_codes, land_mask)
+        start = time.perf_counter()
+        old = retry_capitals(world, civs, random.Random(1))
+        old_time = time.perf_counter() - start
+        start = time.perf_counter()
+        land = LandIndex(world)
+        new, spacing = index_capitals(world, land, civs, random.Random(1))
+        new_time = time.perf_counter() - start
+        climate_grid, land_mask, width, height = load_cached_map_data(CLIMATE_RASTER_FILENAME, factor, CLIMATE_MAPPING)
+        with contextlib.redirect_stdout(io.StringIO()):
+            game = Game(width, height, default_civ_names(ai_civs=civs - 1), climate_grid, land_mask, seed=1)
+        placed = sum(civ.capital is not None for civ in game.civs)
+        print(f"{factor:>6} {f'{width}x{height}':>10} {old_time * 1000:>7.1f}ms {old.count(None):>7} {closest_pair(old):>7.1f} "
+              f"{new_time * 1000:>7.1f}ms {new.count(None):>7} {closest_pair(new):>7.1f} {spacing:>7} {placed:>4}/{civs:<4}")
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(args[0] if args else 200, args[1:] or [20, 10, 5])
@@ -0,0 +1,44 @@
+# benchmarks/pyramid.py
+# Peak memory (tracemalloc) and time of getting climate data at each
+# resolution: one full resampled read of the raster, a whole pyramid level read
+# in strips, and the main-view window zoomed from the game map onto that level.
+#   python -m benchmarks.pyramid [base_factor] [view_cols view_rows]
+import sys
+import time
+import tracemalloc
+from map_ import CLIMATE_RASTER_FILENAME, CLIMATE_MAPPING, load_map_arrays
+from pyramid import MapPyramid
+
+def measure(read, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = read(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak, elapsed
+
+def run(base_factor, view_cols, view_rows):
+    pyramid = MapPyramid()
+    base_width, base_height = pyramid.level_size(base_factor)
+    x, y = (base_width - view_cols) // 2, (base_height - view_rows) // 2
+    print(f"main view: {view_cols}x{view_rows} tiles of the factor {base_factor} map")
+    print(f"{'factor':>6} {'level':>10} {'full read':>18} {'level (strips)':>18} {'view window':>18}")
+    for factor in pyramid.factors:
+        width, height = pyramid.level_size(factor)
+        full = measure(load_map_arrays, CLIMATE_RASTER_FILENAME, factor, CLIMATE_MAPPING)
+        level = measure(pyramid.read_level, factor)
+        if factor <= base_factor and base_factor % factor == 0:
+            view = measure(pyramid.read_zoomed, base_factor, x, y, view_cols, view_rows, factor)
+            view_text = f"{view[0] / 2**20:7.2f}MB {view[1] * 1000:6.1f}ms"
+        else:
+            view_text = f"{'-':>18}"
+        print(f"{factor:>6} {f'{width}x{height}':>10} "
+              f"{full[0] / 2**20:7.2f}MB {full[1] * 1000:6.1f}ms {level[0] / 2**20:7.2f}MB {level[1] * 1000:6.1f}ms {view_text}")
+    pyramid.close()
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    base_factor, view_cols, view_rows = (args + [10, 40, 20][len(args):])[:3]
+    run(base_factor, view_cols, view_rows)
@@ -0,0 +1,88 @@
+# benchmarks/savegame.py
+# Size and timing of binary saves at several map sizes, with a round-trip
+# check, against pickling the old Tile-object map.
+#   python -m benchmarks.savegame [downsample_factor ...]
+import contextlib
+import copy
+import io
+import os
+import pickle
+import sys
+import tempfile
+import time
+from map_ import CLIMATE_RASTER_FILENAME, CLIMATE_MAPPING
+from map_cache import load_cached_map_data
+from engine import Game, default_civ_names
+from savegame import save_game_async, load_game
+from benchmarks.world_memory import build_legacy_map
+
+def populate(game, rng):
+    # Spread ownership and units over the map so the save is not mostly empty.
+    ys, xs = game.world.land.nonzero()
+    land = list(zip(xs.tolist(), ys.tolist()))
+    for x, y in rng.sample(land, len(land) // 3):
+        game.map[y][x].owner = rng.choice(game.civs)
+    for x, y in rng.sample(land, max(1, len(land) // 50)):
+        civ = rng.choice(game.civs)
+        unit = game.create_unit(civ, "Archer", x, y)
+        game.map[y][x].units.append(unit)
+        civ.units.append(unit)
+
+def comparable(state):
+    state = dict(state)
+    state["owner"] = state["owner"].tobytes()
+    state["building"] = state["building"].tobytes()
+    state["civs"] = [dict(record, capital=tuple(record["capital"] or ())) for record in state["civs"]]
+    return state
+
+def run(factors):
+    print(f"{'factor':>6} {'size':>10} {'units':>7} {'save':>9} {'stall':>8} {'write':>8} {'load':>8} "
+          f"{'pickle':>9} {'pickle t':>9}")
+    directory = tempfile.mkdtemp()
+    for factor in factors:
+        map_data = load_cached_map_data(CLIMATE_RASTER_FILENAME, factor, CLIMATE_MAPPING)
+        climate_grid, land_mask, width, height = map_data
+        with contextlib.redirect_stdout(io.StringIO()):
+            game = Game(width, height, default_civ_names(), climate_grid, land_mask, seed=factor)
+            populate(game, game.rng)
+            for _ in range(3):
+                game.step()
+        path = os.path.join(directory, f"bench_{factor}.sav")
+        start = time.perf_counter()
+        save_game_async(game, path, factor).join()
+        write_time = time.perf_counter() - start
+        start = time.perf_counter()
+        game.snapshot()
+        stall = time.perf_counter() - start
+        start = time.perf_counter()
+        loaded = load_game(path, map_data=map_data)
+        load_time = time.perf_counter() - start
+        if comparable(loaded.snapshot()) != comparable(game.snapshot()):
+            raise AssertionError(f"factor {factor}: loaded game differs from the saved one")
+        # The old layout: Tile objects plus civs holding territory sets, detached from the world.
+        legacy = build_legacy_map(game.world.climate, game.world.land)
+        legacy_civs = []
+        for civ in game.civs:
+            legacy_civ = copy.copy(civ)
+            legacy_civ.territory = set(civ.territory)
+            legacy_civ.units = []
+            for unit in civ.units:
+                legacy_unit = copy.copy(unit)
+                legacy_unit.civ = legacy_civ
+                legacy_civ.units.append(legacy_unit)
+                legacy[unit.y][unit.x].units.append(legacy_unit)
+            for x, y in legacy_civ.territory:
+                legacy[y][x].owner = legacy_civ
+            legacy_civs.append(legacy_civ)
+        start = time.perf_counter()
+        pickled = pickle.dumps((legacy, legacy_civs), protocol=pickle.HIGHEST_PROTOCOL)
+        pickle_time = time.perf_counter() - start
+        units = sum(len(civ.units) for civ in game.civs)
+        print(f"{factor:>6} {f'{width}x{height}':>10} {units:>7} {os.path.getsize(path) / 2**20:7.2f}MB "
+              f"{stall * 1000:6.1f}ms {write_time * 1000:6.1f}ms {load_time * 1000:6.1f}ms "
+              f"{len(pickled) / 2**20:7.2f}MB {pickle_time * 1000:7.1f}ms")
+        os.remove(path)
+    print("stall = snapshot taken on the game thread; write = snapshot + background write, joined")
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [20, 10, 5])
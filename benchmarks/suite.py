@@ -0,0 +1,215 @@
+# benchmarks/suite.py
+# Headless, seeded benchmark suite: map loading, minimap, game setup, AI turns,
+# enclosure and main-view rendering. Results go to a JSON file; --compare
+# checks them against a stored baseline and exits 1 on a regression.
+#   python -m benchmarks.suite [--quick] [--only TEXT] [--repeats N] [--out PATH]
+#   python -m benchmarks.suite --compare BASELINE [--threshold 0.2] [--out PATH]
+#   python -m benchmarks.suite --compare BASELINE CURRENT
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import numpy as np
+import pygame
+from map_ import CLIMATE_RASTER_FILENAME, CLIMATE_MAPPING, load_map_data, create_minimap_surface
+from map_cache import load_cached_map_data
+from engine import MOVE_MULTIPLIER, default_civ_names
+from play import Game
+from benchmarks.ai_engine import build
+from benchmarks.enclosure import paint_walls
+
+SUITE_OUTPUT = "bench_results.json"
+SEED = 1
+REPEATS = 7
+THRESHOLD = 0.2     # a case regresses when its best time is this much slower than the baseline's
+NOISE_FLOOR_MS = 0.05  # ...and by more than this, so sub-timer-resolution jitter never counts
+
+class Case:
+    """
+    One timed operation. setup() runs once and returns the state; before(state)
+    runs untimed ahead of every repeat; run(state) is what is timed.
+    """
+    def __init__(self, name, setup, run, before=None):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.before = before
+
+def quiet():
+    return contextlib.redirect_stdout(io.StringIO())
+
+def new_game(factor, civs=5):
+    climate_grid, land_mask, width, height = load_cached_map_data(CLIMATE_RASTER_FILENAME, factor, CLIMATE_MAPPING)
+    with quiet():
+        return Game(width, height, default_civ_names(ai_civs=civs - 1), climate_grid, land_mask, seed=SEED)
+
+def map_cases(factors):
+    for factor in factors:
+        yield Case(f"map.load_map_data[{factor}]", lambda: None,
+                   lambda _, factor=factor: load_map_data(CLIMATE_RASTER_FILENAME, factor, CLIMATE_MAPPING))
+    for factor in factors:
+        yield Case(f"map.create_minimap_surface[{factor}]", lambda factor=factor: new_game(factor),
+                   lambda game: create_minimap_surface(game, 1))
+
+def setup_cases(factors, civ_counts):
+    for factor in factors:
+        yield Case(f"game.init_map[{factor}]", lambda factor=factor: new_game(factor), lambda game: game.init_map())
+    def fresh_map(game):
+        game.init_map()
+        game.civs = []
+    for civs in civ_counts:
+        names = default_civ_names(ai_civs=civs - 1)
+        def init_civs(game, names=names):
+            with quiet():
+                game.init_civs(names)
+        yield Case(f"game.init_civs[{civs} civs]", lambda: new_game(10), init_civs, fresh_map)
+
+def ai_cases(unit_counts):
+    def rested(game):
+        for civ in game.civs:
+            for unit in civ.units:
+                unit.remaining_move = unit.base_move * MOVE_MULTIPLIER
+    def ai_turn(game):
+        with quiet():
+            game.ai_turn()
+    for units in unit_counts:
+        yield Case(f"engine.ai_turn[{units} units]", lambda units=units: build(16, units, 10), ai_turn, rested)
+
+def enclosure_cases(factors):
+    # The player's territory grows new walls before every repeat, so each call has pockets to find.
+    def walls(state):
+        game, rng = state
+        paint_walls(game.world, [game.civs[0]], rng, 40)
+    def enclose(state):
+        game = state[0]
+        game.update_surrounded_territory_group(game.civs[0])
+    for factor in factors:
+        yield Case(f"engine.update_surrounded_territory_group[{factor}]",
+                   lambda factor=factor: (new_game(factor), random.Random(SEED)), enclose, walls)
+
+def render_cases(tile_sizes, view=(1920, 980)):
+    # cold: every chunk re-rendered (e.g. after a tile size change); warm: chunks reused.
+    def setup():
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        return new_game(10), pygame.Surface(view)
+    def cold(state):
+        if state[0].terrain_cache is not None:
+            state[0].terrain_cache.clear()
+    for tile_size in tile_sizes:
+        draw = lambda state, tile_size=tile_size: state[0].draw_main_view(state[1], tile_size, None)
+        yield Case(f"render.draw_main_view[{tile_size},cold]", setup, draw, cold)
+        yield Case(f"render.draw_main_view[{tile_size},warm]", setup, draw)
+
+def all_cases(quick):
+    if quick:
+        return [*map_cases([20, 10]), *setup_cases([10], [10, 100]), *ai_cases([1000, 10000]),
+                *enclosure_cases([10]), *render_cases([48])]
+    return [*map_cases([20, 10, 5]), *setup_cases([10, 5], [10, 100, 200]), *ai_cases([1000, 10000, 50000]),
+            *enclosure_cases([10, 5, 2]), *render_cases([24, 48, 96])]
+
+def time_case(case, repeats):
+    state = case.setup()
+    times = []
+    for _ in range(repeats):
+        if case.before is not None:
+            case.before(state)
+        # As timeit does: no collector pauses inside the timed call, whatever earlier cases left behind.
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            case.run(state)
+            times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    ms = np.array(times) * 1000
+    return {"median_ms": float(np.median(ms)), "min_ms": float(ms.min()), "max_ms": float(ms.max()), "repeats": repeats}
+
+def run_suite(quick=False, only=None, repeats=REPEATS):
+    results = {}
+    for case in all_cases(quick):
+        if only and only not in case.name:
+            continue
+        random.seed(SEED)
+        np.random.seed(SEED)
+        results[case.name] = time_case(case, repeats)
+        stats = results[case.name]
+        print(f"{case.name:<48} median {stats['median_ms']:9.3f} ms  min {stats['min_ms']:9.3f} ms")
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "seed": SEED,
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+def compare(baseline, current, threshold=THRESHOLD):
+    """
+    Prints each case shared by both runs with the change in its best time
+    (the least noisy of the repeats) and returns the names of the cases that
+    regressed.
+    """
+    regressions = []
+    if baseline["meta"].get("quick") != current["meta"].get("quick"):
+        print("warning: comparing a --quick run with a full one; case order and sizes differ")
+    print(f"{'case':<48} {'baseline':>11} {'current':>11} {'change':>8}")
+    for name, stats in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<48} {'-':>11} {stats['min_ms']:>9.3f}ms {'new':>8}")
+            continue
+        old, new = base["min_ms"], stats["min_ms"]
+        change = (new - old) / old if old else 0.0
+        regressed = change > threshold and new - old > NOISE_FLOOR_MS
+        mark = "  REGRESSION" if regressed else ""
+        print(f"{name:<48} {old:>9.3f}ms {new:>9.3f}ms {change * 100:>+7.1f}%{mark}")
+        if regressed:
+            regressions.append(name)
+    for name in sorted(baseline["results"].keys() - current["results"].keys()):
+        print(f"{name:<48} missing from the current run")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless benchmark suite with baseline comparison.")
+    parser.add_argument("--quick", action="store_true", help="small maps and unit counts only")
+    parser.add_argument("--only", help="run only the cases whose name contains this text")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--out", default=SUITE_OUTPUT, help="where to write this run's results")
+    parser.add_argument("--compare", nargs="+", metavar=("BASELINE", "CURRENT"),
+                        help="compare against BASELINE, using CURRENT instead of a new run when given")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args(argv)
+    if args.compare and len(args.compare) > 2:
+        parser.error("--compare takes a baseline and at most one current results file")
+    if args.compare and len(args.compare) == 2:
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+    else:
+        current = run_suite(args.quick, args.only, args.repeats)
+        with open(args.out, "w") as f:
+            json.dump(current, f, indent=1)
+        print(f"results written to {args.out}")
+    if not args.compare:
+        return 0
+    with open(args.compare[0]) as f:
+        baseline = json.load(f)
+    regressions = compare(baseline, current, args.threshold)
+    print(f"{len(regressions)} regression(s) over {args.threshold * 100:.0f}%" if regressions else "no regressions")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
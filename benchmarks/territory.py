@@ -0,0 +1,98 @@
+# benchmarks/territory.py
+# Differential check of the incremental territory index (counts, bounding
+# boxes, borders) and the enclosure index under single-tile changes and whole-civ
+# transfers, plus timings against the old set-based territory code.
+#   python -m benchmarks.territory [games] [turns] [downsample_factor]
+import random
+import sys
+import time
+import numpy as np
+from map_ import CLIMATE_RASTER_FILENAME, CLIMATE_MAPPING
+from map_cache import load_cached_map_arrays
+from enclosure import EnclosureIndex
+from territory import TerritoryIndex
+from world import World
+from benchmarks.enclosure import Civ, paint_walls
+
+def expected_tables(world):
+    owner = world.owner
+    padded = np.pad(owner, 1, constant_values=np.iinfo(owner.dtype).max)
+    inner = ((padded[:-2, 1:-1] == owner) & (padded[2:, 1:-1] == owner)
+             & (padded[1:-1, :-2] == owner) & (padded[1:-1, 2:] == owner))
+    tables = {}
+    for civ_id in np.unique(owner[owner != 0]).tolist():
+        ys, xs = np.nonzero(owner == civ_id)
+        by, bx = np.nonzero((owner == civ_id) & ~inner)
+        tables[civ_id] = (len(xs), (int(xs.min()), int(ys.min()), int(xs.max()), int(ys.max())),
+                          set(zip(bx.tolist(), by.tolist())))
+    return tables
+
+def check(world, index, label):
+    actual = {civ_id: (index.count(civ_id), index.bbox(civ_id), index.border(civ_id)) for civ_id in index.counts}
+    if actual != expected_tables(world):
+        raise AssertionError(f"{label}: territory index differs from a recount of the owner grid")
+    enclosure = world.enclosure
+    enclosure.refresh()
+    fresh = EnclosureIndex(world)
+    world.remove_listener(fresh.tile_changed)
+    summary = lambda regions: sorted((sorted(r.cells), sorted(r.edges.items())) for r in regions.values())
+    if summary(fresh.regions) != summary(enclosure.regions):
+        raise AssertionError(f"{label}: enclosure regions drifted after a transfer")
+
+def run(games, turns, factor):
+    climate_codes, land_mask, _, _ = load_cached_map_arrays(CLIMATE_RASTER_FILENAME, factor, CLIMATE_MAPPING)
+    bbox_old = bbox_new = eliminate_old = eliminate_new = 0.0
+    eliminations = 0
+    for game in range(games):
+        rng = random.Random(game)
+        world = World(climate_codes, land_mask)
+        world.enclosure = EnclosureIndex(world)
+        civs = [Civ(f"civ {i}") for i in range(rng.randint(3, 8))]
+        for civ in civs:
+            world.add_civ(civ)
+        for turn in range(turns):
+            paint_walls(world, civs, rng, rng.randint(1, 40))
+            for civ in civs:
+                tiles = set(civ.territory)
+                start = time.perf_counter()
+                if tiles:
+                    xs = [x for (x, y) in tiles]
+                    ys = [y for (x, y) in tiles]
+                    (min(xs), min(ys), max(xs), max(ys))
+                bbox_old += time.perf_counter() - start
+                start = time.perf_counter()
+                civ.territory.bbox
+                bbox_new += time.perf_counter() - start
+            if turn % 5 == 4:
+                old, new = rng.sample(civs, 2)
+                if rng.random() < 0.2:
+                    new = None
+                tiles = list(old.territory)
+                world.enclosure.refresh()
+                start = time.perf_counter()
+                world.transfer_owner(old, new)
+                world.enclosure.refresh()
+                eliminate_new += time.perf_counter() - start
+                # The old per-tile handover (here handing the tiles back), enclosure refresh included.
+                start = time.perf_counter()
+                for x, y in tiles:
+                    world.set_owner(x, y, old)
+                world.enclosure.refresh()
+                eliminate_old += time.perf_counter() - start
+                world.transfer_owner(old, new)
+                eliminations += 1
+            check(world, world.territory, f"game {game} turn {turn}")
+        rebuilt = TerritoryIndex(world)
+        world.remove_listener(rebuilt.tile_changed)
+        if {k: rebuilt.bbox(k) for k in rebuilt.counts} != {k: world.territory.bbox(k) for k in world.territory.counts}:
+            raise AssertionError(f"game {game}: incremental index differs from a fresh one")
+    queries = games * turns
+    print(f"{games} games x {turns} turns at factor {factor}: identical counts, boxes, borders and enclosure regions")
+    print(f"bounding boxes per turn: sets {bbox_old / queries * 1000:7.3f} ms, index {bbox_new / queries * 1000:7.3f} ms")
+    print(f"civ handover ({eliminations}): per tile {eliminate_old / eliminations * 1000:7.2f} ms, "
+          f"masked {eliminate_new / eliminations * 1000:7.2f} ms")
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    games, turns, factor = (args + [10, 30, 10][len(args):])[:3]
+    run(games, turns, factor)
@@ -0,0 +1,110 @@
+# benchmarks/turns.py
+# End-turn cost with many player move orders, phase by phase. The pipeline's
+# share of the player orders (collect, movement, combat, claim) is timed against the old one-unit-at-a-time resolution. Both start
+# after the orders were validated through game.reachable, as in play; the old
+# resolution is then rerun over the pipeline's routes to check that both claim
+# the same territory.
+#   python -m benchmarks.turns [player_units] [ai_units] [turns] [downsample_factor]
+import contextlib
+import io
+import sys
+import time
+import numpy as np
+from engine import MOVE_MULTIPLIER, Game
+from turns import PHASES
+from benchmarks.ai_engine import build
+
+def astar_route(game, unit, dest):
+    return game.paths.path((unit.x, unit.y), dest, game.get_effective_move(unit))
+
+def sequential_resolve(game, route_of=astar_route):
+    # The order resolution the engine used before the turn pipeline: one A* query per unit.
+    for unit in [unit for unit in game.civs[0].units if unit.move_order is not None]:
+        dest = unit.move_order
+        route = route_of(game, unit, dest)
+        if route is None:
+            unit.move_order = None
+            continue
+        cost, steps = route
+        defender = game.world.occupancy.first_enemy(dest[0], dest[1], unit.civ)
+        if defender is not None:
+            defender.hp -= unit.attack
+            unit.hp -= defender.attack
+            if defender.hp > 0:
+                unit.move_order = None
+                continue
+        else:
+            for x, y in steps:
+                tile = game.map[y][x]
+                if tile.owner is None:
+                    tile.owner = unit.civ
+        game.world.occupancy.move(unit, *dest)
+        unit.remaining_move = max(0, unit.remaining_move - cost)
+        unit.move_order = None
+
+def give_orders(game, rng):
+    # Every player unit heads for a random tile it can reach; some land on enemies.
+    orders = []
+    for unit in game.civs[0].units:
+        reach = sorted(game.reachable(unit))
+        orders.append((unit, reach[rng.integers(len(reach))]))
+    for unit, dest in orders:
+        unit.move_order = dest
+    return orders
+
+def reissue(game, state, orders):
+    # Back to the start of the turn with the same orders, validated as move_selected_unit does.
+    game.restore(state)
+    for unit, dest in orders:
+        unit = game.world.occupancy.units[unit.id]
+        game.reachable(unit)
+        unit.move_order = dest
+
+def run(player_units, ai_units, turns, factor):
+    game = build(8, ai_units, factor)
+    rng = np.random.default_rng(2)
+    player = game.civs[0]
+    ys, xs = game.world.land.nonzero()
+    for i in rng.choice(len(xs), player_units).tolist():
+        unit = game.create_unit(player, "Cavalry", int(xs[i]), int(ys[i]))
+        game.world.occupancy.add(unit)
+        player.units.append(unit)
+    claimed = {}
+    game.pipeline.add_hook(lambda phase, seconds: phase == "claim" and claimed.update(owner=game.world.owner.copy()))
+    phase_times = {phase: [] for phase in PHASES}
+    old_times, new_times = [], []
+    for turn in range(turns):
+        state = game.snapshot()
+        orders = give_orders(game, rng)
+        reissue(game, state, orders)
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            sequential_resolve(game)
+            old_times.append(time.perf_counter() - start)
+        reissue(game, state, orders)
+        with contextlib.redirect_stdout(io.StringIO()):
+            sequential_resolve(game, Game.route)
+        expected = game.world.owner.copy()
+        reissue(game, state, orders)
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.ai_turn()
+        timings = game.pipeline.timings
+        for phase, seconds in timings.items():
+            phase_times[phase].append(seconds)
+        new_times.append(timings["collect"] + timings["movement"] + timings["combat"] + timings["claim"])
+        if not np.array_equal(claimed["owner"], expected):
+            raise AssertionError(f"turn {turn}: the pipeline claimed different tiles than sequential resolution")
+        for civ in game.civs:
+            for unit in civ.units:
+                unit.remaining_move = unit.base_move * MOVE_MULTIPLIER
+    print(f"{game.full_width}x{game.full_height} map, {len(player.units)} player units, "
+          f"{len(game.world.occupancy)} units in all, {turns} turns: same territory claimed")
+    for phase in PHASES:
+        print(f"  {phase:<9} median {np.median(phase_times[phase]) * 1000:7.2f} ms")
+    print(f"player orders: sequential {np.median(old_times) * 1000:7.2f} ms, "
+          f"pipeline collect+movement+combat+claim {np.median(new_times) * 1000:7.2f} ms")
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    player_units, ai_units, turns, factor = (args + [2000, 10000, 10, 10][len(args):])[:4]
+    run(player_units, ai_units, turns, factor)
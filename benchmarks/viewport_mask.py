@@ -0,0 +1,75 @@
+# benchmarks/viewport_mask.py
+# Per-frame cost of masking the main map view to a circle, with the memory
+# each path allocates per frame. pygame surfaces live in SDL's heap, which
+# tracemalloc cannot see, so besides the Python heap (tracemalloc snapshots)
+# the fresh memory a frame touches is measured from the process's minor page
+# faults (Unix only).
+#   python -m benchmarks.viewport_mask [frames]
+import os
+import sys
+import time
+import tracemalloc
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+from assets import CircularViewport
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+VIEW_SIZE = (1920 // 48 * 48, (1080 - 100) // 48 * 48)
+
+def legacy_frame(size):
+    # What main() did before: new map surface, new mask surface, full copy.
+    map_surface = pygame.Surface(size, pygame.SRCALPHA)
+    map_surface.fill((60, 179, 113, 255))
+    mask_surface = pygame.Surface(size, pygame.SRCALPHA)
+    mask_surface.fill((0, 0, 0, 0))
+    pygame.draw.circle(mask_surface, (255, 255, 255, 255), (size[0] // 2, size[1] // 2), min(size) // 2)
+    result = map_surface.copy()
+    result.blit(mask_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+    return result
+
+def viewport_frame(size, viewport):
+    surface = viewport.begin(size)
+    surface.fill((60, 179, 113, 255))
+    return viewport.finish()
+
+def page_faults():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_minflt
+
+def measure(frame, frames, *args):
+    """
+    Returns (seconds, Python heap bytes, fresh bytes touched) per frame, after
+    one warm-up frame. Fresh bytes are None without the resource module.
+    """
+    frame(*args)
+    start = time.perf_counter()
+    faults = page_faults() if resource else 0
+    for _ in range(frames):
+        frame(*args)
+    faults = page_faults() - faults if resource else 0
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(frames):
+        frame(*args)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    heap = sum(stat.size_diff for stat in after.compare_to(before, "filename") if stat.size_diff > 0)
+    touched = faults * os.sysconf("SC_PAGE_SIZE") / frames if resource else None
+    return elapsed / frames, heap / frames, touched
+
+def run(frames):
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    print(f"view {VIEW_SIZE[0]}x{VIEW_SIZE[1]}, {frames} frames")
+    print(f"{'':9} {'time':>14} {'python heap':>14} {'fresh memory':>16}")
+    for name, frame, args in (("legacy", legacy_frame, ()), ("viewport", viewport_frame, (CircularViewport(),))):
+        seconds, heap, touched = measure(frame, frames, VIEW_SIZE, *args)
+        touched_text = f"{touched / 2**20:7.2f} MB/frame" if touched is not None else f"{'-':>16}"
+        print(f"{name:9} {seconds * 1000:6.2f} ms/frame {heap:8.0f} B/frame {touched_text}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,57 @@
+# benchmarks/world_memory.py
+# Memory of the old Tile-object map versus the grid-backed World store.
+#   python -m benchmarks.world_memory [--no-legacy] [downsample_factor ...]
+import sys
+import time
+import tracemalloc
+from map_ import CLIMATE_NAMES, CLIMATE_RASTER_FILENAME, CLIMATE_MAPPING
+from map_cache import load_cached_map_arrays
+from world import World
+
+class LegacyTile:
+    # Mirror of the Tile class that play.Game.init_map used to build per land cell.
+    def __init__(self, x, y, climate):
+        self.x = x
+        self.y = y
+        self.climate = climate
+        self.owner = None
+        self.building = None
+        self.units = []
+
+def build_legacy_map(climate_codes, land_mask):
+    height, width = land_mask.shape
+    land = land_mask.tolist()
+    codes = climate_codes.tolist()
+    return [[LegacyTile(x, y, CLIMATE_NAMES[codes[y][x]]) if land[y][x] else None for x in range(width)]
+            for y in range(height)]
+
+def measure(build, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(*args)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+def run(factors, legacy=True):
+    print(f"{'factor':>6} {'size':>10} {'land':>9} {'legacy':>12} {'world':>12} {'legacy time':>12} {'world time':>11}")
+    for factor in factors:
+        climate_codes, land_mask, width, height = load_cached_map_arrays(CLIMATE_RASTER_FILENAME, factor, CLIMATE_MAPPING)
+        climate_codes = climate_codes.copy()
+        land_mask = land_mask.copy()
+        legacy_bytes = legacy_time = None
+        if legacy:
+            legacy_map, legacy_bytes, legacy_time = measure(build_legacy_map, climate_codes, land_mask)
+            del legacy_map
+        world, world_bytes, world_time = measure(World, climate_codes, land_mask)
+        legacy_mb = f"{legacy_bytes / 2**20:10.1f}MB" if legacy else f"{'-':>12}"
+        legacy_s = f"{legacy_time:11.2f}s" if legacy else f"{'-':>12}"
+        print(f"{factor:>6} {f'{width}x{height}':>10} {int(land_mask.sum()):>9} {legacy_mb} "
+              f"{(world_bytes + world.land.nbytes + world.climate.nbytes) / 2**20:10.1f}MB {legacy_s} {world_time:10.3f}s")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    legacy = "--no-legacy" not in args
+    factors = [int(arg) for arg in args if not arg.startswith("--")] or [10, 5, 1]
+    run(factors, legacy)
@@ -1,8 +1,8 @@
 # building.py
 import pygame
-
-RESIDENCE_POP_INCREASE = 1000
-BARRACKS_TRAIN_COST = 500
+from text_cache import render_text
+# The constants moved to engine; re-exported so existing `from building import ...` keeps working.
+from engine import RESIDENCE_POP_INCREASE, BARRACKS_TRAIN_COST  # noqa: F401
 
 def building_menu(screen, font):
     # "Capital" 옵션 제거 – 수도는 자동으로 생성됨
@@ -18,7 +18,7 @@ def building_menu(screen, font):
     for i, option in enumerate(options):
         rect = pygame.Rect(menu_x + 20, menu_y + 20 + i * (option_height + 10), menu_width - 40, option_height)
         pygame.draw.rect(screen, (100, 100, 100), rect)
-        txt = font.render(option, True, (255, 255, 255))
+        txt = render_text(font, option, (255, 255, 255))
         txt_rect = txt.get_rect(center=rect.center)
         screen.blit(txt, txt_rect)
         option_rects.append((rect, option))
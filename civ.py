@@ -12,18 +12,27 @@ DEFAULT_GRL_TRAITS = {
     "Aw (Tropical Savanna)": 0.75
 }
 
+# Capital placement weights by climate (1 for climates not listed).
+GRL_CLIMATE_PREFERENCES = {
+    "ET (Tundra)": 4.0,
+    "EF (Ice Cap)": 2.0,
+    "Dfc (Subarctic)": 2.0,
+}
+
 class Civilization:
     def __init__(self, name, traits=None, is_human=False):
         self.name = name  # Full name (e.g., "Greenland", "Aurelia", etc.)
         if name == "Greenland":
             self.internal_name = "GRL"  # For internal use (e.g., flag filename)
             self.traits = DEFAULT_GRL_TRAITS
+            self.climate_preferences = GRL_CLIMATE_PREFERENCES
         else:
             self.internal_name = name
             self.traits = traits if traits is not None else {}
+            self.climate_preferences = {}
         self.is_human = is_human
         self.units = []
-        self.territory = set()  # Set of (x, y) coordinates
+        self.territory = set()  # (x, y) tiles; World.add_civ replaces it with a view over the owner grid
         self.capital = None     # (x, y) coordinate of capital
         self.alive = True
         self.population = INITIAL_POPULATION
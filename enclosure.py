@@ -0,0 +1,334 @@
+# enclosure.py
+from collections import deque
+import numpy as np
+
+NEIGHBOR_ORDER = ((0, -1), (0, 1), (-1, 0), (1, 0))
+OPEN = 0  # key in Region.edges for edges to the sea or off the map
+REBUILD_DIVISOR = 64  # refresh relabels from scratch when more than 1/64 of the land changed
+
+class Region:
+    """
+    A connected area of unowned land. edges counts the region's boundary edges
+    by what lies across them: OPEN for sea/map edge, otherwise the owning civ id.
+    """
+    __slots__ = ("label", "cells", "edges")
+
+    def __init__(self, label):
+        self.label = label
+        self.cells = set()  # flat indices (y * width + x)
+        self.edges = {}
+
+    def add_edges(self, edges, sign=1):
+        for key, count in edges.items():
+            total = self.edges.get(key, 0) + sign * count
+            if total:
+                self.edges[key] = total
+            else:
+                del self.edges[key]
+
+    def enclosed_by(self, civ_id):
+        return OPEN not in self.edges and all(key == civ_id for key in self.edges)
+
+class EnclosureIndex:
+    """
+    Region index over the unowned land, kept up to date from the World's owner
+    change notifications. A tile taken out of a region only costs a search of
+    the smaller piece when it might split the region; owner swaps just adjust
+    boundary counts. The enclosed regions for a civ are then read straight off
+    the index instead of flood-filling the whole map.
+    """
+    def __init__(self, world):
+        self.world = world
+        self.width = world.width
+        self.height = world.height
+        self.land = memoryview(world.land.reshape(-1))
+        self.land_cells = int(np.count_nonzero(world.land))
+        self.rebuild()
+        world.add_listener(self.tile_changed, self.owner_transferred)
+
+    def rebuild(self):
+        """
+        Labels every region from scratch with array operations: a union-find
+        over the unowned land (hook each edge's roots together, then jump
+        pointers) and one np.unique count of the boundary edges per region.
+        """
+        # Owners as last processed; the index only reads this copy so that
+        # pending changes are applied one at a time.
+        self._known_owner = self.world.owner.reshape(-1).copy()
+        self.owner = memoryview(self._known_owner)
+        self.dirty = set()
+        width, height = self.width, self.height
+        land = self.world.land
+        free = land & (self.world.owner == 0)
+        root = np.arange(width * height)
+        right = (free[:, :-1] & free[:, 1:]).reshape(-1)
+        down = (free[:-1, :] & free[1:, :]).reshape(-1)
+        cell = root.reshape(height, width)
+        a = np.concatenate((cell[:, :-1].reshape(-1)[right], cell[:-1, :].reshape(-1)[down]))
+        b = np.concatenate((cell[:, 1:].reshape(-1)[right], cell[1:, :].reshape(-1)[down]))
+        while True:
+            root_a, root_b = root[a], root[b]
+            apart = root_a != root_b
+            if not apart.any():
+                break
+            np.minimum.at(root, np.maximum(root_a, root_b)[apart], np.minimum(root_a, root_b)[apart])
+            while True:
+                jumped = root[root]
+                if np.array_equal(jumped, root):
+                    break
+                root = jumped
+        cells = np.flatnonzero(free.reshape(-1))
+        roots, region_of = np.unique(root[cells], return_inverse=True)
+        labels = np.arange(1, len(roots) + 1, dtype=np.int32)
+        self._label_grid = np.zeros(width * height, dtype=np.int32)
+        self._label_grid[cells] = labels[region_of]
+        self.labels = memoryview(self._label_grid)
+        self.next_label = len(roots) + 1
+        # Boundary edges: what lies across each side of every region cell.
+        padded = np.zeros((height + 2, width + 2), dtype=np.int64)  # OPEN off the map and at sea
+        padded[1:-1, 1:-1] = np.where(land, self.world.owner, OPEN)
+        padded[1:-1, 1:-1][free] = -1  # unowned land: not a boundary
+        x, y = cells % width + 1, cells // width + 1
+        across = np.concatenate([padded[y + dy, x + dx] for dx, dy in NEIGHBOR_ORDER])
+        across_region = np.tile(region_of, len(NEIGHBOR_ORDER))
+        boundary = across >= 0
+        keys = len(self.world.civs) + 1
+        pairs, counts = np.unique(across_region[boundary] * keys + across[boundary], return_counts=True)
+        self.regions = {}
+        order = np.argsort(region_of, kind="stable")
+        bounds = np.searchsorted(region_of[order], np.arange(len(roots) + 1)).tolist()
+        sorted_cells = cells[order].tolist()
+        for k, label in enumerate(labels.tolist()):
+            region = Region(label)
+            region.cells = set(sorted_cells[bounds[k]:bounds[k + 1]])
+            self.regions[label] = region
+        for pair, count in zip(pairs.tolist(), counts.tolist()):
+            self.regions[pair // keys + 1].edges[pair % keys] = count
+
+    def tile_changed(self, x, y):
+        self.dirty.add(y * self.width + x)
+
+    def owner_transferred(self, old, new, window, mask):
+        # A civ's land changing hands wholesale leaves the unowned regions as
+        # they are and only relabels their boundary counts.
+        ys, xs = np.nonzero(mask)
+        cells = (ys + window[0].start) * self.width + xs + window[1].start
+        if not new:
+            self.dirty.update(cells.tolist())
+            return
+        self.refresh()
+        self._known_owner[cells] = new
+        for region in self.regions.values():
+            count = region.edges.get(old)
+            if count:
+                region.add_edges({old: -count, new: count})
+
+    def _neighbors(self, i):
+        x, y = i % self.width, i // self.width
+        for dx, dy in NEIGHBOR_ORDER:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                yield ny * self.width + nx
+            else:
+                yield None
+
+    def _cell_edges(self, i, edges):
+        # Boundary edges of unowned cell i, added into edges.
+        for n in self._neighbors(i):
+            if n is None or not self.land[n]:
+                edges[OPEN] = edges.get(OPEN, 0) + 1
+            elif self.owner[n]:
+                edges[self.owner[n]] = edges.get(self.owner[n], 0) + 1
+        return edges
+
+    def _new_region(self, cells):
+        region = Region(self.next_label)
+        self.next_label += 1
+        region.cells = cells
+        for i in cells:
+            self.labels[i] = region.label
+            self._cell_edges(i, region.edges)
+        self.regions[region.label] = region
+        return region
+
+    def refresh(self):
+        if not self.dirty:
+            return
+        if len(self.dirty) > self.land_cells // REBUILD_DIVISOR:
+            # Bulk changes (e.g. a restored save) are cheaper to re-flood than to apply one by one.
+            self.rebuild()
+            return
+        current = self.world.owner.reshape(-1)
+        for i in sorted(self.dirty):
+            old, new = self.owner[i], int(current[i])
+            if old == new or not self.land[i]:
+                continue
+            if old == 0:
+                self._take(i, new)
+            elif new == 0:
+                self._release(i, old)
+            else:
+                self._swap(i, old, new)
+        self.dirty.clear()
+
+    def _swap(self, i, old, new):
+        self.owner[i] = new
+        for n in self._neighbors(i):
+            if n is not None and self.labels[n]:
+                self.regions[self.labels[n]].add_edges({old: -1, new: 1})
+
+    def _take(self, i, new):
+        # Unowned cell i becomes owned by civ new.
+        region = self.regions[self.labels[i]]
+        region.add_edges(self._cell_edges(i, {}), -1)
+        region.cells.discard(i)
+        self.labels[i] = 0
+        self.owner[i] = new
+        seeds = []
+        for n in self._neighbors(i):
+            if n is not None and self.labels[n]:
+                region.add_edges({new: 1})
+                if n not in seeds:
+                    seeds.append(n)
+        if not region.cells:
+            del self.regions[region.label]
+        elif len(seeds) > 1:
+            self._split(region, seeds)
+
+    def _release(self, i, old):
+        # Owned cell i becomes unowned: it joins (and may merge) the regions around it.
+        labels = {self.labels[n] for n in self._neighbors(i) if n is not None and self.labels[n]}
+        for n in self._neighbors(i):
+            if n is not None and self.labels[n]:
+                self.regions[self.labels[n]].add_edges({old: 1}, -1)
+        self.owner[i] = 0
+        if not labels:
+            self._new_region({i})
+            return
+        regions = sorted((self.regions[label] for label in labels), key=lambda region: len(region.cells), reverse=True)
+        base = regions[0]
+        for region in regions[1:]:
+            for cell in region.cells:
+                self.labels[cell] = base.label
+            base.cells |= region.cells
+            base.add_edges(region.edges)
+            del self.regions[region.label]
+        base.cells.add(i)
+        self.labels[i] = base.label
+        base.add_edges(self._cell_edges(i, {}))
+
+    def _split(self, region, seeds):
+        """
+        Interleaved searches from the unowned neighbours of a removed cell. A
+        search group that runs out of cells before meeting the others is a
+        separate piece and gets its own region; the work stays proportional to
+        the smaller pieces.
+        """
+        parent = list(range(len(seeds)))
+
+        def find(k):
+            while parent[k] != k:
+                parent[k] = parent[parent[k]]
+                k = parent[k]
+            return k
+
+        seen = {seed: k for k, seed in enumerate(seeds)}
+        queues = [deque([seed]) for seed in seeds]
+        while True:
+            groups = {}
+            for k in range(len(seeds)):
+                groups.setdefault(find(k), []).append(k)
+            active = [members for members in groups.values() if any(queues[k] for k in members)]
+            if len(groups) == 1 or len(active) < 2:
+                break
+            for members in active:
+                k = next(k for k in members if queues[k])
+                for n in self._neighbors(queues[k].popleft()):
+                    if n is None or self.labels[n] != region.label:
+                        continue
+                    if n in seen:
+                        a, b = find(k), find(seen[n])
+                        if a != b:
+                            parent[b] = a
+                    else:
+                        seen[n] = k
+                        queues[k].append(n)
+        if len(groups) == 1:
+            return
+        closed = [root for root, members in groups.items() if not any(queues[k] for k in members)]
+        if len(closed) == len(groups):
+            # Every piece was fully explored; the largest keeps the original label.
+            sizes = {root: 0 for root in closed}
+            for k in seen.values():
+                sizes[find(k)] += 1
+            closed.remove(max(closed, key=sizes.get))
+        for root in closed:
+            cells = {cell for cell, k in seen.items() if find(k) == root}
+            region.cells -= cells
+            piece = self._new_region(cells)
+            region.add_edges(piece.edges, -1)
+
+    def enclosed_cells(self, civ_id):
+        """
+        Lists, region by region, the cells that update_surrounded_territory_group
+        claims for civ_id. Regions and cells come in the order the full scan
+        (full_enclosure_scan) would visit them.
+        """
+        self.refresh()
+        enclosed = [region for region in self.regions.values() if region.enclosed_by(civ_id)]
+        groups = []
+        for region in sorted(enclosed, key=lambda region: min(region.cells)):
+            groups.append(self._bfs_order(min(region.cells), region.label))
+        return groups
+
+    def _bfs_order(self, seed, label):
+        order = [seed]
+        seen = {seed}
+        queue = deque([seed])
+        while queue:
+            for n in self._neighbors(queue.popleft()):
+                if n is not None and n not in seen and self.labels[n] == label:
+                    seen.add(n)
+                    order.append(n)
+                    queue.append(n)
+        return order
+
+def full_enclosure_scan(world, civ_id):
+    """
+    Reference implementation: the original whole-map flood fill. Returns the
+    groups of flat cell indices it would claim for civ_id, without claiming them.
+    """
+    width, height = world.width, world.height
+    land = world.land.tolist()
+    owner = world.owner.tolist()
+    visited = [[False] * width for _ in range(height)]
+    groups = []
+    for y in range(1, height - 1):
+        for x in range(1, width - 1):
+            if not visited[y][x] and land[y][x] and owner[y][x] == 0:
+                group = []
+                queue = deque([(x, y)])
+                enclosed = True
+                while queue:
+                    cx, cy = queue.popleft()
+                    if visited[cy][cx]:
+                        continue
+                    visited[cy][cx] = True
+                    group.append(cy * width + cx)
+                    if cx == 0 or cy == 0 or cx == width - 1 or cy == height - 1:
+                        enclosed = False
+                    for dx, dy in NEIGHBOR_ORDER:
+                        nx, ny = cx + dx, cy + dy
+                        if 0 <= nx < width and 0 <= ny < height:
+                            if not land[ny][nx]:
+                                enclosed = False
+                            elif not visited[ny][nx]:
+                                if owner[ny][nx] != 0 and owner[ny][nx] != civ_id:
+                                    enclosed = False
+                                elif owner[ny][nx] == 0:
+                                    queue.append((nx, ny))
+                if enclosed:
+                    groups.append(group)
+                    for i in group:
+                        owner[i // width][i % width] = civ_id
+    return groups
@@ -0,0 +1,370 @@
+# engine.py
+import random
+import sys
+import time
+import numpy as np
+from civ import Civilization, INITIAL_POPULATION
+from unit import Unit, unit_stats
+from map_ import climate_codes_of, CLIMATE_NAMES
+from world import World, BUILDING_CODES, BUILDING_NAMES
+from enclosure import EnclosureIndex
+from pathfinding import Pathfinder
+from placement import LandIndex, CapitalPlacer
+from ai_engine import AIEngine
+from turns import TurnPipeline
+
+MOVE_MULTIPLIER = 3
+RESIDENCE_POP_INCREASE = 1000
+BARRACKS_TRAIN_COST = 500
+
+# Player actions as recorded for the order journal: (kind, civ id, value, x, y).
+# value is the unit id for moves and the building code for builds.
+ACTION_MOVE = 1
+ACTION_BUILD = 2
+ACTION_TRAIN = 3
+
+# Greenland's move multiplier by climate code: faster on ice, slower in deserts and savanna.
+GREENLAND_MOVE_FACTORS = [
+    1.25 if name in ("ET (Tundra)", "EF (Ice Cap)")
+    else 0.75 if name and (name.startswith("B") or name.startswith("Aw"))
+    else 1.0
+    for name in CLIMATE_NAMES
+]
+
+class Game:
+    """
+    Game state and turn logic with no pygame dependency. Drive it with step();
+    play.Game adds the rendering on top. Every random draw comes from the
+    game's own RNG, so a seed plus the journaled player actions reproduce a game.
+    """
+    def __init__(self, grid_width, grid_height, civ_names, climate_grid, land_mask, seed=None):
+        self.full_width = grid_width
+        self.full_height = grid_height
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.actions = []    # player actions of the current turn
+        self.journal = None  # journal.JournalWriter recording each finished turn
+        self.reach_cache = {}  # (x, y, move points) -> (reachable tiles, came_from), cleared every turn
+        self.turn = 0
+        self.unit_counter = 0
+        self.civs = []
+        self.climate_grid = climate_grid
+        self.land_mask = land_mask
+        self.init_map()
+        self.init_civs(civ_names)
+        self.ai = AIEngine(self)
+        self.pipeline = TurnPipeline(self)
+        self.season = self.get_player_season()
+
+    def init_map(self):
+        # The world store fills in latitude-band climates for land without one.
+        self.world = World(climate_codes_of(self.climate_grid), self.land_mask)
+        self.map = self.world
+        self.enclosure = EnclosureIndex(self.world)
+        self.paths = Pathfinder(self.world)
+        self.land_index = LandIndex(self.world)
+
+    def init_civs(self, civ_names, capital_spacing=None):
+        # Capitals are drawn from the land index, at least capital_spacing tiles
+        # apart where the land allows (default: from the land per civ).
+        placer = CapitalPlacer(self.world, self.land_index, len(civ_names), capital_spacing)
+        traits_list = [{} for _ in civ_names]
+        self.rng.shuffle(traits_list)
+        for i, name in enumerate(civ_names):
+            is_human = (i == 0)
+            civ = Civilization(name, traits_list[i], is_human)
+            self.civs.append(civ)
+            self.world.add_civ(civ)
+            civ.population = INITIAL_POPULATION
+            civ.residences = 0
+            civ.barracks = 0
+            site = placer.place(self.rng, civ.climate_preferences)
+            if site is None:
+                print(f"No free land left for the capital of {civ.name}.")
+            else:
+                x, y = site
+                tile = self.map[y][x]
+                tile.owner = civ
+                civ.capital = (x, y)
+                tile.building = "Capital"
+                new_unit = self.create_unit(civ, self.rng.choice(list(unit_stats.keys())), x, y)
+                tile.units.append(new_unit)
+                civ.units.append(new_unit)
+            if civ.capital:
+                cx, cy = civ.capital
+                for dy in range(-1, 2):
+                    for dx in range(-1, 2):
+                        nx, ny = cx + dx, cy + dy
+                        if 0 <= nx < self.full_width and 0 <= ny < self.full_height:
+                            tile = self.map[ny][nx]
+                            if tile is not None and tile.owner is None:
+                                tile.owner = civ
+
+    def create_unit(self, civ, unit_type, x, y):
+        self.unit_counter += 1
+        return Unit(self.unit_counter, civ, unit_type, x, y, MOVE_MULTIPLIER)
+
+    def get_player_season(self):
+        capital = self.civs[0].capital
+        if capital is None:
+            return "Unknown"
+        cx, cy = capital
+        lat = 90 - (cy / self.full_height) * 180  # positive: northern; negative: southern
+        capital_climate = self.map[cy][cx].climate
+        turn_in_cycle = self.turn % 60
+        if capital_climate and capital_climate.startswith("A"):
+            if lat >= 0:
+                return "Dry Season" if turn_in_cycle < 30 else "Wet Season"
+            else:
+                return "Wet Season" if turn_in_cycle < 30 else "Dry Season"
+        else:
+            if lat >= 0:
+                if turn_in_cycle < 15:
+                    return "Winter"
+                elif turn_in_cycle < 30:
+                    return "Spring"
+                elif turn_in_cycle < 45:
+                    return "Summer"
+                else:
+                    return "Autumn"
+            else:
+                if turn_in_cycle < 15:
+                    return "Summer"
+                elif turn_in_cycle < 30:
+                    return "Autumn"
+                elif turn_in_cycle < 45:
+                    return "Winter"
+                else:
+                    return "Spring"
+
+    def update_season(self):
+        for civ in self.civs:
+            if civ.is_human:
+                for unit in civ.units:
+                    unit.remaining_move = unit.base_move * MOVE_MULTIPLIER
+        self.season = self.get_player_season()
+
+    def get_effective_move(self, unit):
+        base = unit.base_move * MOVE_MULTIPLIER
+        if unit.civ.name == "Greenland":
+            return int(base * GREENLAND_MOVE_FACTORS[self.world.climate[unit.y, unit.x]])
+        return int(base)
+
+    def reachable(self, unit):
+        """
+        {(x, y): route cost} of every tile unit can be ordered to this turn.
+        Computed once per origin, move points and turn and shared by the
+        movement overlay, move validation and route().
+        """
+        return self._reach(unit)[0]
+
+    def route(self, unit, dest):
+        """
+        (route cost, [positions]) of unit's cheapest way to dest this turn,
+        start and dest included, or None when dest is out of reach.
+        """
+        tiles, came_from = self._reach(unit)
+        cost = tiles.get(dest)
+        if cost is None:
+            return None
+        return cost, self.paths.route(came_from, (unit.x, unit.y), dest)
+
+    def _reach(self, unit):
+        move = self.get_effective_move(unit)
+        key = (unit.x, unit.y, move)
+        cached = self.reach_cache.get(key)
+        if cached is None:
+            came_from = {}
+            cached = self.reach_cache[key] = (self.paths.reachable((unit.x, unit.y), move, came_from), came_from)
+        return cached
+
+    def record(self, kind, civ, value, x, y):
+        # Called once an action has been validated and applied, so the journal only holds real actions.
+        self.actions.append((kind, self.world.civ_id(civ), value, x, y))
+
+    def apply_action(self, action):
+        kind, civ_id, value, x, y = action
+        civ = self.world.civs[civ_id]
+        if kind == ACTION_MOVE:
+            self.move_selected_unit(self.world.occupancy.units[value], x, y)
+        elif kind == ACTION_BUILD:
+            self.build_building(BUILDING_NAMES[value], x, y, civ)
+        elif kind == ACTION_TRAIN:
+            self.train_unit_from_barracks(x, y, civ)
+        else:
+            raise ValueError(f"Unknown action kind: {kind}")
+
+    def move_selected_unit(self, selected_unit, target_x, target_y):
+        if (target_x, target_y) in self.reachable(selected_unit):
+            selected_unit.move_order = (target_x, target_y)
+            self.record(ACTION_MOVE, selected_unit.civ, selected_unit.id, target_x, target_y)
+        else:
+            print("Target tile is out of reach.")
+
+    def conquer_tile(self, civ, tile):
+        old_owner = tile.owner
+        tile.owner = civ
+        if old_owner and (tile.x, tile.y) == old_owner.capital:
+            self.eliminate_civ(old_owner, civ)
+
+    def build_building(self, building_type, x, y, civ):
+        if not (0 <= x < self.full_width and 0 <= y < self.full_height):
+            print("Cannot build outside the map.")
+            return
+        tile = self.map[y][x]
+        if tile is None:
+            print("Cannot build on sea.")
+            return
+        if tile.owner != civ:
+            print("This tile is not in your territory.")
+            return
+        if tile.building is not None:
+            print("A building already exists here.")
+            return
+        if building_type == "Capital":
+            print("Capital already exists for your country.")
+            return
+        elif building_type == "Residence":
+            tile.building = "Residence"
+            civ.population += RESIDENCE_POP_INCREASE
+            civ.residences += 1
+        elif building_type == "Barracks":
+            tile.building = "Barracks"
+            civ.barracks += 1
+        elif building_type == "Igluvijaq":
+            if tile.climate not in ["ET (Tundra)", "EF (Ice Cap)"]:
+                print("Igluvijaq can only be built in cold climates (Tundra or Ice Cap).")
+                return
+            tile.building = "Igluvijaq"
+            self.record(ACTION_BUILD, civ, BUILDING_CODES[building_type], x, y)
+            print(f"{civ.name} built Igluvijaq at ({x}, {y}).")
+            return
+        else:
+            print("Invalid building type.")
+            return
+        self.record(ACTION_BUILD, civ, BUILDING_CODES[building_type], x, y)
+        print(f"{civ.name} built a {building_type} at ({x}, {y}).")
+
+    def eliminate_civ(self, civ, conqueror):
+        civ.alive = False
+        self.world.transfer_owner(civ, conqueror)
+        self.world.occupancy.remove_civ(civ)
+        civ.units.clear()
+
+    def train_unit_from_barracks(self, x, y, civ):
+        tile = self.map[y][x] if 0 <= x < self.full_width and 0 <= y < self.full_height else None
+        if tile is None or tile.building != "Barracks":
+            print("No barracks on this tile.")
+            return
+        if civ.population < BARRACKS_TRAIN_COST:
+            print("Not enough population to train a unit.")
+            return
+        civ.population -= BARRACKS_TRAIN_COST
+        new_unit = self.create_unit(civ, self.rng.choice(list(unit_stats.keys())), x, y)
+        tile.units.append(new_unit)
+        civ.units.append(new_unit)
+        self.record(ACTION_TRAIN, civ, 0, x, y)
+        print(f"{civ.name} trained a new unit at barracks ({x}, {y}).")
+
+    def update_surrounded_territory_group(self, civ):
+        # Claims every unowned land region bordered only by civ (no sea, no map edge).
+        for group in self.enclosure.enclosed_cells(self.world.civ_id(civ)):
+            for i in group:
+                gx, gy = i % self.full_width, i // self.full_width
+                self.map[gy][gx].owner = civ
+
+    def ai_turn(self):
+        """
+        Resolves the turn through the phased pipeline: pending move orders,
+        combat, AI moves, territory claims, enclosure and upkeep.
+        """
+        # A fresh generator per turn, seeded from the game RNG, keeps snapshots replayable.
+        self.pipeline.run(np.random.default_rng(self.rng.getrandbits(64)))
+
+    def issue_orders(self, orders):
+        # orders: iterable of (unit, (x, y)) pairs, validated like a player click.
+        for unit, (x, y) in orders:
+            self.move_selected_unit(unit, x, y)
+
+    def step(self, orders=()):
+        """
+        Plays one turn: issues the player's orders, then resolves them with
+        the AI's through the turn pipeline. Returns the new turn number.
+        """
+        self.issue_orders(orders)
+        if self.journal is not None:
+            self.journal.write_turn(self.turn, self.actions)
+        self.actions = []
+        self.ai_turn()
+        return self.turn
+
+    def snapshot(self):
+        """
+        Copy of the mutable game state: owner/building grids, a unit table in
+        tile order, per-civ records and the RNG state. restore() puts it back.
+        """
+        units = [self.world.occupancy.units[unit_id] for tile in self.world.occupancy.tiles.values() for unit_id in tile]
+        return {
+            "turn": self.turn,
+            "unit_counter": self.unit_counter,
+            "season": self.season,
+            "rng": self.rng.getstate(),
+            "owner": self.world.owner.copy(),
+            "building": self.world.building.copy(),
+            "units": [(unit.id, self.world.civ_id(unit.civ), unit.unit_type, unit.x, unit.y, unit.hp, unit.attack,
+                       unit.base_move, unit.remaining_move, unit.move_order) for unit in units],
+            "civs": [{"alive": civ.alive, "capital": civ.capital, "population": civ.population,
+                      "residences": civ.residences, "barracks": civ.barracks,
+                      "units": [unit.id for unit in civ.units]}
+                     for civ in self.civs],
+        }
+
+    def restore(self, state):
+        self.turn = state["turn"]
+        self.unit_counter = state["unit_counter"]
+        self.season = state["season"]
+        self.rng.setstate(state["rng"])
+        self.actions = []
+        self.reach_cache.clear()
+        self.world.load_grids(state["owner"], state["building"])
+        self.world.clear_units()
+        units = {}
+        for unit_id, civ_id, unit_type, x, y, hp, attack, base_move, remaining_move, move_order in state["units"]:
+            unit = Unit(unit_id, self.world.civs[civ_id], unit_type, x, y, MOVE_MULTIPLIER)
+            unit.hp, unit.attack, unit.base_move, unit.remaining_move = hp, attack, base_move, remaining_move
+            unit.move_order = tuple(move_order) if move_order is not None else None
+            self.world.occupancy.add(unit)
+            units[unit_id] = unit
+        for civ, record in zip(self.civs, state["civs"]):
+            civ.alive = record["alive"]
+            civ.capital = tuple(record["capital"]) if record["capital"] is not None else None
+            civ.population = record["population"]
+            civ.residences = record["residences"]
+            civ.barracks = record["barracks"]
+            civ.units = [units[unit_id] for unit_id in record["units"]]
+
+def default_civ_names(ai_civs=4, player_name="Greenland"):
+    return [player_name] + [f"Base_Civ {i}" for i in range(1, ai_civs + 1)]
+
+def simulate(turns, seed=None, downsample_factor=10, ai_civs=4, player_name="Greenland"):
+    """
+    Headless game: loads the cached map and plays turns with no player
+    orders. Returns (game, seconds spent stepping).
+    """
+    from map_ import CLIMATE_RASTER_FILENAME, CLIMATE_MAPPING
+    from map_cache import load_cached_map_data
+    climate_grid, land_mask, width, height = load_cached_map_data(CLIMATE_RASTER_FILENAME, downsample_factor, CLIMATE_MAPPING)
+    game = Game(width, height, default_civ_names(ai_civs, player_name), climate_grid, land_mask, seed)
+    start = time.perf_counter()
+    for _ in range(turns):
+        game.step()
+    return game, time.perf_counter() - start
+
+if __name__ == "__main__":
+    # python engine.py [turns] [seed] [downsample_factor] [ai_civs]
+    args = [int(arg) for arg in sys.argv[1:]]
+    turns, seed, factor, ai_civs = (args + [100, 0, 10, 4][len(args):])[:4]
+    game, elapsed = simulate(turns, seed, factor, ai_civs)
+    print(f"{turns} turns (seed {seed}, factor {factor}, {ai_civs} AI civs) in {elapsed:.3f}s: "
+          f"{turns / elapsed if elapsed else float('inf'):.1f} turns/s")
+    print("territory:", ", ".join(f"{civ.name} {len(civ.territory)}" for civ in game.civs))
@@ -0,0 +1,139 @@
+# journal.py
+import json
+import os
+import struct
+import sys
+import time
+from engine import Game
+
+JOURNAL_MAGIC = b"CIVJ"
+JOURNAL_VERSION = 3
+JOURNAL_DIR = "journals"
+SNAPSHOT_INTERVAL = 25  # replay keeps a state snapshot every this many turns
+
+# File layout: magic, version, JSON header (length-prefixed), then one record
+# per finished turn: TURN_RECORD followed by that many ACTION_RECORDs.
+PREAMBLE = struct.Struct("<4sHI")    # magic, version, header length
+TURN_RECORD = struct.Struct("<IH")   # turn, action count
+ACTION_RECORD = struct.Struct("<BHIHH")  # kind, civ id, value, x, y
+
+class JournalWriter:
+    """
+    Append-only record of the player actions of every turn. The header holds
+    what is needed to rebuild the starting position: seed, map and civ names.
+    """
+    def __init__(self, path, game, downsample_factor, base_save=None):
+        self.path = path
+        header = {
+            "seed": game.seed,
+            "downsample_factor": downsample_factor,
+            "width": game.full_width,
+            "height": game.full_height,
+            "civ_names": [civ.name for civ in game.civs],
+            "start_turn": game.turn,
+            "base_save": base_save,  # save file holding the state at start_turn, for games resumed from a save
+        }
+        data = json.dumps(header).encode()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "wb")
+        self.file.write(PREAMBLE.pack(JOURNAL_MAGIC, JOURNAL_VERSION, len(data)) + data)
+        self.file.flush()
+
+    def write_turn(self, turn, actions):
+        record = [TURN_RECORD.pack(turn, len(actions))]
+        record += [ACTION_RECORD.pack(*action) for action in actions]
+        self.file.write(b"".join(record))
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+def new_journal_path(journal_dir=JOURNAL_DIR):
+    base = os.path.join(journal_dir, time.strftime("game_%Y%m%d_%H%M%S"))
+    path, n = base + ".journal", 1
+    while os.path.exists(path):
+        path, n = f"{base}_{n}.journal", n + 1
+    return path
+
+def read_journal(path):
+    """
+    Returns (header, turns) where turns maps each recorded turn to its list of
+    (kind, civ id, value, x, y) actions. A truncated final record is ignored.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, header_length = PREAMBLE.unpack_from(data, 0)
+    if magic != JOURNAL_MAGIC:
+        raise ValueError(f"{path} is not a game journal")
+    if version != JOURNAL_VERSION:
+        raise ValueError(f"Unsupported journal version {version}")
+    offset = PREAMBLE.size
+    header = json.loads(data[offset:offset + header_length])
+    offset += header_length
+    turns = {}
+    while offset + TURN_RECORD.size <= len(data):
+        turn, count = TURN_RECORD.unpack_from(data, offset)
+        end = offset + TURN_RECORD.size + count * ACTION_RECORD.size
+        if end > len(data):
+            break
+        turns[turn] = [action for action in ACTION_RECORD.iter_unpack(data[offset + TURN_RECORD.size:end])]
+        offset = end
+    return header, turns
+
+class Replay:
+    """
+    Headless re-run of a journaled game. seek(turn) restores the nearest
+    snapshot at or before turn and replays only the turns after it.
+    """
+    def __init__(self, path, snapshot_interval=SNAPSHOT_INTERVAL, map_data=None):
+        from map_ import CLIMATE_RASTER_FILENAME, CLIMATE_MAPPING
+        from map_cache import load_cached_map_data
+        self.header, self.turns = read_journal(path)
+        self.snapshot_interval = snapshot_interval
+        if map_data is None:
+            map_data = load_cached_map_data(CLIMATE_RASTER_FILENAME, self.header["downsample_factor"], CLIMATE_MAPPING)
+        climate_grid, land_mask, width, height = map_data
+        if (width, height) != (self.header["width"], self.header["height"]):
+            raise ValueError("Journal was recorded on a different map size")
+        self.game = Game(width, height, self.header["civ_names"], climate_grid, land_mask, self.header["seed"])
+        if self.header.get("base_save"):
+            from savegame import read_state
+            self.game.restore(read_state(self.header["base_save"])[1])
+        self.snapshots = {self.game.turn: self.game.snapshot()}
+
+    @property
+    def last_turn(self):
+        # The turn reached after replaying every recorded turn.
+        return max(self.turns) + 1 if self.turns else self.game.turn
+
+    def seek(self, turn):
+        game = self.game
+        if turn < self.header["start_turn"]:
+            raise ValueError(f"Journal starts at turn {self.header['start_turn']}")
+        if not game.turn <= turn or any(game.turn < t <= turn for t in self.snapshots):
+            base = max(t for t in self.snapshots if t <= turn)
+            game.restore(self.snapshots[base])
+        while game.turn < turn:
+            if game.turn not in self.turns:
+                raise ValueError(f"Journal has no record of turn {game.turn}")
+            for action in self.turns[game.turn]:
+                game.apply_action(action)
+            game.step()
+            if game.turn % self.snapshot_interval == 0 and game.turn not in self.snapshots:
+                self.snapshots[game.turn] = game.snapshot()
+        return game
+
+if __name__ == "__main__":
+    # python journal.py <journal> [turn] -> replay headless up to turn (default: the end)
+    if len(sys.argv) < 2:
+        print("Usage: python journal.py <journal> [turn]")
+        sys.exit(1)
+    replay = Replay(sys.argv[1])
+    target = int(sys.argv[2]) if len(sys.argv) > 2 else replay.last_turn
+    start = time.perf_counter()
+    game = replay.seek(target)
+    elapsed = time.perf_counter() - start
+    print(f"Replayed to turn {game.turn} in {elapsed:.3f}s (seed {game.seed})")
+    print("territory:", ", ".join(f"{civ.name} {len(civ.territory)}" for civ in game.civs))
@@ -1,15 +1,26 @@
 import pygame
 import sys
 import os
+import time
 import numpy as np
 import rasterio
-from map_ import load_map_data, create_minimap_surface
-from play import Game, draw_minimap, MAIN_TILE_SIZE, INFO_PANEL_HEIGHT, MOVE_MULTIPLIER, PLAYER_UNIT_COLOR, AI_UNIT_COLOR
+from map_ import CLIMATE_RASTER_FILENAME, CLIMATE_MAPPING
+from map_cache import load_cached_map_data
+from pyramid import MapPyramid
+from play import Game, draw_minimap, MAIN_TILE_SIZE, INFO_PANEL_HEIGHT, MINIMAP_SCALE, PLAYER_UNIT_COLOR, AI_UNIT_COLOR
+from minimap import LiveMinimap
 from building import building_menu
+from text_cache import get_font, render_text
+from assets import AssetManager, CircularViewport
+from journal import JournalWriter, new_journal_path
+from savegame import QUICKSAVE_PATH, save_game, save_game_async, load_into
+from render_loop import RenderScheduler
+from profiler import Profiler
 
 # 기본 상수 (영어 인터페이스)
 DEFAULT_AI_NAME = "Base_Civ"
 DEFAULT_AI_FLAG = "Base_Civ_circle.png"
+PAN_SPEED = 15   # tiles per second while an arrow key is held
 FLAG_MAPPING = {
     "GRL": "GRL_circle.png",
     "Base_Civ": DEFAULT_AI_FLAG
@@ -22,6 +33,10 @@ UNIT_MODELS = {
     "Cavalry": "cavalry.png"
 }
 
+def civ_flag_name(civ):
+    fallback = civ.internal_name if (hasattr(civ, 'internal_name') and isinstance(civ.internal_name, str)) else str(civ.name)
+    return FLAG_MAPPING.get(civ.name, fallback + "_circle.png")
+
 # --- Credit display function ---
 def display_credits(screen, font):
     screen.fill((0, 0, 0))
@@ -31,7 +46,7 @@ def display_credits(screen, font):
             lines = f.read().splitlines()
     else:
         lines = ["[Credits file not found.]"]
-    bold_font = pygame.font.SysFont(None, 36, bold=True)
+    bold_font = get_font(None, 36, bold=True)
     normal_font = font
     rendered_lines = []
     for line in lines:
@@ -66,7 +81,7 @@ def display_credits(screen, font):
         for surf in rendered_lines:
             screen.blit(surf, (50, y))
             y += surf.get_height() + 10
-        prompt = font.render("Use Up/Down arrows to scroll, press any key to return...", True, (200, 200, 200))
+        prompt = render_text(font, "Use Up/Down arrows to scroll, press any key to return...", (200, 200, 200))
         screen.blit(prompt, (50, y + 20))
         pygame.display.flip()
         for event in pygame.event.get():
@@ -125,7 +140,11 @@ def get_civ_detail(civ_abbrev):
         }
 
 # --- 문명 선택 화면 ---
-def civilization_selection_screen(screen, font):
+def civilization_selection_screen(screen, font, assets=None):
+    if assets is None:
+        assets = AssetManager()
+    missing_icon = pygame.Surface((100, 100))
+    missing_icon.fill((100, 100, 100))
     available_civs = get_available_civilizations()  # list of (folder_abbrev, full_name)
     if not available_civs:
         available_civs = [("GRL", "Greenland")]
@@ -142,16 +161,12 @@ def civilization_selection_screen(screen, font):
         screen.fill((50, 50, 50))
         x = 20 - scroll_offset
         for idx, (civ_abbrev, full_name) in enumerate(available_civs):
-            icon_path = os.path.join("gfx", civ_abbrev + "_circle.png")
-            if os.path.exists(icon_path):
-                icon_img = pygame.image.load(icon_path).convert_alpha()
-                icon_img = pygame.transform.scale(icon_img, (100, 100))
-            else:
-                icon_img = pygame.Surface((100, 100))
-                icon_img.fill((100, 100, 100))
+            icon_img = assets.sprite(civ_abbrev + "_circle.png", (100, 100), circle=False)
+            if icon_img is None:
+                icon_img = missing_icon
             icon_rect = icon_img.get_rect(topleft=(x, 25))
             screen.blit(icon_img, icon_rect)
-            name_text = font.render(full_name, True, (255, 255, 255))
+            name_text = render_text(font, full_name, (255, 255, 255))
             screen.blit(name_text, (x, 130))
             if idx == selected_index:
                 pygame.draw.rect(screen, (255, 255, 0), icon_rect, 3)
@@ -167,17 +182,17 @@ def civilization_selection_screen(screen, font):
             f"Unique Building: {detail['unique_building']}"
         ]
         for line in details:
-            line_surf = font.render(line, True, (255, 255, 255))
+            line_surf = render_text(font, line, (255, 255, 255))
             screen.blit(line_surf, (50, y))
             y += line_surf.get_height() + 10
         
         pygame.draw.rect(screen, (0, 128, 0), start_btn_rect)
-        start_text = font.render("Start Game", True, (255, 255, 255))
+        start_text = render_text(font, "Start Game", (255, 255, 255))
         st_rect = start_text.get_rect(center=start_btn_rect.center)
         screen.blit(start_text, st_rect)
         
         pygame.draw.rect(screen, (0, 0, 128), credit_btn_rect)
-        credit_text = font.render("Credits", True, (255, 255, 255))
+        credit_text = render_text(font, "Credits", (255, 255, 255))
         ct_rect = credit_text.get_rect(center=credit_btn_rect.center)
         screen.blit(credit_text, ct_rect)
         
@@ -218,7 +233,7 @@ def show_loading_bar(screen, font):
         fill_width = int((i / 100) * bar_rect.width)
         fill_rect = pygame.Rect(bar_rect.x, bar_rect.y, fill_width, bar_rect.height)
         pygame.draw.rect(screen, (0, 255, 0), fill_rect)
-        percent_text = font.render(f"Loading... {i}%", True, (255, 255, 255))
+        percent_text = render_text(font, f"Loading... {i}%", (255, 255, 255))
         pct_rect = percent_text.get_rect(center=bar_rect.center)
         screen.blit(percent_text, pct_rect)
         pygame.display.flip()
@@ -227,34 +242,100 @@ def show_loading_bar(screen, font):
     pygame.display.flip()
 
 # --- In-game movement display functions ---
-def show_movement_range(screen, unit, cam_x, cam_y, map_pos, effective_move, vis_cols, vis_rows):
-    overlay = pygame.Surface((MAIN_TILE_SIZE, MAIN_TILE_SIZE), pygame.SRCALPHA)
-    overlay.fill((255, 165, 0, 150))  # Orange overlay
-    for j in range(vis_rows):
-        for i in range(vis_cols):
-            world_x = cam_x + i
-            world_y = cam_y + j
-            if abs(world_x - unit.x) + abs(world_y - unit.y) <= effective_move:
-                pos_x = i * MAIN_TILE_SIZE + map_pos[0]
-                pos_y = j * MAIN_TILE_SIZE + map_pos[1]
-                screen.blit(overlay, (pos_x, pos_y))
+class MovementOverlay:
+    """
+    Orange mask over the tiles the selected unit can reach, pre-rendered into
+    one view-sized surface and rebuilt only when the reachable set or the
+    camera changes.
+    """
+    def __init__(self, color=(255, 165, 0, 150)):
+        self.color = color
+        self.reach = None
+        self.view = None
+        self.surface = None
 
-def show_hover_border(screen, cam_x, cam_y, map_pos, vis_cols, vis_rows):
+    def draw(self, screen, reach, cam_x, cam_y, map_pos, vis_cols, vis_rows):
+        view = (cam_x, cam_y, vis_cols, vis_rows)
+        if reach is not self.reach or view != self.view:
+            self.surface = pygame.Surface((vis_cols * MAIN_TILE_SIZE, vis_rows * MAIN_TILE_SIZE), pygame.SRCALPHA)
+            for x, y in reach:
+                i, j = x - cam_x, y - cam_y
+                if 0 <= i < vis_cols and 0 <= j < vis_rows:
+                    self.surface.fill(self.color, (i * MAIN_TILE_SIZE, j * MAIN_TILE_SIZE, MAIN_TILE_SIZE, MAIN_TILE_SIZE))
+            self.reach, self.view = reach, view
+        screen.blit(self.surface, map_pos)
+
+def hover_rect(map_pos):
+    # Screen rect of the tile under the mouse.
     mx, my = pygame.mouse.get_pos()
-    tile_x = cam_x + (mx - map_pos[0]) // MAIN_TILE_SIZE
-    tile_y = cam_y + (my - map_pos[1]) // MAIN_TILE_SIZE
-    hover_rect = pygame.Rect((tile_x - cam_x) * MAIN_TILE_SIZE + map_pos[0],
-                             (tile_y - cam_y) * MAIN_TILE_SIZE + map_pos[1],
-                             MAIN_TILE_SIZE, MAIN_TILE_SIZE)
-    pygame.draw.rect(screen, (0, 0, 255), hover_rect, 3)
+    return pygame.Rect(map_pos[0] + (mx - map_pos[0]) // MAIN_TILE_SIZE * MAIN_TILE_SIZE,
+                       map_pos[1] + (my - map_pos[1]) // MAIN_TILE_SIZE * MAIN_TILE_SIZE,
+                       MAIN_TILE_SIZE, MAIN_TILE_SIZE)
+
+def draw_hover(screen, rect, map_area):
+    screen.set_clip(map_area)
+    pygame.draw.rect(screen, (0, 0, 255), rect, 3)
+    screen.set_clip(None)
+
+def draw_units(surface, game, assets, cam_x, cam_y, map_pos, vis_cols, vis_rows):
+    for civ in game.civs:
+        if not civ.alive:
+            continue
+        flag_sprite = assets.sprite(civ_flag_name(civ), (MAIN_TILE_SIZE, MAIN_TILE_SIZE))
+        for unit in civ.units:
+            if not (cam_x <= unit.x < cam_x + vis_cols and cam_y <= unit.y < cam_y + vis_rows):
+                continue
+            pos = ((unit.x - cam_x) * MAIN_TILE_SIZE + map_pos[0],
+                   (unit.y - cam_y) * MAIN_TILE_SIZE + map_pos[1])
+            sprite = assets.sprite(UNIT_MODELS.get(unit.unit_type, "default_unit.png"), (MAIN_TILE_SIZE, MAIN_TILE_SIZE))
+            if sprite is None:
+                sprite = flag_sprite
+            if sprite is not None:
+                surface.blit(sprite, pos)
+            else:
+                col = PLAYER_UNIT_COLOR if civ.is_human else AI_UNIT_COLOR
+                center = (pos[0] + MAIN_TILE_SIZE//2, pos[1] + MAIN_TILE_SIZE//2)
+                pygame.draw.circle(surface, col, center, MAIN_TILE_SIZE//3)
+
+def draw_selection(surface, game, selected_unit, movement_overlay, cam_x, cam_y, map_pos, vis_cols, vis_rows):
+    sel_x = (selected_unit.x - cam_x) * MAIN_TILE_SIZE + map_pos[0]
+    sel_y = (selected_unit.y - cam_y) * MAIN_TILE_SIZE + map_pos[1]
+    pygame.draw.rect(surface, (255, 255, 0), (sel_x, sel_y, MAIN_TILE_SIZE, MAIN_TILE_SIZE), 2)
+    # Overlays (movement range, destination) on top of the map and units
+    movement_overlay.draw(surface, game.reachable(selected_unit), cam_x, cam_y, map_pos, vis_cols, vis_rows)
+    if selected_unit.move_order is not None:
+        dest = selected_unit.move_order
+        dx = dest[0] - cam_x
+        dy = dest[1] - cam_y
+        dest_rect = pygame.Rect(dx * MAIN_TILE_SIZE + map_pos[0],
+                                dy * MAIN_TILE_SIZE + map_pos[1],
+                                MAIN_TILE_SIZE, MAIN_TILE_SIZE)
+        pygame.draw.rect(surface, (128, 0, 128), dest_rect, 3)
+
+def draw_profile_overlay(screen, profiler, pos):
+    # Rolling percentiles of every profiled section on a dark panel; returns the rect drawn.
+    font = get_font("monospace", 16)
+    lines = profiler.lines() or ["profiler: waiting for samples"]
+    # The numbers change every frame, so they bypass the text cache instead of flushing it.
+    surfaces = [font.render(line, True, (255, 255, 255)) for line in lines]
+    width = max(surf.get_width() for surf in surfaces) + 12
+    height = sum(surf.get_height() for surf in surfaces) + 12
+    panel = pygame.Rect(pos, (width, height))
+    pygame.draw.rect(screen, (20, 20, 20), panel)
+    y = panel.y + 6
+    for surf in surfaces:
+        screen.blit(surf, (panel.x + 6, y))
+        y += surf.get_height()
+    return panel
 
 def main():
     pygame.init()
     screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
     sw, sh = screen.get_size()
-    base_font = pygame.font.SysFont(None, 36)
+    base_font = get_font(None, 36)
+    assets = AssetManager()
     
-    selected_civ = civilization_selection_screen(screen, base_font)
+    selected_civ = civilization_selection_screen(screen, base_font, assets)
     if not selected_civ:
         pygame.quit(); sys.exit()
     show_loading_bar(screen, base_font)
@@ -268,242 +349,227 @@ def main():
     
     from civ import Civilization
     ai_civ_objs = [Civilization(f"{DEFAULT_AI_NAME} {i}") for i in range(1, 5)]
-    civ_objs = [player_civ_obj] + ai_civ_objs
+    # The game builds its own Civilization records from the names.
+    civ_names = [civ.name for civ in [player_civ_obj] + ai_civ_objs]
     
     downsample_factor = 10
-    CLIMATE_RASTER_FILENAME = "koppen_geiger_0p1.tif"
-    CLIMATE_MAPPING = {
-        0: None,
-        1: "Af (Tropical Rainforest)",
-        2: "Am (Tropical Monsoon)",
-        3: "Aw (Tropical Savanna)",
-        4: "BWh (Hot Desert)",
-        5: "BSh (Hot Semi-Arid)",
-        6: "BWk (Cold Desert)",
-        7: "BSk (Cold Semi-Arid)",
-        8: "Cfa (Humid Subtropical)",
-        9: "Cfb (Oceanic)",
-        10: "Csa (Hot-Summer Mediterranean)",
-        11: "Csb (Warm-Summer Mediterranean)",
-        12: "Cwa (Monsoon-influenced Humid Subtropical)",
-        13: "Dfa (Hot Summer Continental)",
-        14: "Dfb (Warm Summer Continental)",
-        15: "Dfc (Subarctic)",
-        16: "ET (Tundra)",
-        17: "EF (Ice Cap)"
-    }
-    climate_grid, land_mask, full_width, full_height = load_map_data(CLIMATE_RASTER_FILENAME, downsample_factor, CLIMATE_MAPPING)
+    climate_grid, land_mask, full_width, full_height = load_cached_map_data(CLIMATE_RASTER_FILENAME, downsample_factor, CLIMATE_MAPPING)
     
     from play import Game
-    game = Game(full_width, full_height, civ_objs, climate_grid, land_mask)
+    game = Game(full_width, full_height, civ_names, climate_grid, land_mask)
+    game.journal = JournalWriter(new_journal_path(), game, downsample_factor)
+    game.use_pyramid(MapPyramid(), downsample_factor)
     
     flags = {}
     for civ in game.civs:
         if civ.name != player_civ_obj.name:
-            flag_path = os.path.join("gfx", FLAG_MAPPING.get(DEFAULT_AI_NAME, DEFAULT_AI_FLAG))
+            flag_name = FLAG_MAPPING.get(DEFAULT_AI_NAME, DEFAULT_AI_FLAG)
         else:
-            fallback = civ.internal_name if (hasattr(civ, 'internal_name') and isinstance(civ.internal_name, str)) else str(civ.name)
-            flag_path = os.path.join("gfx", FLAG_MAPPING.get(civ.name, fallback + "_circle.png"))
-        if os.path.exists(flag_path):
-            flags[civ.name] = pygame.image.load(flag_path).convert_alpha()
+            flag_name = civ_flag_name(civ)
+        if assets.has(flag_name):
+            flags[civ.name] = assets.image(flag_name)
     
-    castle_img = None
-    if os.path.exists("castle.png"):
-        castle_img = pygame.image.load("castle.png").convert_alpha()
-    else:
+    castle_img = assets.image("castle.png")
+    if castle_img is None:
         print("castle.png not found; capitals will be shown as gray rectangles.")
     
-    clock = pygame.time.Clock()
     turn_btn_rect = pygame.Rect(sw - 160, sh - 80, 150, 50)
-    mini_surface = create_minimap_surface(game, 1.0)
-    mini_x = sw - mini_surface.get_width() - 10
+    # Owned tiles on the minimap are tinted with the average colour of their civ's flag.
+    flag_colors = {name: pygame.transform.average_color(flag, consider_alpha=True)[:3] for name, flag in flags.items()}
+    minimap = LiveMinimap(game.world, PLAYER_UNIT_COLOR, AI_UNIT_COLOR, flag_colors, MINIMAP_SCALE)
+    mini_x = sw - minimap.surface.get_width() - 10
     mini_y = 10
+    minimap_rect = minimap.surface.get_rect(topleft=(mini_x, mini_y))
     global selected_unit
     selected_unit = None
     debug_mode = False
+    viewport = CircularViewport()
+    movement_overlay = MovementOverlay()
+    save_thread = None
+    scheduler = RenderScheduler()
+    vis_cols = sw // MAIN_TILE_SIZE
+    vis_rows = (sh - INFO_PANEL_HEIGHT) // MAIN_TILE_SIZE
+    map_area = pygame.Rect(0, 0, sw, sh - INFO_PANEL_HEIGHT)
+    info_rect = pygame.Rect(0, sh - INFO_PANEL_HEIGHT, sw, INFO_PANEL_HEIGHT)
+    # Map, units and overlays as last drawn, without the hover border, which is erased by copying from here.
+    scene = pygame.Surface(map_area.size).convert()
+    cam_x, cam_y = game.camera(vis_cols, vis_rows)
+    map_pos = ((sw - vis_cols * MAIN_TILE_SIZE) // 2, (sh - INFO_PANEL_HEIGHT - vis_rows * MAIN_TILE_SIZE) // 2)
+    hover = None
+    profiler = Profiler(game.pipeline)
+    profile_rect = None  # where the profiler overlay was last drawn
+    panning = False
+    pan_progress = [0.0, 0.0]
 
-    def mask_to_circle(surface):
-        size = surface.get_size()
-        mask_surface = pygame.Surface(size, pygame.SRCALPHA)
-        mask_surface.fill((0, 0, 0, 0))
-        pygame.draw.circle(mask_surface, (255, 255, 255, 255), (size[0] // 2, size[1] // 2), min(size) // 2)
-        result = surface.copy()
-        result.blit(mask_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-        return result
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_d:
-                    debug_mode = not debug_mode
-                elif event.key == pygame.K_ESCAPE:
+    # The journal is closed however the loop ends (window close, ESC, an error), so no turn is lost.
+    try:
+        while True:
+            for event in scheduler.events(panning):
+                if event.type == pygame.QUIT:
                     pygame.quit(); sys.exit()
-                elif event.key == pygame.K_n:
-                    print("New unit creation is only allowed through barracks training.")
-                elif event.key == pygame.K_t:
-                    if selected_unit is None:
-                        mx, my = pygame.mouse.get_pos()
-                        tile_i = mx // MAIN_TILE_SIZE
-                        tile_j = my // MAIN_TILE_SIZE
-                        cam_x, cam_y, vis_cols, vis_rows = game.draw_main_view(screen, MAIN_TILE_SIZE, castle_img, debug_mode)
-                        world_x = cam_x + tile_i
-                        world_y = cam_y + tile_j
-                        game.train_unit_from_barracks(world_x, world_y, game.civs[0])
-                    else:
-                        print("Please deselect unit before training from barracks.")
-                elif event.key == pygame.K_b:
-                    if selected_unit is not None:
-                        choice = building_menu(screen, pygame.font.SysFont(None, 30))
-                        if choice is not None:
-                            sx, sy = selected_unit.x, selected_unit.y
-                            game.build_building(choice, sx, sy, game.civs[0])
-                    else:
-                        print("No unit selected for building construction.")
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                mx, my = pygame.mouse.get_pos()
-                if turn_btn_rect.collidepoint(mx, my):
-                    for unit in [u for u in game.civs[0].units if u.move_order is not None]:
-                        sx, sy = unit.x, unit.y
-                        dest = unit.move_order
-                        dest_tile = game.map[dest[1]][dest[0]]
-                        if dest_tile is not None and any(e for e in dest_tile.units if e.civ != unit.civ):
-                            defender = [e for e in dest_tile.units if e.civ != unit.civ][0]
-                            orig = (sx, sy)
-                            game.combat(unit, defender)
-                            if defender.hp > 0:
-                                if unit in game.map[unit.y][unit.x].units:
-                                    game.map[unit.y][unit.x].units.remove(unit)
-                                unit.x, unit.y = orig
-                                game.map[orig[1]][orig[0]].units.append(unit)
-                                unit.move_order = None
-                                continue
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_d:
+                        # Debug mode shows climate labels and the profiler overlay.
+                        debug_mode = not debug_mode
+                        profiler.set_enabled(debug_mode)
+                    elif event.key == pygame.K_z:
+                        # Detail zoom paints native-resolution climate inside each tile; off, colours follow the game grid.
+                        game.detail_zoom = not game.detail_zoom
+                    elif event.key == pygame.K_F6:
+                        if profiler.samples:
+                            print(f"Profile written to {profiler.export()}.json/.csv")
+                        else:
+                            print("No profile samples yet; turn on debug mode (D) first.")
+                    elif event.key == pygame.K_F7:
+                        path = profiler.toggle_cprofile()
+                        print(f"cProfile dump written to {path}." if path else "cProfile capture started; press F7 again to stop.")
+                    elif event.key == pygame.K_ESCAPE:
+                        pygame.quit(); sys.exit()
+                    elif event.key == pygame.K_F5:
+                        if save_thread is None or not save_thread.is_alive():
+                            save_thread = save_game_async(game, QUICKSAVE_PATH, downsample_factor,
+                                                          on_done=lambda path: print(f"Game saved to {path}."))
+                    elif event.key == pygame.K_F9:
+                        if save_thread is not None:
+                            save_thread.join()
+                        if not os.path.exists(QUICKSAVE_PATH):
+                            print("No quicksave to load.")
+                        elif load_into(game, QUICKSAVE_PATH):
+                            selected_unit = None
+                            # The old journal no longer leads to this state; continue in a new one based on the save.
+                            game.journal.close()
+                            journal_path = new_journal_path()
+                            base_save = save_game(game, journal_path + ".sav", downsample_factor)
+                            game.journal = JournalWriter(journal_path, game, downsample_factor, base_save)
+                            print(f"Loaded {QUICKSAVE_PATH} (turn {game.turn}).")
+                    elif event.key == pygame.K_n:
+                        print("New unit creation is only allowed through barracks training.")
+                    elif event.key == pygame.K_t:
+                        if selected_unit is None:
+                            mx, my = pygame.mouse.get_pos()
+                            world_x = cam_x + (mx - map_pos[0]) // MAIN_TILE_SIZE
+                            world_y = cam_y + (my - map_pos[1]) // MAIN_TILE_SIZE
+                            if 0 <= world_x < game.full_width and 0 <= world_y < game.full_height:
+                                game.train_unit_from_barracks(world_x, world_y, game.civs[0])
+                            else:
+                                print("No barracks on this tile.")
+                        else:
+                            print("Please deselect unit before training from barracks.")
+                    elif event.key == pygame.K_b:
+                        if selected_unit is not None:
+                            choice = building_menu(screen, get_font(None, 30))
+                            scheduler.invalidate_all()
+                            if choice is not None:
+                                sx, sy = selected_unit.x, selected_unit.y
+                                game.build_building(choice, sx, sy, game.civs[0])
                         else:
-                            if dest[0] != sx:
-                                step = 1 if dest[0] > sx else -1
-                                for x in range(sx, dest[0] + step, step):
-                                    tile = game.map[sy][x]
-                                    if tile is not None and tile.owner is None:
-                                        tile.owner = unit.civ
-                                        unit.civ.territory.add((x, sy))
-                            if dest[1] != sy:
-                                step = 1 if dest[1] > sy else -1
-                                for y in range(sy, dest[1] + step, step):
-                                    tile = game.map[y][dest[0]]
-                                    if tile is not None and tile.owner is None:
-                                        tile.owner = unit.civ
-                                        unit.civ.territory.add((dest[0], y))
-                        game.map[unit.y][unit.x].units.remove(unit)
-                        unit.x, unit.y = dest
-                        game.map[unit.y][unit.x].units.append(unit)
-                        cost = abs(dest[0] - sx) + abs(dest[1] - sy)
-                        unit.remaining_move = max(0, unit.remaining_move - cost)
-                        unit.move_order = None
-                    game.ai_turn()
-                    for unit in game.civs[0].units:
-                        unit.remaining_move = unit.base_move * MOVE_MULTIPLIER
-                    selected_unit = None
-                elif 0 <= mx < sw and 0 <= my < sh - INFO_PANEL_HEIGHT:
-                    tile_i = mx // MAIN_TILE_SIZE
-                    tile_j = my // MAIN_TILE_SIZE
-                    vis_cols = sw // MAIN_TILE_SIZE
-                    vis_rows = (sh - INFO_PANEL_HEIGHT) // MAIN_TILE_SIZE
-                    map_surface = pygame.Surface((vis_cols * MAIN_TILE_SIZE, vis_rows * MAIN_TILE_SIZE), pygame.SRCALPHA)
-                    cam_x, cam_y, vis_cols, vis_rows = game.draw_main_view(map_surface, MAIN_TILE_SIZE, castle_img, debug_mode)
-                    masked_map = mask_to_circle(map_surface)
+                            print("No unit selected for building construction.")
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    mx, my = event.pos
+                    if turn_btn_rect.collidepoint(mx, my):
+                        with profiler.section("turn.total"):
+                            game.step()
+                        selected_unit = None
+                    elif map_area.collidepoint(mx, my):
+                        # The view is where the last frame drew it.
+                        world_x = cam_x + (mx - map_pos[0]) // MAIN_TILE_SIZE
+                        world_y = cam_y + (my - map_pos[1]) // MAIN_TILE_SIZE
+                        if 0 <= world_x < game.full_width and 0 <= world_y < game.full_height:
+                            clicked_tile = game.map[world_y][world_x]
+                            if clicked_tile is not None:
+                                for unit in clicked_tile.units:
+                                    if unit.civ.is_human:
+                                        selected_unit = unit
+                                        break
+                            if selected_unit is not None and clicked_tile is not None:
+                                game.move_selected_unit(selected_unit, world_x, world_y)
+            # Arrow keys pan the view at PAN_SPEED tiles per second while held.
+            keys = pygame.key.get_pressed()
+            direction = (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT], keys[pygame.K_DOWN] - keys[pygame.K_UP])
+            panning = direction != (0, 0)
+            if panning:
+                seconds = min(scheduler.clock.get_time(), 100) / 1000
+                step = []
+                for axis in (0, 1):
+                    pan_progress[axis] += direction[axis] * PAN_SPEED * seconds
+                    step.append(int(pan_progress[axis]))
+                    pan_progress[axis] -= step[axis]
+                game.pan(step[0], step[1], vis_cols, vis_rows)
+            else:
+                pan_progress = [0.0, 0.0]
+
+            # Scene: map, units, then overlays, redrawn only when something shown in it changed.
+            cam_x, cam_y = game.camera(vis_cols, vis_rows)
+            selection = None if selected_unit is None else (selected_unit.id, selected_unit.x, selected_unit.y, selected_unit.move_order)
+            redraw_scene = scheduler.changed("scene", (cam_x, cam_y, debug_mode, game.detail_zoom, game.turn,
+                                                       game.world.version, game.world.occupancy.version, selection))
+            frame_start = time.perf_counter()
+            if redraw_scene:
+                with profiler.section("frame.draw_main_view"):
+                    scene.fill((0, 0, 0))
+                    map_surface = viewport.begin((vis_cols * MAIN_TILE_SIZE, vis_rows * MAIN_TILE_SIZE))
+                    game.draw_main_view(map_surface, MAIN_TILE_SIZE, castle_img, debug_mode)
+                    masked_map = viewport.finish()
                     map_pos = ((sw - masked_map.get_width()) // 2,
                                (sh - INFO_PANEL_HEIGHT - masked_map.get_height()) // 2)
-                    screen.blit(masked_map, map_pos)
-                    # Draw overlays (movement range, hover, destination) on top of the map:
-                    if selected_unit is not None:
-                        effective_move = game.get_effective_move(selected_unit)
-                        show_movement_range(screen, selected_unit, cam_x, cam_y, map_pos, effective_move, vis_cols, vis_rows)
-                    show_hover_border(screen, cam_x, cam_y, map_pos, vis_cols, vis_rows)
-                    if selected_unit is not None and selected_unit.move_order is not None:
-                        dest = selected_unit.move_order
-                        dx = dest[0] - cam_x
-                        dy = dest[1] - cam_y
-                        dest_rect = pygame.Rect(dx * MAIN_TILE_SIZE + map_pos[0],
-                                                dy * MAIN_TILE_SIZE + map_pos[1],
-                                                MAIN_TILE_SIZE, MAIN_TILE_SIZE)
-                        pygame.draw.rect(screen, (128, 0, 128), dest_rect, 3)
-                    world_x = cam_x + (mx - map_pos[0]) // MAIN_TILE_SIZE
-                    world_y = cam_y + (my - map_pos[1]) // MAIN_TILE_SIZE
-                    if 0 <= world_x < game.full_width and 0 <= world_y < game.full_height:
-                        clicked_tile = game.map[world_y][world_x]
-                        if clicked_tile is not None:
-                            for unit in clicked_tile.units:
-                                if unit.civ.is_human:
-                                    selected_unit = unit
-                                    break
-                        if selected_unit is not None and clicked_tile is not None:
-                            game.move_selected_unit(selected_unit, world_x, world_y)
-        # Main drawing order: map, units, then overlays and UI.
-        vis_cols = sw // MAIN_TILE_SIZE
-        vis_rows = (sh - INFO_PANEL_HEIGHT) // MAIN_TILE_SIZE
-        player_pop = game.civs[0].population / 1000
-        map_surface = pygame.Surface((vis_cols * MAIN_TILE_SIZE, vis_rows * MAIN_TILE_SIZE), pygame.SRCALPHA)
-        cam_x, cam_y, vis_cols, vis_rows = game.draw_main_view(map_surface, MAIN_TILE_SIZE, castle_img, debug_mode)
-        masked_map = mask_to_circle(map_surface)
-        map_pos = ((sw - masked_map.get_width()) // 2,
-                   (sh - INFO_PANEL_HEIGHT - masked_map.get_height()) // 2)
-        screen.blit(masked_map, map_pos)
-        for civ in game.civs:
-            if not civ.alive:
-                continue
-            for unit in civ.units:
-                pos = ((unit.x - cam_x) * MAIN_TILE_SIZE + map_pos[0],
-                       (unit.y - cam_y) * MAIN_TILE_SIZE + map_pos[1])
-                unit_img_path = os.path.join("gfx", UNIT_MODELS.get(unit.unit_type, "default_unit.png"))
-                if os.path.exists(unit_img_path):
-                    unit_img = pygame.image.load(unit_img_path).convert_alpha()
-                    scaled_img = pygame.transform.scale(unit_img, (MAIN_TILE_SIZE, MAIN_TILE_SIZE))
-                    scaled_img = mask_to_circle(scaled_img)
-                    screen.blit(scaled_img, pos)
-                else:
-                    fallback = civ.internal_name if (hasattr(civ, 'internal_name') and isinstance(civ.internal_name, str)) else str(civ.name)
-                    flag_path = os.path.join("gfx", FLAG_MAPPING.get(civ.name, fallback + "_circle.png"))
-                    if os.path.exists(flag_path):
-                        flag_img = pygame.image.load(flag_path).convert_alpha()
-                        scaled_flag = pygame.transform.scale(flag_img, (MAIN_TILE_SIZE, MAIN_TILE_SIZE))
-                        scaled_flag = mask_to_circle(scaled_flag)
-                        screen.blit(scaled_flag, pos)
-                    else:
-                        col = PLAYER_UNIT_COLOR if civ.is_human else AI_UNIT_COLOR
-                        center = (pos[0] + MAIN_TILE_SIZE//2, pos[1] + MAIN_TILE_SIZE//2)
-                        pygame.draw.circle(screen, col, center, MAIN_TILE_SIZE//3)
-        if selected_unit is not None:
-            sel_x = (selected_unit.x - cam_x) * MAIN_TILE_SIZE + map_pos[0]
-            sel_y = (selected_unit.y - cam_y) * MAIN_TILE_SIZE + map_pos[1]
-            pygame.draw.rect(screen, (255, 255, 0), (sel_x, sel_y, MAIN_TILE_SIZE, MAIN_TILE_SIZE), 2)
-        # Overlays again (to ensure they're on top)
-        if selected_unit is not None:
-            effective_move = game.get_effective_move(selected_unit)
-            show_movement_range(screen, selected_unit, cam_x, cam_y, map_pos, effective_move, vis_cols, vis_rows)
-        show_hover_border(screen, cam_x, cam_y, map_pos, vis_cols, vis_rows)
-        if selected_unit is not None and selected_unit.move_order is not None:
-            dest = selected_unit.move_order
-            dx = dest[0] - cam_x
-            dy = dest[1] - cam_y
-            dest_rect = pygame.Rect(dx * MAIN_TILE_SIZE + map_pos[0],
-                                    dy * MAIN_TILE_SIZE + map_pos[1],
-                                    MAIN_TILE_SIZE, MAIN_TILE_SIZE)
-            pygame.draw.rect(screen, (128, 0, 128), dest_rect, 3)
-        draw_minimap(game, screen, mini_surface, mini_x, mini_y, cam_x, cam_y, vis_cols, vis_rows, flags)
-        # UI: Turn button (drawn last)
-        pygame.draw.rect(screen, (200, 200, 200), turn_btn_rect)
-        btn_text = pygame.font.SysFont(None, 24).render("End Turn", True, (0, 0, 0))
-        btn_rect = btn_text.get_rect(center=turn_btn_rect.center)
-        screen.blit(btn_text, btn_rect)
-        pop_text = f"Population: {player_pop:.1f}K"
-        info_text = f"Turn: {game.turn}  Season: {game.season}  {pop_text}  Debug: {'ON' if debug_mode else 'OFF'}"
-        pygame.draw.rect(screen, (30, 30, 30), (0, sh - INFO_PANEL_HEIGHT, sw, INFO_PANEL_HEIGHT))
-        info_surf = pygame.font.SysFont(None, 24).render(info_text, True, (255, 255, 255))
-        screen.blit(info_surf, (10, sh - INFO_PANEL_HEIGHT + 10))
-        pygame.display.flip()
-        pygame.time.delay(100)
-        pygame.time.Clock().tick(10)
+                    scene.blit(masked_map, map_pos)
+                with profiler.section("frame.units"):
+                    draw_units(scene, game, assets, cam_x, cam_y, map_pos, vis_cols, vis_rows)
+                if selected_unit is not None:
+                    with profiler.section("frame.overlays"):
+                        draw_selection(scene, game, selected_unit, movement_overlay, cam_x, cam_y, map_pos, vis_cols, vis_rows)
+                screen.blit(scene, map_area)
+                scheduler.invalidate(map_area)
+            # Hover border: erase the old one from the scene, draw the new one.
+            new_hover = hover_rect(map_pos)
+            hover_moved = scheduler.changed("hover", tuple(new_hover))
+            minimap_covered = False
+            if redraw_scene or hover_moved:
+                with profiler.section("frame.hover"):
+                    if hover is not None and not redraw_scene:
+                        screen.blit(scene, hover, hover)
+                        scheduler.invalidate(hover)
+                    draw_hover(screen, new_hover, map_area)
+                    scheduler.invalidate(new_hover.clip(map_area))
+                minimap_covered = new_hover.colliderect(minimap_rect) or (hover is not None and hover.colliderect(minimap_rect))
+                hover = new_hover
+            painted = minimap.update()
+            camera_moved = scheduler.changed("minimap", (cam_x, cam_y))
+            if redraw_scene or minimap_covered or painted or camera_moved:
+                with profiler.section("frame.minimap"):
+                    scheduler.invalidate(draw_minimap(game, screen, minimap, mini_x, mini_y, cam_x, cam_y, vis_cols, vis_rows))
+            # Profiler overlay: refreshed on every frame that drew something, over the scene.
+            if profiler.enabled and scheduler.rects:
+                if profile_rect is not None:
+                    screen.blit(scene, profile_rect, profile_rect)
+                    scheduler.invalidate(profile_rect)
+                profile_rect = draw_profile_overlay(screen, profiler, (map_area.x + 10, map_area.y + 10))
+                scheduler.invalidate(profile_rect)
+                if hover is not None and hover.colliderect(profile_rect):
+                    draw_hover(screen, hover, map_area)
+            elif not profiler.enabled:
+                profile_rect = None  # the scene redraw on leaving debug mode already erased it
+            # UI: info panel and turn button
+            player_pop = game.civs[0].population / 1000
+            pop_text = f"Population: {player_pop:.1f}K"
+            info_text = f"Turn: {game.turn}  Season: {game.season}  {pop_text}  Debug: {'ON' if debug_mode else 'OFF'}"
+            if scheduler.changed("hud", info_text):
+                with profiler.section("frame.hud"):
+                    pygame.draw.rect(screen, (30, 30, 30), info_rect)
+                    info_surf = render_text(get_font(None, 24), info_text, (255, 255, 255))
+                    screen.blit(info_surf, (10, sh - INFO_PANEL_HEIGHT + 10))
+                    pygame.draw.rect(screen, (200, 200, 200), turn_btn_rect)
+                    btn_text = render_text(get_font(None, 24), "End Turn", (0, 0, 0))
+                    btn_rect = btn_text.get_rect(center=turn_btn_rect.center)
+                    screen.blit(btn_text, btn_rect)
+                scheduler.invalidate(info_rect)
+            flip_start = time.perf_counter()
+            if scheduler.present() and profiler.enabled:
+                end = time.perf_counter()
+                profiler.record("frame.flip", end - flip_start)
+                profiler.record("frame.total", end - frame_start)
+    finally:
+        game.journal.close()
 
 if __name__ == "__main__":
     main()
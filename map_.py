@@ -1,5 +1,4 @@
 # map_.py
-import pygame
 import rasterio
 import numpy as np
 
@@ -28,45 +27,168 @@ TILE_COLORS = {
     "Humid Subtropical": (60, 179, 113)
 }
 
-def load_map_data(filename, downsample_factor, climate_mapping):
+CLIMATE_ABBREV = {
+    "Af (Tropical Rainforest)": "Af",
+    "Am (Tropical Monsoon)": "Am",
+    "Aw (Tropical Savanna)": "Aw",
+    "BWh (Hot Desert)": "BWh",
+    "BSh (Hot Semi-Arid)": "BSh",
+    "BWk (Cold Desert)": "BWk",
+    "BSk (Cold Semi-Arid)": "BSk",
+    "Cfa (Humid Subtropical)": "Cfa",
+    "Cfb (Oceanic)": "Cfb",
+    "Csa (Hot-Summer Mediterranean)": "Csa",
+    "Csb (Warm-Summer Mediterranean)": "Csb",
+    "Cwa (Monsoon-influenced Humid Subtropical)": "Cwa",
+    "Dfa (Hot Summer Continental)": "Dfa",
+    "Dfb (Warm Summer Continental)": "Dfb",
+    "Dfc (Subarctic)": "Dfc",
+    "ET (Tundra)": "ET",
+    "EF (Ice Cap)": "EF",
+    "H (Highland)": "H",
+    "As (Tropical Semi-arid)": "As",
+    "Temperate Continental": "TC",
+    "Humid Subtropical": "HS"
+}
+
+CLIMATE_RASTER_FILENAME = "koppen_geiger_0p1.tif"
+CLIMATE_MAPPING = {
+    0: None,
+    1: "Af (Tropical Rainforest)",
+    2: "Am (Tropical Monsoon)",
+    3: "Aw (Tropical Savanna)",
+    4: "BWh (Hot Desert)",
+    5: "BSh (Hot Semi-Arid)",
+    6: "BWk (Cold Desert)",
+    7: "BSk (Cold Semi-Arid)",
+    8: "Cfa (Humid Subtropical)",
+    9: "Cfb (Oceanic)",
+    10: "Csa (Hot-Summer Mediterranean)",
+    11: "Csb (Warm-Summer Mediterranean)",
+    12: "Cwa (Monsoon-influenced Humid Subtropical)",
+    13: "Dfa (Hot Summer Continental)",
+    14: "Dfb (Warm Summer Continental)",
+    15: "Dfc (Subarctic)",
+    16: "ET (Tundra)",
+    17: "EF (Ice Cap)"
+}
+
+# Climate codes used by the compact grids. Code 0 is water; every named climate
+# (including the latitude-band fallbacks) gets a fixed uint8 code.
+WATER_CODE = 0
+CLIMATE_NAMES = (None,) + tuple(TILE_COLORS)
+CLIMATE_CODES = {name: code for code, name in enumerate(CLIMATE_NAMES)}
+
+def latitude_band_codes(lats):
+    # Fallback climate for land whose raster value has no mapping.
+    lats = np.asarray(lats, dtype=np.float64)
+    conditions = [(lats >= 66.5) | (lats <= -66.5),
+                  (lats >= -23.5) & (lats <= 23.5),
+                  (lats > 23.5) & (lats < 45)]
+    choices = [CLIMATE_CODES["EF (Ice Cap)"],
+               CLIMATE_CODES["Af (Tropical Rainforest)"],
+               CLIMATE_CODES["Dfb (Warm Summer Continental)"]]
+    return np.select(conditions, choices, CLIMATE_CODES["Humid Subtropical"]).astype(np.uint8)
+
+def row_latitudes(full_height, row_start=0, row_count=None):
+    if row_count is None:
+        row_count = full_height - row_start
+    rows = np.arange(row_start, row_start + row_count)
+    return 90 - (rows / full_height) * 180
+
+def climate_lut(climate_mapping, size=256):
+    lut = np.zeros(size, dtype=np.uint8)
+    for value, climate in climate_mapping.items():
+        if climate is None or value >= size:
+            continue
+        if climate not in CLIMATE_CODES:
+            raise ValueError(f"Unknown climate in mapping: {climate!r}")
+        lut[value] = CLIMATE_CODES[climate]
+    return lut
+
+def classify_climate(raw, climate_mapping, lats):
+    """
+    Converts raw raster values into (climate_codes, land_mask).
+    lats holds the latitude of every row of raw.
+    """
+    raw = np.asarray(raw)
+    land_mask = raw != 0
+    lut = climate_lut(climate_mapping, max(256, int(raw.max(initial=0)) + 1))
+    unmapped = land_mask & (lut[raw] == WATER_CODE)
+    mapped = np.ma.masked_array(lut[raw], mask=unmapped)
+    bands = np.broadcast_to(latitude_band_codes(lats)[:, None], raw.shape)
+    fallback = np.ma.masked_array(bands, mask=~unmapped)
+    climate_codes = mapped.filled(WATER_CODE) | fallback.filled(WATER_CODE)
+    return climate_codes, land_mask
+
+def load_map_arrays(filename, downsample_factor, climate_mapping):
     with rasterio.open(filename) as raster:
         full_width = raster.width // downsample_factor
         full_height = raster.height // downsample_factor
         climate_array = raster.read(1, out_shape=(full_height, full_width))
-    land_mask = [[(int(climate_array[y, x]) != 0) for x in range(full_width)] for y in range(full_height)]
-    climate_grid = [[None for _ in range(full_width)] for _ in range(full_height)]
-    for y in range(full_height):
-        for x in range(full_width):
-            if land_mask[y][x]:
-                value = int(climate_array[y, x])
-                climate = climate_mapping.get(value)
-                if climate is None:
-                    lat = 90 - (y / full_height) * 180
-                    if lat >= 66.5 or lat <= -66.5:
-                        climate = "EF (Ice Cap)"
-                    elif -23.5 <= lat <= 23.5:
-                        climate = "Af (Tropical Rainforest)"
-                    elif 23.5 < lat < 45:
-                        climate = "Dfb (Warm Summer Continental)"
-                    else:
-                        climate = "Humid Subtropical"
-                climate_grid[y][x] = climate
-            else:
-                climate_grid[y][x] = None
-    return climate_grid, land_mask, full_width, full_height
+    climate_codes, land_mask = classify_climate(climate_array, climate_mapping, row_latitudes(full_height))
+    return climate_codes, land_mask, full_width, full_height
+
+class ClimateRow:
+    def __init__(self, codes):
+        self.codes = codes
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, x):
+        return CLIMATE_NAMES[self.codes[x]]
+
+    def __iter__(self):
+        return (CLIMATE_NAMES[code] for code in self.codes)
+
+class ClimateGrid:
+    """
+    Read-only list-of-lists view over a uint8 climate code array.
+    climate_grid[y][x] returns the climate name, or None for water.
+    """
+    def __init__(self, codes):
+        self.codes = codes
+
+    def __len__(self):
+        return self.codes.shape[0]
+
+    def __getitem__(self, y):
+        return ClimateRow(self.codes[y])
+
+    def __iter__(self):
+        return (ClimateRow(row) for row in self.codes)
+
+def climate_codes_of(climate_grid):
+    # Accepts a ClimateGrid view or a legacy nested list of names.
+    if isinstance(climate_grid, ClimateGrid):
+        return climate_grid.codes
+    return np.array([[CLIMATE_CODES.get(climate, WATER_CODE) for climate in row] for row in climate_grid],
+                    dtype=np.uint8)
+
+def load_map_data(filename, downsample_factor, climate_mapping):
+    climate_codes, land_mask, full_width, full_height = load_map_arrays(filename, downsample_factor, climate_mapping)
+    return ClimateGrid(climate_codes), land_mask, full_width, full_height
+
+# RGB lookup table indexed by climate code; index 0 (WATER_CODE) is the sea colour.
+TILE_PALETTE = np.array([WATER_COLOR] + [TILE_COLORS[climate] for climate in CLIMATE_NAMES[1:]], dtype=np.uint8)
+
+def minimap_pixels(climate_codes):
+    # (width, height, 3) array in surfarray layout, built with a single LUT lookup.
+    return TILE_PALETTE[np.asarray(climate_codes).T]
+
+def create_minimap_surfaces(game, scales):
+    import pygame  # only the minimap needs pygame; the map loaders stay usable headless
+    full_mini = pygame.surfarray.make_surface(minimap_pixels(climate_codes_of(game.climate_grid)))
+    surfaces = {}
+    for scale in scales:
+        mini_w = int(game.full_width * scale)
+        mini_h = int(game.full_height * scale)
+        if (mini_w, mini_h) == full_mini.get_size():
+            surfaces[scale] = full_mini
+        else:
+            surfaces[scale] = pygame.transform.scale(full_mini, (mini_w, mini_h))
+    return surfaces
 
 def create_minimap_surface(game, scale):
-    mini_w = int(game.full_width * scale)
-    mini_h = int(game.full_height * scale)
-    mini_array = np.zeros((game.full_height, game.full_width, 3), dtype=np.uint8)
-    for y in range(game.full_height):
-        for x in range(game.full_width):
-            if game.land_mask[y][x]:
-                climate = game.climate_grid[y][x]
-                color = TILE_COLORS.get(climate, (200, 200, 200))
-                mini_array[y, x] = color
-            else:
-                mini_array[y, x] = WATER_COLOR
-    full_mini = pygame.surfarray.make_surface(np.transpose(mini_array, (1, 0, 2)))
-    mini_surface = pygame.transform.scale(full_mini, (mini_w, mini_h))
-    return mini_surface
+    return create_minimap_surfaces(game, [scale])[scale]
@@ -0,0 +1,104 @@
+# map_cache.py
+import hashlib
+import json
+import os
+import shutil
+import sys
+import numpy as np
+from map_ import load_map_arrays, ClimateGrid, CLIMATE_NAMES, CLIMATE_RASTER_FILENAME, CLIMATE_MAPPING
+
+MAP_CACHE_DIR = "map_cache"
+MAP_CACHE_VERSION = 1
+
+def raster_digest(filename):
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cache_key(filename, downsample_factor, climate_mapping):
+    # Covers the raster content, the downsample factor, the raster-value mapping and
+    # the climate code table, so changing any of them produces a fresh entry.
+    key = hashlib.sha256()
+    key.update(raster_digest(filename).encode())
+    key.update(json.dumps({
+        "version": MAP_CACHE_VERSION,
+        "downsample_factor": downsample_factor,
+        "climate_mapping": sorted((int(value), climate) for value, climate in climate_mapping.items()),
+        "climate_names": CLIMATE_NAMES,
+    }).encode())
+    return key.hexdigest()[:20]
+
+def cache_paths(key, cache_dir=MAP_CACHE_DIR):
+    return {
+        "climate": os.path.join(cache_dir, f"{key}_climate.npy"),
+        "land": os.path.join(cache_dir, f"{key}_land.npy"),
+        "meta": os.path.join(cache_dir, f"{key}_meta.json"),
+    }
+
+def _write_atomic(path, write):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+def read_map_arrays(filename, downsample_factor, climate_mapping):
+    # Pyramid levels are read in bounded strips; other factors fall back to one full resampled read.
+    from pyramid import MapPyramid, PYRAMID_FACTORS  # pyramid imports raster_digest from here
+    if downsample_factor not in PYRAMID_FACTORS:
+        return load_map_arrays(filename, downsample_factor, climate_mapping)
+    pyramid = MapPyramid(filename, climate_mapping)
+    try:
+        return pyramid.read_level(downsample_factor)
+    finally:
+        pyramid.close()
+
+def build_map_cache(filename, downsample_factor, climate_mapping, cache_dir=MAP_CACHE_DIR):
+    key = cache_key(filename, downsample_factor, climate_mapping)
+    paths = cache_paths(key, cache_dir)
+    climate_codes, land_mask, full_width, full_height = read_map_arrays(filename, downsample_factor, climate_mapping)
+    os.makedirs(cache_dir, exist_ok=True)
+    _write_atomic(paths["climate"], lambda f: np.save(f, climate_codes))
+    _write_atomic(paths["land"], lambda f: np.save(f, land_mask))
+    # The meta file is written last; its presence marks a complete entry.
+    meta = {"key": key, "raster": os.path.basename(filename), "downsample_factor": downsample_factor,
+            "width": full_width, "height": full_height}
+    _write_atomic(paths["meta"], lambda f: f.write(json.dumps(meta).encode()))
+    return paths
+
+def load_cached_map_arrays(filename, downsample_factor, climate_mapping, cache_dir=MAP_CACHE_DIR):
+    """
+    Same result as map_.load_map_arrays, but served from memory-mapped .npy files
+    once the processed grids have been cached.
+    """
+    paths = cache_paths(cache_key(filename, downsample_factor, climate_mapping), cache_dir)
+    if not os.path.exists(paths["meta"]):
+        paths = build_map_cache(filename, downsample_factor, climate_mapping, cache_dir)
+    with open(paths["meta"], "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    climate_codes = np.load(paths["climate"], mmap_mode="r")
+    land_mask = np.load(paths["land"], mmap_mode="r")
+    return climate_codes, land_mask, meta["width"], meta["height"]
+
+def load_cached_map_data(filename, downsample_factor, climate_mapping, cache_dir=MAP_CACHE_DIR):
+    climate_codes, land_mask, full_width, full_height = load_cached_map_arrays(filename, downsample_factor, climate_mapping, cache_dir)
+    return ClimateGrid(climate_codes), land_mask, full_width, full_height
+
+def clear_map_cache(cache_dir=MAP_CACHE_DIR):
+    if os.path.isdir(cache_dir):
+        shutil.rmtree(cache_dir)
+        print(f"Removed map cache at {cache_dir}.")
+
+if __name__ == "__main__":
+    # python map_cache.py clear        -> invalidate every cached map
+    # python map_cache.py build [N...] -> prebuild the cache for downsample factors N
+    command = sys.argv[1] if len(sys.argv) > 1 else "build"
+    if command == "clear":
+        clear_map_cache()
+    elif command == "build":
+        for factor in [int(arg) for arg in sys.argv[2:]] or [10]:
+            paths = build_map_cache(CLIMATE_RASTER_FILENAME, factor, CLIMATE_MAPPING)
+            print(f"Cached downsample factor {factor}: {paths['meta']}")
+    else:
+        print("Usage: python map_cache.py [clear | build [downsample_factor ...]]")
@@ -0,0 +1,92 @@
+# minimap.py
+import numpy as np
+import pygame
+from map_ import TILE_PALETTE
+
+OWNER_ALPHA = 0.45  # weight of the owner colour over the terrain colour
+
+class LiveMinimap:
+    """
+    Minimap pixel buffer with each owned tile tinted in its civ's colour. The
+    world's change notifications queue tiles; update() repaints only those
+    through surfarray.pixels3d, so a frame costs nothing when no tile changed.
+    scale is a whole number of pixels per tile.
+    """
+    def __init__(self, world, player_color, ai_color, colors=None, scale=1):
+        self.world = world
+        self.player_color = player_color
+        self.ai_color = ai_color
+        self.colors = dict(colors or {})  # civ name -> RGB, overriding the player/AI colours
+        self.scale = scale
+        self.surface = pygame.Surface((world.width * scale, world.height * scale), depth=24)
+        self.palette = None  # (civ id, climate code) -> RGB
+        self.dirty = set()
+        self.cells = []      # (xs, ys) arrays of the tiles of whole-civ transfers
+        self.full = True
+        world.add_listener(self.tile_changed, self.owner_transferred, self.reload)
+
+    def tile_changed(self, x, y):
+        self.dirty.add((x, y))
+
+    def owner_transferred(self, old, new, window, mask):
+        # mask only covers the old civ's bounding box, so this scans that window, not the map.
+        ys, xs = np.nonzero(mask)
+        self.cells.append((xs + window[1].start, ys + window[0].start))
+
+    def reload(self):
+        self.full = True
+
+    def set_color(self, civ, color):
+        self.colors[civ.name] = tuple(color)[:3]
+        self.palette = None
+        self.full = True
+
+    def color_of(self, civ):
+        return self.colors.get(civ.name, self.player_color if civ.is_human else self.ai_color)
+
+    def _build_palette(self):
+        terrain = TILE_PALETTE.astype(np.float64)
+        rows = [terrain]
+        for civ in self.world.civs[1:]:
+            tint = np.array(self.color_of(civ), dtype=np.float64)
+            rows.append((1 - OWNER_ALPHA) * terrain + OWNER_ALPHA * tint)
+        self.palette = np.rint(np.array(rows)).astype(np.uint8)
+
+    def _paint(self, pixels, xs, ys):
+        world, k = self.world, self.scale
+        colors = self.palette[world.owner[ys, xs], world.climate[ys, xs]]
+        if k == 1:
+            pixels[xs, ys] = colors
+            return
+        offsets = np.arange(k)
+        px = xs[:, None, None] * k + offsets[None, :, None]
+        py = ys[:, None, None] * k + offsets[None, None, :]
+        pixels[px, py] = colors[:, None, None]
+
+    def update(self):
+        # Returns how many tiles were repainted.
+        if self.palette is None or len(self.palette) < len(self.world.civs):
+            self._build_palette()
+            self.full = True
+        if not (self.full or self.dirty or self.cells):
+            return 0
+        world = self.world
+        pixels = pygame.surfarray.pixels3d(self.surface)
+        try:
+            if self.full:
+                colors = self.palette[world.owner.T, world.climate.T]
+                pixels[...] = colors.repeat(self.scale, axis=0).repeat(self.scale, axis=1)
+                painted = world.width * world.height
+            else:
+                cells = np.array(list(self.dirty), dtype=np.int64).reshape(-1, 2)
+                xs, ys = cells[:, 0], cells[:, 1]
+                for cell_xs, cell_ys in self.cells:
+                    xs, ys = np.concatenate((xs, cell_xs)), np.concatenate((ys, cell_ys))
+                self._paint(pixels, xs, ys)
+                painted = len(xs)
+        finally:
+            del pixels  # unlocks the surface
+        self.dirty.clear()
+        self.cells.clear()
+        self.full = False
+        return painted
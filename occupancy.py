@@ -0,0 +1,234 @@
+# occupancy.py
+from itertools import chain
+from operator import attrgetter
+import numpy as np
+
+BUCKET_SIZE = 8  # tiles per side of the coarse buckets used by radius queries
+
+class OccupancyIndex:
+    """
+    Where every unit stands. Per tile it keeps the unit ids in arrival order and
+    a per-civ count, so moves, "is there an enemy here" and per-civ totals are
+    O(1); coarse buckets make radius queries touch only nearby units. Keeping
+    those tables in step makes a lone unit's move dearer than a per-tile list
+    remove/append; the index pays off once tiles hold stacks of units.
+    """
+    def __init__(self, unit_count=None, bucket_size=BUCKET_SIZE):
+        self.unit_count = unit_count  # optional per-tile count grid kept in step
+        self.bucket_size = bucket_size
+        self.units = {}       # unit id -> unit
+        self.positions = {}   # unit id -> (x, y)
+        self.tiles = {}       # (x, y) -> {unit id: None}, insertion ordered
+        self.tile_civs = {}   # (x, y) -> {civ: count}
+        self.civ_totals = {}  # civ -> count
+        self.buckets = {}     # (bucket x, bucket y) -> set of unit ids
+        self.version = 0      # bumped on every add, remove and move
+        self._arrays = None   # (version, xs, ys, civ ids) from unit_arrays
+
+    def __len__(self):
+        return len(self.units)
+
+    def __contains__(self, unit):
+        return unit.id in self.units
+
+    def _bucket(self, pos):
+        return (pos[0] // self.bucket_size, pos[1] // self.bucket_size)
+
+    def add(self, unit, x=None, y=None):
+        if unit.id in self.units:
+            self.remove(unit)
+        if x is not None:
+            unit.x, unit.y = x, y
+        pos = (unit.x, unit.y)
+        self.version += 1
+        self.units[unit.id] = unit
+        self.positions[unit.id] = pos
+        self.tiles.setdefault(pos, {})[unit.id] = None
+        civs = self.tile_civs.setdefault(pos, {})
+        civs[unit.civ] = civs.get(unit.civ, 0) + 1
+        self.civ_totals[unit.civ] = self.civ_totals.get(unit.civ, 0) + 1
+        self.buckets.setdefault(self._bucket(pos), set()).add(unit.id)
+        if self.unit_count is not None:
+            self.unit_count[pos[1], pos[0]] += 1
+
+    def remove(self, unit):
+        pos = self.positions.pop(unit.id)
+        self.version += 1
+        del self.units[unit.id]
+        tile = self.tiles[pos]
+        del tile[unit.id]
+        if not tile:
+            del self.tiles[pos]
+        civs = self.tile_civs[pos]
+        civs[unit.civ] -= 1
+        if not civs[unit.civ]:
+            del civs[unit.civ]
+            if not civs:
+                del self.tile_civs[pos]
+        self.civ_totals[unit.civ] -= 1
+        if not self.civ_totals[unit.civ]:
+            del self.civ_totals[unit.civ]
+        bucket = self.buckets[self._bucket(pos)]
+        bucket.discard(unit.id)
+        if not bucket:
+            del self.buckets[self._bucket(pos)]
+        if self.unit_count is not None:
+            self.unit_count[pos[1], pos[0]] -= 1
+
+    def move(self, unit, x, y):
+        # The unit goes to the back of its new tile even when it stays put, as list.remove/append did.
+        unit_id, civ = unit.id, unit.civ
+        old = self.positions[unit_id]
+        self.version += 1
+        new = (x, y)
+        tile = self.tiles[old]
+        del tile[unit_id]
+        if not tile:
+            del self.tiles[old]
+        civs = self.tile_civs[old]
+        civs[civ] -= 1
+        if not civs[civ]:
+            del civs[civ]
+            if not civs:
+                del self.tile_civs[old]
+        tile = self.tiles.get(new)
+        if tile is None:
+            tile = self.tiles[new] = {}
+        tile[unit_id] = None
+        civs = self.tile_civs.get(new)
+        if civs is None:
+            civs = self.tile_civs[new] = {}
+        civs[civ] = civs.get(civ, 0) + 1
+        self.positions[unit_id] = new
+        unit.x, unit.y = x, y
+        if old == new:
+            return
+        size = self.bucket_size
+        old_bucket, new_bucket = (old[0] // size, old[1] // size), (x // size, y // size)
+        if old_bucket != new_bucket:
+            bucket = self.buckets[old_bucket]
+            bucket.discard(unit_id)
+            if not bucket:
+                del self.buckets[old_bucket]
+            self.buckets.setdefault(new_bucket, set()).add(unit_id)
+        if self.unit_count is not None:
+            self.unit_count[old[1], old[0]] -= 1
+            self.unit_count[y, x] += 1
+
+    def move_many(self, units, xs, ys):
+        """
+        move() for a batch of distinct units, in order: the same table updates
+        with the lookups hoisted out of the loop, buckets touched only by units
+        that change bucket, and the count grid updated once for the batch.
+        """
+        if not units:
+            return
+        self.version += 1
+        tiles, tile_civs, positions, buckets = self.tiles, self.tile_civs, self.positions, self.buckets
+        size = self.bucket_size
+        olds = []
+        for unit, x, y in zip(units, xs, ys):
+            unit_id, civ = unit.id, unit.civ
+            old = positions[unit_id]
+            olds.append(old)
+            new = (x, y)
+            tile = tiles[old]
+            del tile[unit_id]
+            if not tile:
+                del tiles[old]
+            civs = tile_civs[old]
+            if civs[civ] > 1:
+                civs[civ] -= 1
+            else:
+                del civs[civ]
+                if not civs:
+                    del tile_civs[old]
+            # The unit goes to the back of its new tile, as with move().
+            tile = tiles.get(new)
+            if tile is None:
+                tiles[new] = {unit_id: None}
+            else:
+                tile[unit_id] = None
+            civs = tile_civs.get(new)
+            if civs is None:
+                tile_civs[new] = {civ: 1}
+            else:
+                civs[civ] = civs.get(civ, 0) + 1
+            positions[unit_id] = new
+            unit.x, unit.y = x, y
+            old_bucket, new_bucket = (old[0] // size, old[1] // size), (x // size, y // size)
+            if old_bucket != new_bucket:
+                bucket = buckets[old_bucket]
+                bucket.discard(unit_id)
+                if not bucket:
+                    del buckets[old_bucket]
+                bucket = buckets.get(new_bucket)
+                if bucket is None:
+                    buckets[new_bucket] = {unit_id}
+                else:
+                    bucket.add(unit_id)
+        if self.unit_count is not None:
+            old = np.array(olds, dtype=np.int64)
+            np.subtract.at(self.unit_count, (old[:, 1], old[:, 0]), 1)
+            np.add.at(self.unit_count, (np.asarray(ys, dtype=np.int64), np.asarray(xs, dtype=np.int64)), 1)
+
+    def unit_arrays(self, civ_ids):
+        """
+        (xs, ys, civ ids) of every unit as int64 arrays, in unit order, with
+        civ ids from the civ_ids mapping. Kept until the next add, remove or move.
+        """
+        if self._arrays is None or self._arrays[0] != self.version:
+            count = len(self.units)
+            position = np.fromiter(chain.from_iterable(self.positions.values()), dtype=np.int64, count=2 * count)
+            civs = np.fromiter(map(civ_ids.__getitem__, map(attrgetter("civ"), self.units.values())),
+                               dtype=np.int64, count=count)
+            self._arrays = (self.version, position[0::2], position[1::2], civs)
+        return self._arrays[1:]
+
+    def remove_civ(self, civ):
+        for unit_id in [unit_id for unit_id, unit in self.units.items() if unit.civ is civ]:
+            self.remove(self.units[unit_id])
+
+    def units_at(self, x, y):
+        return [self.units[unit_id] for unit_id in self.tiles.get((x, y), ())]
+
+    def count_at(self, x, y):
+        return len(self.tiles.get((x, y), ()))
+
+    def has_enemy(self, x, y, civ):
+        civs = self.tile_civs.get((x, y))
+        return bool(civs) and (len(civs) > 1 or civ not in civs)
+
+    def first_enemy(self, x, y, civ):
+        if not self.has_enemy(x, y, civ):
+            return None
+        for unit_id in self.tiles[(x, y)]:
+            unit = self.units[unit_id]
+            if unit.civ != civ:
+                return unit
+        return None
+
+    def civ_count(self, civ):
+        return self.civ_totals.get(civ, 0)
+
+    def units_in_radius(self, x, y, radius, civ=None, enemies_of=None):
+        """
+        Units within Manhattan distance radius of (x, y), optionally only those
+        of civ or only enemies of enemies_of.
+        """
+        found = []
+        bx0, by0 = self._bucket((x - radius, y - radius))
+        bx1, by1 = self._bucket((x + radius, y + radius))
+        for by in range(by0, by1 + 1):
+            for bx in range(bx0, bx1 + 1):
+                for unit_id in self.buckets.get((bx, by), ()):
+                    ux, uy = self.positions[unit_id]
+                    if abs(ux - x) + abs(uy - y) > radius:
+                        continue
+                    unit = self.units[unit_id]
+                    if civ is not None and unit.civ != civ:
+                        continue
+                    if enemies_of is not None and unit.civ == enemies_of:
+                        continue
+                    found.append(unit)
+        return found
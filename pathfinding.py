@@ -0,0 +1,237 @@
+# pathfinding.py
+import heapq
+import math
+import numpy as np
+from map_ import CLIMATE_NAMES
+
+# Cost of entering a tile, by climate. Anything not listed costs 1; water is impassable.
+CLIMATE_MOVE_COSTS = {
+    "Af (Tropical Rainforest)": 2,
+    "Am (Tropical Monsoon)": 2,
+    "BWh (Hot Desert)": 2,
+    "BWk (Cold Desert)": 2,
+    "Dfc (Subarctic)": 2,
+    "ET (Tundra)": 2,
+    "EF (Ice Cap)": 3,
+    "H (Highland)": 3,
+}
+DEFAULT_MOVE_COST = 1
+FIELD_KINDS = ("enemy_units",)
+FIELD_RANGE = 4      # distance fields stop at this route cost; farther tiles read as inf
+FIELD_WALL = 1 << 16  # entry cost of water and of the border around the map in fields
+FIELD_NONE = 1 << 30  # packed field entry of a tile no source reaches
+
+def move_cost_lut(costs=CLIMATE_MOVE_COSTS):
+    # Climate code -> cost of entering a tile of that climate.
+    lut = np.array([costs.get(name, DEFAULT_MOVE_COST) for name in CLIMATE_NAMES], dtype=np.float32)
+    lut[0] = np.inf
+    return lut
+
+class Pathfinder:
+    """
+    Shortest paths over the land tiles with per-climate entry costs. path() is
+    an A* query for one route; reachable() is a bounded Dijkstra search for
+    every tile a unit can enter this turn, whose routes route() reads back.
+    field() reads multi-source distance fields from every civ's units, cached
+    per turn and dropped when the owner grid or the unit positions change.
+    cost_grid also prices AI steps.
+    """
+    def __init__(self, world, costs=CLIMATE_MOVE_COSTS):
+        self.world = world
+        self.width = world.width
+        self.height = world.height
+        cost_grid = move_cost_lut(costs)[world.climate]
+        cost_grid[~world.land] = np.inf
+        self.cost_grid = cost_grid
+        # Whole-number costs stay ints so unit move points do not turn into floats.
+        self.costs = [cost if math.isinf(cost) else int(cost) for cost in cost_grid.reshape(-1).tolist()]
+        self.min_cost = int(cost_grid[np.isfinite(cost_grid)].min()) if np.isfinite(cost_grid).any() else 1
+        # Entry costs with a one-tile wall around the map, flattened so that the
+        # neighbours of a tile are fixed offsets into the array.
+        self.padded_width = self.width + 2
+        enter = np.full((self.height + 2, self.padded_width), FIELD_WALL, dtype=np.int32)
+        enter[1:-1, 1:-1] = np.where(np.isfinite(cost_grid), cost_grid, FIELD_WALL)
+        self.field_enter = enter.reshape(-1)[self.padded_width:-self.padded_width]
+        self.fields = {}  # (kind, turn, max cost) -> (version, label bits, nearest, nearest of another civ)
+
+    def cost(self, x, y):
+        return self.costs[y * self.width + x]
+
+    def _neighbors(self, i):
+        width = self.width
+        x = i % width
+        if i >= width:
+            yield i - width
+        if i + width < width * self.height:
+            yield i + width
+        if x > 0:
+            yield i - 1
+        if x < width - 1:
+            yield i + 1
+
+    def path(self, start, goal, max_cost=None):
+        """
+        Cheapest 4-neighbour route from start to goal as (cost, [positions]),
+        start and goal included, or None when goal is water, unreachable or
+        dearer than max_cost.
+        """
+        width, costs = self.width, self.costs
+        s, g = start[1] * width + start[0], goal[1] * width + goal[0]
+        if math.isinf(costs[g]):
+            return None
+        if s == g:
+            return 0, [start]
+        gx, gy = goal
+        limit = math.inf if max_cost is None else max_cost
+        h_scale = self.min_cost
+        best = {s: 0}
+        came_from = {}
+        counter = 0
+        heap = [(abs(start[0] - gx) + abs(start[1] - gy), 0, counter, s)]
+        while heap:
+            _, cost, _, i = heapq.heappop(heap)
+            if i == g:
+                route = [i]
+                while route[-1] != s:
+                    route.append(came_from[route[-1]])
+                return cost, [(j % width, j // width) for j in reversed(route)]
+            if cost > best.get(i, math.inf):
+                continue
+            for n in self._neighbors(i):
+                new_cost = cost + costs[n]
+                if new_cost <= limit and new_cost < best.get(n, math.inf):
+                    best[n] = new_cost
+                    came_from[n] = i
+                    counter += 1
+                    nx, ny = n % width, n // width
+                    heapq.heappush(heap, (new_cost + h_scale * (abs(nx - gx) + abs(ny - gy)), new_cost, counter, n))
+        return None
+
+    def reachable(self, start, max_cost, came_from=None):
+        # {(x, y): cost} of every tile reachable from start within max_cost.
+        # came_from, when given, is filled with each tile's predecessor for route().
+        width = self.width
+        costs = self._dijkstra([start[1] * width + start[0]], max_cost, came_from)
+        return {(i % width, i // width): cost for i, cost in costs.items()}
+
+    def route(self, came_from, start, goal):
+        # [positions] from start to goal, both included, along a came_from filled by reachable().
+        width = self.width
+        s, i = start[1] * width + start[0], goal[1] * width + goal[0]
+        route = [i]
+        while i != s:
+            i = came_from[i]
+            route.append(i)
+        return [(j % width, j // width) for j in reversed(route)]
+
+    def _dijkstra(self, sources, max_cost=None, came_from=None):
+        costs = self.costs
+        limit = math.inf if max_cost is None else max_cost
+        best = {}
+        heap = []
+        for i in sources:
+            if i not in best:
+                best[i] = 0
+                heap.append((0, i))
+        heapq.heapify(heap)
+        while heap:
+            cost, i = heapq.heappop(heap)
+            if cost > best[i]:
+                continue
+            for n in self._neighbors(i):
+                new_cost = cost + costs[n]
+                if new_cost <= limit and new_cost < best.get(n, math.inf):
+                    best[n] = new_cost
+                    if came_from is not None:
+                        came_from[n] = i
+                    heapq.heappush(heap, (new_cost, n))
+        return best
+
+    def _version(self, kind):
+        return (self.world.version, self.world.occupancy.version)
+
+    def _sources(self, kind):
+        # (xs, ys, civ ids) of the sources of a field kind.
+        world = self.world
+        if kind != "enemy_units":
+            raise ValueError(f"Unknown distance field kind: {kind!r}")
+        return world.occupancy.unit_arrays(world.civ_ids)
+
+    def field(self, kind, civ_ids, xs, ys, turn, max_cost=FIELD_RANGE):
+        """
+        Float array of the cheapest route cost to (xs, ys) from the nearest
+        source not of civ_ids (inf where none is within max_cost), all three
+        arrays of one shape. "enemy_units" fields start at every unit.
+
+        One labelled Dijkstra pass serves every civ: each tile keeps its
+        nearest source and the nearest one of another civ, so the field of
+        any civ is one of the two.
+        """
+        key = (kind, turn, max_cost)
+        version = self._version(kind)
+        cached = self.fields.get(key)
+        if cached is None or cached[0] != version:
+            cached = (version,) + self._labelled_field(*self._sources(kind), max_cost)
+            # Fields from earlier turns are never asked for again.
+            self.fields = {k: v for k, v in self.fields.items() if k[1] == turn}
+            self.fields[key] = cached
+        _, bits, nearest, other = cached
+        at = (ys + 1) * self.padded_width + xs + 1
+        first, second = nearest[at], other[at]
+        packed = np.where(first & ((1 << bits) - 1) == civ_ids, second, first)
+        return np.where(packed == FIELD_NONE, np.inf, packed >> bits)
+
+    def _labelled_field(self, xs, ys, labels, max_cost):
+        """
+        Multi-source Dijkstra run as whole-grid relaxation sweeps. Entries are
+        packed as cost << bits | source civ id on the padded, flattened grid;
+        every sweep settles the tiles one step farther out, so max_cost /
+        min_cost sweeps (or fewer, once nothing changes) are exact within
+        max_cost. Returns (bits, nearest, nearest of a different civ).
+        """
+        width = self.padded_width
+        bits = max(1, int(labels.max(initial=0)).bit_length())
+        mask = (1 << bits) - 1
+        size = len(self.field_enter) + 2 * width
+        nearest = np.full(size, FIELD_NONE, dtype=np.int32)
+        other = np.full(size, FIELD_NONE, dtype=np.int32)
+        at = (ys + 1) * width + xs + 1
+        order = np.lexsort((labels, at))
+        at, labels = at[order], labels[order]
+        head = np.ones(len(at), dtype=bool)
+        head[1:] = at[1:] != at[:-1]
+        nearest[at[head]] = labels[head]
+        second = labels != nearest[at]
+        other[at[second]] = labels[second]
+        enter = self.field_enter << bits
+        limit = (max_cost + 1) << bits
+        lo, hi = width, size - width
+        first, rest = nearest[lo:hi], other[lo:hi]
+        offsets = (-width, width, -1, 1)
+        via = [np.empty(hi - lo, dtype=np.int32) for _ in offsets]
+        new_first, new_rest = np.empty_like(first), np.empty_like(rest)
+        scratch, differs = np.empty_like(first), np.empty(hi - lo, dtype=bool)
+        for _ in range(max(1, -(-max_cost // self.min_cost))):
+            new_first[:] = first
+            for step, offset in zip(via, offsets):
+                np.add(nearest[lo + offset:hi + offset], enter, out=step)
+                np.minimum(new_first, step, out=new_first)
+            # The nearest source of another civ than the new nearest comes from
+            # a neighbour's nearest when its civ differs, else from its second.
+            new_rest[:] = rest
+            candidates = [(first, None)] + [(step, offset) for step, offset in zip(via, offsets)]
+            for candidate, offset in candidates:
+                if offset is not None:
+                    np.add(other[lo + offset:hi + offset], enter, out=scratch)
+                    np.minimum(new_rest, scratch, out=new_rest)
+                np.bitwise_xor(candidate, new_first, out=scratch)
+                np.bitwise_and(scratch, mask, out=scratch)
+                np.not_equal(scratch, 0, out=differs)
+                np.minimum(new_rest, candidate, out=new_rest, where=differs)
+            np.copyto(new_first, FIELD_NONE, where=new_first >= limit)
+            np.copyto(new_rest, FIELD_NONE, where=new_rest >= limit)
+            if np.array_equal(new_first, first) and np.array_equal(new_rest, rest):
+                break
+            first[:] = new_first
+            rest[:] = new_rest
+        return bits, nearest, other
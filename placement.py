@@ -0,0 +1,109 @@
+# placement.py
+import math
+import numpy as np
+from map_ import CLIMATE_NAMES
+
+CANDIDATES = 30        # draws per capital before the spacing is relaxed
+SPACING_SHARE = 0.5    # default spacing: this share of the side of each civ's fair share of land
+MIN_SPACING = 2        # capitals are never packed closer than this unless the spacing is relaxed
+
+class LandIndex:
+    """
+    The flat indices (y * width + x) of every land tile, grouped by climate
+    code, so a land tile of any climate mix is drawn in O(1) instead of
+    retrying random map positions until one is not sea.
+    """
+    def __init__(self, world):
+        self.width = world.width
+        climate = world.climate.reshape(-1)
+        cells = np.flatnonzero(world.land.reshape(-1))
+        codes = climate[cells]
+        order = np.argsort(codes, kind="stable")
+        self.cells = cells[order]
+        self.counts = np.bincount(codes, minlength=len(CLIMATE_NAMES))
+        self.starts = np.concatenate(([0], np.cumsum(self.counts)[:-1]))
+        self.codes = np.flatnonzero(self.counts).tolist()  # climates present on the map
+
+    def __len__(self):
+        return len(self.cells)
+
+    def cum_weights(self, preferences=None):
+        """
+        Cumulative draw weights of the climates in self.codes: the tile count
+        times preferences[climate name] (1 for climates not listed).
+        """
+        preferences = preferences or {}
+        weights = [int(self.counts[code]) * preferences.get(CLIMATE_NAMES[code], 1.0) for code in self.codes]
+        return np.cumsum(weights).tolist()
+
+    def sample(self, rng, cum_weights=None):
+        # A random land tile as (x, y); uniform over the land without cum_weights.
+        if cum_weights is None:
+            i = int(self.cells[rng.randrange(len(self.cells))])
+            return i % self.width, i // self.width
+        code = rng.choices(self.codes, cum_weights=cum_weights)[0]
+        i = int(self.cells[self.starts[code] + rng.randrange(int(self.counts[code]))])
+        return i % self.width, i // self.width
+
+class CapitalPlacer:
+    """
+    Draws capital sites from a LandIndex, Poisson-disk style: a site is
+    accepted when it is unowned and no placed capital lies within spacing
+    tiles, checked against a grid of spacing / sqrt(2) cells (one capital per
+    cell at full spacing). After CANDIDATES rejected draws the spacing for
+    that civ is halved, so placement only fails once no land is free.
+    """
+    def __init__(self, world, land, civs, spacing=None):
+        self.world = world
+        self.land = land
+        if spacing is None:
+            spacing = max(MIN_SPACING, int(SPACING_SHARE * math.sqrt(len(land) / max(civs, 1))))
+        self.spacing = spacing
+        self.cell = max(spacing / math.sqrt(2), 1.0)
+        self.grid = {}  # (cell x, cell y) -> [(x, y) of the capitals inside]
+
+    def _key(self, x, y):
+        return int(x // self.cell), int(y // self.cell)
+
+    def _clear(self, x, y, spacing):
+        if self.world.owner[y, x] or not self.world.land[y, x]:
+            return False
+        if spacing <= 0:
+            return True
+        reach = int(math.ceil(spacing / self.cell))
+        kx, ky = self._key(x, y)
+        for cy in range(ky - reach, ky + reach + 1):
+            for cx in range(kx - reach, kx + reach + 1):
+                for sx, sy in self.grid.get((cx, cy), ()):
+                    if (sx - x) ** 2 + (sy - y) ** 2 < spacing * spacing:
+                        return False
+        return True
+
+    def place(self, rng, preferences=None):
+        """
+        A site for one capital as (x, y), or None when every land tile is
+        owned. preferences maps climate name -> weight.
+        """
+        if not len(self.land):
+            return None
+        cum_weights = self.land.cum_weights(preferences) if preferences else None
+        spacing = self.spacing
+        while True:
+            for _ in range(CANDIDATES):
+                x, y = self.land.sample(rng, cum_weights)
+                if self._clear(x, y, spacing):
+                    self.add(x, y)
+                    return x, y
+            if spacing <= 0:
+                break
+            spacing = spacing // 2
+        free = np.flatnonzero(self.world.land.reshape(-1) & (self.world.owner.reshape(-1) == 0))
+        if not len(free):
+            return None
+        i = int(free[rng.randrange(len(free))])
+        x, y = i % self.world.width, i // self.world.width
+        self.add(x, y)
+        return x, y
+
+    def add(self, x, y):
+        self.grid.setdefault(self._key(x, y), []).append((x, y))
@@ -0,0 +1,125 @@
+# profiler.py
+import contextlib
+import cProfile
+import csv
+import json
+import os
+import time
+from collections import deque
+import numpy as np
+
+PROFILE_DIR = "profiles"
+WINDOW = 240              # samples kept per section (4 seconds of frames at 60 fps)
+PERCENTILES = (50, 95, 99)
+NO_SECTION = contextlib.nullcontext()  # what section() hands out while disabled
+
+class Section:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+class Profiler:
+    """
+    Rolling timings of named sections of the frame and the turn. While
+    disabled, section() returns a shared no-op context and no turn hook is
+    installed, so the instrumentation can stay in release builds. Turn phases
+    come from the TurnPipeline's hooks as "turn.<phase>".
+    """
+    def __init__(self, pipeline=None, window=WINDOW):
+        self.pipeline = pipeline
+        self.window = window
+        self.enabled = False
+        self.samples = {}  # section name -> deque of seconds, in first-recorded order
+        self.cprofile = None
+
+    def set_enabled(self, enabled):
+        if enabled == self.enabled:
+            return
+        self.enabled = enabled
+        if self.pipeline is not None:
+            if enabled:
+                self.pipeline.add_hook(self.record_phase)
+            else:
+                self.pipeline.remove_hook(self.record_phase)
+
+    def section(self, name):
+        return Section(self, name) if self.enabled else NO_SECTION
+
+    def record(self, name, seconds):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def record_phase(self, phase, seconds):
+        self.record("turn." + phase, seconds)
+
+    def clear(self):
+        self.samples.clear()
+
+    def summary(self):
+        # {section: {"count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"}} over the window.
+        result = {}
+        for name, samples in self.samples.items():
+            ms = np.array(samples) * 1000
+            stats = {"count": len(ms), "mean_ms": float(ms.mean())}
+            for p, value in zip(PERCENTILES, np.percentile(ms, PERCENTILES).tolist()):
+                stats[f"p{p}_ms"] = value
+            stats["max_ms"] = float(ms.max())
+            result[name] = stats
+        return result
+
+    def lines(self):
+        # Overlay text, one section per line.
+        return [f"{name:<22} p50 {stats['p50_ms']:6.2f}  p95 {stats['p95_ms']:6.2f}  p99 {stats['p99_ms']:6.2f} ms"
+                for name, stats in self.summary().items()]
+
+    def export(self, base=None):
+        """
+        Writes the summary and the raw window to base.json and the summary to
+        base.csv (default: a timestamped name in PROFILE_DIR). Returns base.
+        """
+        if base is None:
+            base = os.path.join(PROFILE_DIR, time.strftime("profile_%Y%m%d_%H%M%S"))
+        directory = os.path.dirname(base)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        summary = self.summary()
+        with open(base + ".json", "w") as f:
+            json.dump({"summary": summary,
+                       "samples_ms": {name: [s * 1000 for s in samples] for name, samples in self.samples.items()}}, f, indent=1)
+        with open(base + ".csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            columns = ["count", "mean_ms"] + [f"p{p}_ms" for p in PERCENTILES] + ["max_ms"]
+            writer.writerow(["section"] + columns)
+            for name, stats in summary.items():
+                writer.writerow([name] + [stats[column] for column in columns])
+        return base
+
+    def toggle_cprofile(self, path=None):
+        """
+        Starts a cProfile capture, or stops the running one and dumps it to
+        path (default: a timestamped .prof in PROFILE_DIR). Returns the dump
+        path when a capture was stopped, else None.
+        """
+        if self.cprofile is None:
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+            return None
+        self.cprofile.disable()
+        if path is None:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            path = os.path.join(PROFILE_DIR, time.strftime("profile_%Y%m%d_%H%M%S.prof"))
+        self.cprofile.dump_stats(path)
+        self.cprofile = None
+        return path
@@ -0,0 +1,140 @@
+# pyramid.py
+import json
+import os
+import sys
+import numpy as np
+import rasterio
+from rasterio.transform import from_bounds
+from rasterio.windows import Window
+from map_ import classify_climate, row_latitudes, CLIMATE_RASTER_FILENAME, CLIMATE_MAPPING
+from map_cache import raster_digest
+
+PYRAMID_DIR = "map_pyramid"
+PYRAMID_FACTORS = (1, 2, 5, 10, 20)  # downsample factor of each level; 1 is native 0.1° data, 10 the game map
+MAX_WINDOW_PIXELS = 1024 * 1024     # largest region read in one call, whatever the level
+PYRAMID_BLOCK_SIZE = 256
+
+def level_path(factor, pyramid_dir=PYRAMID_DIR):
+    return os.path.join(pyramid_dir, f"level_{factor}.tif")
+
+def build_pyramid(filename=CLIMATE_RASTER_FILENAME, pyramid_dir=PYRAMID_DIR, factors=PYRAMID_FACTORS):
+    """
+    Writes one tiled GeoTIFF per downsample factor. Each level is resampled from
+    the source the same way load_map_arrays does, so a full read of level N
+    matches the map loaded with downsample_factor=N.
+    """
+    os.makedirs(pyramid_dir, exist_ok=True)
+    with rasterio.open(filename) as raster:
+        profile = raster.profile.copy()
+        for factor in factors:
+            width = raster.width // factor
+            height = raster.height // factor
+            data = raster.read(1, out_shape=(height, width))
+            profile.update(width=width, height=height, tiled=True, compress="lzw",
+                           blockxsize=PYRAMID_BLOCK_SIZE, blockysize=PYRAMID_BLOCK_SIZE,
+                           transform=from_bounds(*raster.bounds, width, height))
+            tmp_path = level_path(factor, pyramid_dir) + ".tmp"
+            with rasterio.open(tmp_path, "w", **profile) as level:
+                level.write(data, 1)
+            os.replace(tmp_path, level_path(factor, pyramid_dir))
+            del data
+    manifest = {"source": os.path.basename(filename), "digest": raster_digest(filename), "factors": list(factors)}
+    with open(os.path.join(pyramid_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    return manifest
+
+def pyramid_is_current(filename=CLIMATE_RASTER_FILENAME, pyramid_dir=PYRAMID_DIR, factors=PYRAMID_FACTORS):
+    manifest_path = os.path.join(pyramid_dir, "manifest.json")
+    if not os.path.exists(manifest_path):
+        return False
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    return (manifest.get("digest") == raster_digest(filename)
+            and set(factors) <= set(manifest.get("factors", []))
+            and all(os.path.exists(level_path(factor, pyramid_dir)) for factor in factors))
+
+class MapPyramid:
+    """
+    Reads climate codes for any region at any pyramid level through rasterio
+    windows. Only the requested window is decoded, so memory stays bounded by
+    MAX_WINDOW_PIXELS regardless of the level.
+    """
+    def __init__(self, filename=CLIMATE_RASTER_FILENAME, climate_mapping=CLIMATE_MAPPING,
+                 pyramid_dir=PYRAMID_DIR, factors=PYRAMID_FACTORS):
+        self.climate_mapping = climate_mapping
+        self.pyramid_dir = pyramid_dir
+        self.factors = tuple(sorted(factors))
+        if not pyramid_is_current(filename, pyramid_dir, self.factors):
+            print("Building map pyramid...")
+            build_pyramid(filename, pyramid_dir, self.factors)
+        self.levels = {}
+
+    def level(self, factor):
+        if factor not in self.factors:
+            raise ValueError(f"No pyramid level for downsample factor {factor}")
+        if factor not in self.levels:
+            self.levels[factor] = rasterio.open(level_path(factor, self.pyramid_dir))
+        return self.levels[factor]
+
+    def level_size(self, factor):
+        level = self.level(factor)
+        return level.width, level.height
+
+    def read_window(self, factor, x, y, width, height):
+        """
+        Returns (climate_codes, land_mask) for the tile rectangle at (x, y) of the
+        given level, clipped to the map.
+        """
+        level = self.level(factor)
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(level.width, x + width), min(level.height, y + height)
+        if x1 <= x0 or y1 <= y0:
+            empty = np.zeros((0, 0), dtype=np.uint8)
+            return empty, empty.astype(bool)
+        if (x1 - x0) * (y1 - y0) > MAX_WINDOW_PIXELS:
+            raise ValueError(f"Window of {(x1 - x0) * (y1 - y0)} pixels exceeds MAX_WINDOW_PIXELS")
+        raw = level.read(1, window=Window(x0, y0, x1 - x0, y1 - y0))
+        return classify_climate(raw, self.climate_mapping, row_latitudes(level.height, y0, y1 - y0))
+
+    def read_level(self, factor):
+        """
+        Returns (climate_codes, land_mask, width, height) for a whole level, the
+        same as map_.load_map_arrays with downsample_factor=factor. Rows are read
+        and classified in strips of at most MAX_WINDOW_PIXELS, so only the
+        result and one strip are ever held.
+        """
+        width, height = self.level_size(factor)
+        climate_codes = np.empty((height, width), dtype=np.uint8)
+        land_mask = np.empty((height, width), dtype=bool)
+        rows = max(1, MAX_WINDOW_PIXELS // width)
+        for y in range(0, height, rows):
+            codes, land = self.read_window(factor, 0, y, width, rows)
+            climate_codes[y:y + len(codes)] = codes
+            land_mask[y:y + len(land)] = land
+        return climate_codes, land_mask, width, height
+
+    def read_zoomed(self, base_factor, x, y, width, height, zoom_factor):
+        # The same area as a base_factor tile rectangle, read from a finer level.
+        scale = base_factor // zoom_factor
+        if scale < 1 or base_factor % zoom_factor:
+            raise ValueError("zoom_factor must evenly divide base_factor")
+        return self.read_window(zoom_factor, x * scale, y * scale, width * scale, height * scale)
+
+    def finest_zoom_factor(self, base_factor, width, height):
+        # Finest level that can serve a width x height view of base_factor tiles within budget.
+        for factor in self.factors:
+            scale = base_factor // factor
+            if factor <= base_factor and base_factor % factor == 0 and width * scale * height * scale <= MAX_WINDOW_PIXELS:
+                return factor
+        return base_factor
+
+    def close(self):
+        for level in self.levels.values():
+            level.close()
+        self.levels.clear()
+
+if __name__ == "__main__":
+    # python pyramid.py [factor ...] -> (re)build the pyramid levels
+    factors = tuple(int(arg) for arg in sys.argv[1:]) or PYRAMID_FACTORS
+    manifest = build_pyramid(CLIMATE_RASTER_FILENAME, PYRAMID_DIR, factors)
+    print(f"Built pyramid levels {manifest['factors']} in {PYRAMID_DIR}.")
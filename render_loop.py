@@ -0,0 +1,55 @@
+# render_loop.py
+import pygame
+
+FPS_CAP = 60          # frames per second while something is animating (e.g. panning)
+IDLE_WAIT_MS = 500    # longest sleep in pygame.event.wait while nothing changes
+
+class RenderScheduler:
+    """
+    Decides what a frame redraws. Each layer (map scene, hover border,
+    minimap, HUD) is keyed by the state it shows and redrawn only when that
+    key changes; the screen rects touched are collected and pushed with one
+    display.update(rects). When nothing is animating the loop sleeps in
+    pygame.event.wait instead of polling.
+    """
+    def __init__(self, fps=FPS_CAP, idle_wait=IDLE_WAIT_MS):
+        self.fps = fps
+        self.idle_wait = idle_wait
+        self.clock = pygame.time.Clock()
+        self.keys = {}   # layer -> key it was last drawn with
+        self.rects = []  # screen rects drawn this frame
+
+    def changed(self, layer, key):
+        # True (and remembers key) when layer has to be redrawn.
+        if layer in self.keys and self.keys[layer] == key:
+            return False
+        self.keys[layer] = key
+        return True
+
+    def invalidate_all(self):
+        # After something drew over the whole screen (a menu), every layer redraws.
+        self.keys.clear()
+
+    def invalidate(self, rect):
+        self.rects.append(pygame.Rect(rect))
+
+    def present(self):
+        # Pushes the rects drawn this frame; returns whether anything was drawn.
+        if not self.rects:
+            return False
+        pygame.display.update(self.rects)
+        self.rects = []
+        return True
+
+    def events(self, animating):
+        """
+        The events of the next frame. While animating, frames are capped at
+        fps; otherwise this blocks until an event arrives or idle_wait passes.
+        """
+        if animating:
+            self.clock.tick(self.fps)
+            return pygame.event.get()
+        event = pygame.event.wait(self.idle_wait)
+        self.clock.tick()  # restart the frame timer after sleeping
+        events = [] if event.type == pygame.NOEVENT else [event]
+        return events + pygame.event.get()
@@ -0,0 +1,205 @@
+# savegame.py
+import json
+import os
+import struct
+import sys
+import threading
+import time
+import numpy as np
+from unit import unit_stats
+
+SAVE_MAGIC = b"CIVSAVE\0"
+SAVE_VERSION = 1
+SAVE_DIR = "saves"
+QUICKSAVE_PATH = os.path.join(SAVE_DIR, "quicksave.sav")
+ARRAY_ALIGNMENT = 64
+
+# File layout: PREAMBLE, a JSON header of length header_length, padding up to
+# ARRAY_ALIGNMENT, then the raw little-endian arrays listed in header["arrays"]
+# (offsets are relative to the start of that data section).
+PREAMBLE = struct.Struct("<8sHI")  # magic, version, header length
+
+UNIT_TYPES = tuple(unit_stats)
+UNIT_DTYPE = np.dtype([
+    ("id", "<u4"), ("civ", "<u2"), ("type", "u1"), ("x", "<u2"), ("y", "<u2"),
+    ("hp", "<f8"), ("attack", "<f8"), ("base_move", "<i4"), ("remaining_move", "<i4"),
+    ("order_x", "<i4"), ("order_y", "<i4"),  # -1 when the unit has no move order
+])
+
+def _aligned(n):
+    return (n + ARRAY_ALIGNMENT - 1) // ARRAY_ALIGNMENT * ARRAY_ALIGNMENT
+
+def _number(value):
+    # hp becomes a float after a boosted hit; whole values load back as ints.
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+def unit_table(state):
+    table = np.zeros(len(state["units"]), dtype=UNIT_DTYPE)
+    for i, (unit_id, civ_id, unit_type, x, y, hp, attack, base_move, remaining_move, move_order) in enumerate(state["units"]):
+        order_x, order_y = move_order if move_order is not None else (-1, -1)
+        table[i] = (unit_id, civ_id, UNIT_TYPES.index(unit_type), x, y, hp, attack, base_move, remaining_move, order_x, order_y)
+    return table
+
+def write_state(path, state, meta):
+    """
+    Writes a Game.snapshot() state. meta (seed, map factor, size, civ names)
+    goes into the header next to the per-civ records; territories need no
+    record of their own because they are the owner grid.
+    """
+    civ_units = [unit_id for record in state["civs"] for unit_id in record["units"]]
+    arrays = {
+        "owner": np.ascontiguousarray(state["owner"], dtype="<u2"),
+        "building": np.ascontiguousarray(state["building"], dtype="u1"),
+        "units": unit_table(state),
+        "civ_units": np.array(civ_units, dtype="<u4"),
+    }
+    directory, offset = {}, 0
+    for name, array in arrays.items():
+        directory[name] = {"offset": offset, "dtype": array.dtype.descr if array.dtype.names else array.dtype.str,
+                           "shape": list(array.shape)}
+        offset = _aligned(offset + array.nbytes)
+    rng_version, rng_internal, rng_gauss = state["rng"]
+    header = dict(meta)
+    header.update({
+        "version": SAVE_VERSION,
+        "turn": state["turn"],
+        "unit_counter": state["unit_counter"],
+        "season": state["season"],
+        "rng": [rng_version, list(rng_internal), rng_gauss],
+        "civs": [dict(alive=record["alive"], capital=record["capital"], population=record["population"],
+                      residences=record["residences"], barracks=record["barracks"], unit_count=len(record["units"]))
+                 for record in state["civs"]],
+        "arrays": directory,
+    })
+    data = json.dumps(header).encode()
+    data_start = _aligned(PREAMBLE.size + len(data))
+    directory_name = os.path.dirname(path)
+    if directory_name:
+        os.makedirs(directory_name, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(PREAMBLE.pack(SAVE_MAGIC, SAVE_VERSION, len(data)))
+        f.write(data)
+        for name, array in arrays.items():
+            f.seek(data_start + directory[name]["offset"])
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
+    return path
+
+def read_state(path):
+    """
+    Returns (header, state) for a save file. The arrays are memory-mapped
+    copy-on-write, so nothing is read until restore() copies the grids.
+    """
+    with open(path, "rb") as f:
+        magic, version, header_length = PREAMBLE.unpack(f.read(PREAMBLE.size))
+        if magic != SAVE_MAGIC:
+            raise ValueError(f"{path} is not a save file")
+        if version != SAVE_VERSION:
+            raise ValueError(f"Unsupported save version {version}")
+        header = json.loads(f.read(header_length))
+    data_start = _aligned(PREAMBLE.size + header_length)
+    arrays = {}
+    for name, entry in header["arrays"].items():
+        dtype = np.dtype([tuple(field) for field in entry["dtype"]] if isinstance(entry["dtype"], list) else entry["dtype"])
+        shape = tuple(entry["shape"])
+        if int(np.prod(shape)) == 0:
+            arrays[name] = np.zeros(shape, dtype=dtype)
+        else:
+            arrays[name] = np.memmap(path, dtype=dtype, mode="c", offset=data_start + entry["offset"], shape=shape)
+    units = []
+    for row in arrays["units"].tolist():
+        unit_id, civ_id, type_code, x, y, hp, attack, base_move, remaining_move, order_x, order_y = row
+        move_order = (order_x, order_y) if order_x >= 0 else None
+        units.append((unit_id, civ_id, UNIT_TYPES[type_code], x, y, _number(hp), _number(attack),
+                      base_move, remaining_move, move_order))
+    civ_units = arrays["civ_units"].tolist()
+    civs, start = [], 0
+    for record in header["civs"]:
+        record = dict(record)
+        record["units"] = civ_units[start:start + record.pop("unit_count")]
+        start += len(record["units"])
+        civs.append(record)
+    rng_version, rng_internal, rng_gauss = header["rng"]
+    state = {
+        "turn": header["turn"],
+        "unit_counter": header["unit_counter"],
+        "season": header["season"],
+        "rng": (rng_version, tuple(rng_internal), rng_gauss),
+        "owner": arrays["owner"],
+        "building": arrays["building"],
+        "units": units,
+        "civs": civs,
+    }
+    return header, state
+
+def save_meta(game, downsample_factor):
+    return {"seed": game.seed, "downsample_factor": downsample_factor, "width": game.full_width,
+            "height": game.full_height, "civ_names": [civ.name for civ in game.civs]}
+
+def save_game(game, path, downsample_factor):
+    return write_state(path, game.snapshot(), save_meta(game, downsample_factor))
+
+def save_game_async(game, path, downsample_factor, on_done=None):
+    """
+    Takes the snapshot on the calling thread (a consistent copy between two
+    turns) and writes it on a background thread. Returns the thread.
+    """
+    state = game.snapshot()
+    meta = save_meta(game, downsample_factor)
+
+    def write():
+        try:
+            write_state(path, state, meta)
+        except OSError as e:
+            print(f"Saving to {path} failed: {e}")
+            return
+        if on_done:
+            on_done(path)
+
+    thread = threading.Thread(target=write, name="savegame", daemon=True)
+    thread.start()
+    return thread
+
+def load_into(game, path):
+    """
+    Restores a save into a running game built on the same map and civ line-up.
+    Returns False (and leaves the game untouched) when the save does not fit.
+    """
+    header, state = read_state(path)
+    if (header["width"], header["height"]) != (game.full_width, game.full_height):
+        print("This save was made on a different map size.")
+        return False
+    if header["civ_names"] != [civ.name for civ in game.civs]:
+        print("This save was made with different civilizations.")
+        return False
+    game.restore(state)
+    return True
+
+def load_game(path, game_class=None, map_data=None):
+    # Builds a new game from a save file alone, loading the map it was played on.
+    header, state = read_state(path)
+    if game_class is None:
+        from engine import Game as game_class
+    if map_data is None:
+        from map_ import CLIMATE_RASTER_FILENAME, CLIMATE_MAPPING
+        from map_cache import load_cached_map_data
+        map_data = load_cached_map_data(CLIMATE_RASTER_FILENAME, header["downsample_factor"], CLIMATE_MAPPING)
+    climate_grid, land_mask, width, height = map_data
+    game = game_class(width, height, header["civ_names"], climate_grid, land_mask, header["seed"])
+    game.restore(state)
+    return game
+
+if __name__ == "__main__":
+    # python savegame.py <save> -> summary of a save file
+    if len(sys.argv) < 2:
+        print("Usage: python savegame.py <save>")
+        sys.exit(1)
+    start = time.perf_counter()
+    header, state = read_state(sys.argv[1])
+    print(f"{sys.argv[1]}: turn {header['turn']}, {header['width']}x{header['height']}, "
+          f"{len(state['units'])} units, read in {(time.perf_counter() - start) * 1000:.1f} ms")
+    tiles = np.bincount(np.asarray(state["owner"]).reshape(-1), minlength=len(state["civs"]) + 1)
+    for civ_id, (name, record) in enumerate(zip(header["civ_names"], state["civs"]), start=1):
+        print(f"  {name}: {tiles[civ_id]} tiles, {len(record['units'])} units, population {record['population']}")
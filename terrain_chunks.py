@@ -0,0 +1,149 @@
+# terrain_chunks.py
+from collections import OrderedDict
+import numpy as np
+import pygame
+from map_ import TILE_PALETTE, CLIMATE_ABBREV, WATER_CODE
+from text_cache import get_font, render_text
+
+CHUNK_TILES = 16   # chunks are CHUNK_TILES x CHUNK_TILES map tiles
+MAX_CHUNKS = 64    # LRU capacity; a 1080p view at 48px tiles touches about 6 chunks
+
+class TerrainChunkCache:
+    """
+    Pre-rendered terrain in fixed-size chunk surfaces, kept in an LRU. Chunks
+    are re-rendered only after the world reports an owner or building change
+    inside them, or when the tile size, castle image, debug mode or detail
+    setting changes.
+    Colours come from the gameplay climate grid. With a MapPyramid and detail
+    on (the explicit zoom mode), they come from the finest level the tile size
+    can show instead (e.g. native 0.1° cells inside 48px tiles of a factor 10
+    map), read one chunk-sized window at a time and kept, so re-rendering a
+    chunk after an ownership change does not touch the disk. Detail cells are
+    fitted to the gameplay land mask: water tiles stay water and sea cells
+    inside a land tile take that tile's climate.
+    """
+    def __init__(self, world, player_color, ai_color, chunk_tiles=CHUNK_TILES, max_chunks=MAX_CHUNKS,
+                 pyramid=None, base_factor=None):
+        self.world = world
+        self.pyramid = pyramid
+        self.base_factor = base_factor  # downsample factor of the world grid within the pyramid
+        self.player_color = player_color
+        self.ai_color = ai_color
+        self.chunk_tiles = chunk_tiles
+        self.max_chunks = max_chunks
+        self.chunks = OrderedDict()  # (chunk_x, chunk_y) -> Surface
+        self.windows = OrderedDict()  # (chunk_x, chunk_y, factor) -> detail climate codes
+        self.dirty = set()
+        self.style = None
+        self.detail = False  # pyramid detail instead of the gameplay grid; set by draw
+        self.scaled_castle = None
+        world.add_listener(self.mark_dirty)
+
+    def mark_dirty(self, x, y):
+        key = (x // self.chunk_tiles, y // self.chunk_tiles)
+        if key in self.chunks:
+            self.dirty.add(key)
+
+    def clear(self):
+        self.chunks.clear()
+        self.dirty.clear()
+
+    def detail_factor(self, tile_size):
+        # Finest pyramid level with at least one screen pixel per raster cell at this tile size.
+        for factor in self.pyramid.factors:
+            if factor <= self.base_factor and self.base_factor % factor == 0 and self.base_factor // factor <= tile_size:
+                return factor
+        return self.base_factor
+
+    def detail_codes(self, chunk_x, chunk_y, x0, y0, x1, y1, factor):
+        key = (chunk_x, chunk_y, factor)
+        codes = self.windows.get(key)
+        if codes is None:
+            codes, _ = self.pyramid.read_zoomed(self.base_factor, x0, y0, x1 - x0, y1 - y0, factor)
+            scale = self.base_factor // factor
+            tiles = self.world.climate[y0:y1, x0:x1].repeat(scale, axis=0).repeat(scale, axis=1)
+            land = self.world.land[y0:y1, x0:x1].repeat(scale, axis=0).repeat(scale, axis=1)
+            codes = np.where(land, np.where(codes == WATER_CODE, tiles, codes), WATER_CODE)
+            self.windows[key] = codes
+            if len(self.windows) > self.max_chunks:
+                self.windows.popitem(last=False)
+        self.windows.move_to_end(key)
+        return codes
+
+    def render_chunk(self, chunk_x, chunk_y, tile_size, castle_img, debug_mode):
+        world = self.world
+        x0, y0 = chunk_x * self.chunk_tiles, chunk_y * self.chunk_tiles
+        x1, y1 = min(x0 + self.chunk_tiles, world.width), min(y0 + self.chunk_tiles, world.height)
+        if self.detail and self.pyramid is not None:
+            codes = self.detail_codes(chunk_x, chunk_y, x0, y0, x1, y1, self.detail_factor(tile_size))
+        else:
+            codes = world.climate[y0:y1, x0:x1]
+        base = pygame.surfarray.make_surface(TILE_PALETTE[codes.T])
+        chunk = pygame.transform.scale(base, ((x1 - x0) * tile_size, (y1 - y0) * tile_size))
+        if pygame.display.get_surface() is not None:
+            chunk = chunk.convert()
+        font_small = get_font(None, tile_size)
+        debug_font = get_font(None, 12)
+        scaled_castle = self.scaled_castle
+        land = world.land[y0:y1, x0:x1].tolist()
+        owners = world.owner[y0:y1, x0:x1].tolist()
+        buildings = world.building[y0:y1, x0:x1].tolist()
+        for j, row in enumerate(land):
+            for i, is_land in enumerate(row):
+                if not is_land:
+                    continue
+                rect = pygame.Rect(i * tile_size, j * tile_size, tile_size, tile_size)
+                owner = world.civs[owners[j][i]]
+                if owner:
+                    border_color = self.player_color if owner.is_human else self.ai_color
+                    pygame.draw.rect(chunk, border_color, rect, 2)
+                else:
+                    pygame.draw.rect(chunk, (50, 50, 50), rect, 1)
+                if buildings[j][i]:
+                    tile = world.tile(x0 + i, y0 + j)
+                    b_txt = render_text(font_small, tile.building[0], (0, 0, 0))
+                    chunk.blit(b_txt, (rect.x, rect.y))
+                if owner and (x0 + i, y0 + j) == owner.capital:
+                    if scaled_castle:
+                        chunk.blit(scaled_castle, (rect.x, rect.y))
+                    else:
+                        pygame.draw.rect(chunk, (100, 100, 100), rect, 3)
+                if debug_mode:
+                    climate = world.tile(x0 + i, y0 + j).climate
+                    txt_color = (0, 0, 0) if climate in ["EF (Ice Cap)", "ET (Tundra)"] else (255, 255, 255)
+                    dbg_txt = render_text(debug_font, CLIMATE_ABBREV.get(climate, climate), txt_color)
+                    chunk.blit(dbg_txt, (rect.x + 2, rect.y + 2))
+        return chunk
+
+    def get_chunk(self, chunk_x, chunk_y, tile_size, castle_img, debug_mode):
+        key = (chunk_x, chunk_y)
+        chunk = self.chunks.get(key)
+        if chunk is None or key in self.dirty:
+            chunk = self.render_chunk(chunk_x, chunk_y, tile_size, castle_img, debug_mode)
+            self.chunks[key] = chunk
+            self.dirty.discard(key)
+            if len(self.chunks) > self.max_chunks:
+                self.chunks.popitem(last=False)
+        self.chunks.move_to_end(key)
+        return chunk
+
+    def draw(self, surface, cam_x, cam_y, visible_cols, visible_rows, tile_size, castle_img, debug_mode=False,
+             detail=False):
+        style = (tile_size, id(castle_img), debug_mode, detail)
+        if style != self.style:
+            self.clear()
+            self.style = style
+            self.detail = detail
+            self.scaled_castle = pygame.transform.scale(castle_img, (tile_size, tile_size)) if castle_img else None
+        cols = min(visible_cols, self.world.width - cam_x)
+        rows = min(visible_rows, self.world.height - cam_y)
+        if cols <= 0 or rows <= 0:
+            return
+        old_clip = surface.get_clip()
+        surface.set_clip(pygame.Rect(0, 0, cols * tile_size, rows * tile_size).clip(old_clip))
+        n = self.chunk_tiles
+        for chunk_y in range(cam_y // n, (cam_y + rows - 1) // n + 1):
+            for chunk_x in range(cam_x // n, (cam_x + cols - 1) // n + 1):
+                chunk = self.get_chunk(chunk_x, chunk_y, tile_size, castle_img, debug_mode)
+                surface.blit(chunk, ((chunk_x * n - cam_x) * tile_size, (chunk_y * n - cam_y) * tile_size))
+        surface.set_clip(old_clip)
@@ -0,0 +1,193 @@
+# territory.py
+import numpy as np
+
+NEIGHBOR_ORDER = ((0, -1), (0, 1), (-1, 0), (1, 0))
+
+class TerritoryIndex:
+    """
+    Per-civ tile count, bounding box and border tiles over the world's owner
+    grid, kept up to date from its change notifications. A border tile is an
+    owned tile with a 4-neighbour that is not the same civ's (another civ,
+    unowned land, sea or the map edge).
+    """
+    def __init__(self, world):
+        self.world = world
+        self.width = world.width
+        self.height = world.height
+        self.rebuild()
+        world.add_listener(self.tile_changed, self.owner_transferred, self.rebuild)
+
+    def rebuild(self):
+        # Owners as last processed, to know what a changed tile was taken from.
+        self.known = self.world.owner.copy()
+        self.owner = memoryview(self.known.reshape(-1))
+        owner = self.known
+        ids = np.unique(owner[owner != 0]).tolist()
+        self.counts = {}   # civ id -> tiles owned
+        self.rows = {}     # civ id -> tiles owned per row
+        self.cols = {}     # civ id -> tiles owned per column
+        self.boxes = {}    # civ id -> (min_x, min_y, max_x, max_y), or None until recomputed
+        self.borders = {}  # civ id -> set of (x, y) border tiles
+        for civ_id in ids:
+            mask = owner == civ_id
+            self.counts[civ_id] = int(np.count_nonzero(mask))
+            self.rows[civ_id] = mask.sum(axis=1, dtype=np.int32)
+            self.cols[civ_id] = mask.sum(axis=0, dtype=np.int32)
+            self.boxes[civ_id] = None
+        inner = np.zeros_like(owner, dtype=bool)
+        inner[1:-1, 1:-1] = ((owner[1:-1, 1:-1] == owner[:-2, 1:-1]) & (owner[1:-1, 1:-1] == owner[2:, 1:-1])
+                             & (owner[1:-1, 1:-1] == owner[1:-1, :-2]) & (owner[1:-1, 1:-1] == owner[1:-1, 2:]))
+        ys, xs = np.nonzero((owner != 0) & ~inner)
+        for civ_id in ids:
+            self.borders[civ_id] = set()
+        for x, y, civ_id in zip(xs.tolist(), ys.tolist(), owner[ys, xs].tolist()):
+            self.borders[civ_id].add((x, y))
+
+    def count(self, civ_id):
+        return self.counts.get(civ_id, 0)
+
+    def bbox(self, civ_id):
+        # (min_x, min_y, max_x, max_y) of civ_id's tiles, or None when it owns none.
+        if civ_id not in self.counts:
+            return None
+        box = self.boxes[civ_id]
+        if box is None:
+            ys, xs = np.flatnonzero(self.rows[civ_id]), np.flatnonzero(self.cols[civ_id])
+            box = self.boxes[civ_id] = (int(xs[0]), int(ys[0]), int(xs[-1]), int(ys[-1]))
+        return box
+
+    def border(self, civ_id):
+        return self.borders.get(civ_id, set())
+
+    def _is_border(self, x, y, civ_id):
+        owner, width = self.owner, self.width
+        for dx, dy in NEIGHBOR_ORDER:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < width and 0 <= ny < self.height) or owner[ny * width + nx] != civ_id:
+                return True
+        return False
+
+    def _update_border(self, x, y):
+        civ_id = self.owner[y * self.width + x]
+        if not civ_id:
+            return
+        if self._is_border(x, y, civ_id):
+            self.borders[civ_id].add((x, y))
+        else:
+            self.borders[civ_id].discard((x, y))
+
+    def _remove(self, civ_id, x, y):
+        self.counts[civ_id] -= 1
+        if not self.counts[civ_id]:
+            for table in (self.counts, self.rows, self.cols, self.boxes, self.borders):
+                del table[civ_id]
+            return
+        self.rows[civ_id][y] -= 1
+        self.cols[civ_id][x] -= 1
+        self.borders[civ_id].discard((x, y))
+        box = self.boxes[civ_id]
+        if box is not None and (x in (box[0], box[2]) or y in (box[1], box[3])):
+            self.boxes[civ_id] = None
+
+    def _add(self, civ_id, x, y):
+        if civ_id not in self.counts:
+            self.counts[civ_id] = 0
+            self.rows[civ_id] = np.zeros(self.height, dtype=np.int32)
+            self.cols[civ_id] = np.zeros(self.width, dtype=np.int32)
+            self.boxes[civ_id] = (x, y, x, y)
+            self.borders[civ_id] = set()
+        self.counts[civ_id] += 1
+        self.rows[civ_id][y] += 1
+        self.cols[civ_id][x] += 1
+        box = self.boxes[civ_id]
+        if box is not None:
+            self.boxes[civ_id] = (min(box[0], x), min(box[1], y), max(box[2], x), max(box[3], y))
+
+    def tile_changed(self, x, y):
+        i = y * self.width + x
+        old, new = self.owner[i], int(self.world.owner[y, x])
+        if old == new:
+            return
+        if old:
+            self._remove(old, x, y)
+        if new:
+            self._add(new, x, y)
+        self.owner[i] = new
+        self._update_border(x, y)
+        for dx, dy in NEIGHBOR_ORDER:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                self._update_border(nx, ny)
+
+    def owner_transferred(self, old, new, window, mask):
+        # Every tile of old went to new at once: the tables merge, and only
+        # the two civs' former border tiles can change border status.
+        if old not in self.counts:
+            return
+        self.known[window][mask] = new
+        count, rows, cols, box, border = (table.pop(old) for table in
+                                          (self.counts, self.rows, self.cols, self.boxes, self.borders))
+        if not new:
+            return
+        if new not in self.counts:
+            self.counts[new], self.rows[new], self.cols[new], self.boxes[new], self.borders[new] = count, rows, cols, box, border
+            return
+        self.counts[new] += count
+        self.rows[new] += rows
+        self.cols[new] += cols
+        other = self.boxes[new]
+        self.boxes[new] = None if box is None or other is None else (
+            min(box[0], other[0]), min(box[1], other[1]), max(box[2], other[2]), max(box[3], other[3]))
+        candidates = border | self.borders[new]
+        self.borders[new] = {(x, y) for x, y in candidates if self._is_border(x, y, new)}
+
+class TerritoryView:
+    """
+    Set-like view of the tiles one civ owns, read from the world's owner grid
+    and TerritoryIndex. add/discard/clear write the grid, so the view can
+    never disagree with the map.
+    """
+    __slots__ = ("world", "civ_id")
+
+    def __init__(self, world, civ_id):
+        self.world = world
+        self.civ_id = civ_id
+
+    def __len__(self):
+        return self.world.territory.count(self.civ_id)
+
+    def __bool__(self):
+        return self.world.territory.count(self.civ_id) > 0
+
+    def __iter__(self):
+        # Row-major order.
+        cells = np.flatnonzero(self.world.owner.reshape(-1) == self.civ_id)
+        width = self.world.width
+        return iter(list(zip((cells % width).tolist(), (cells // width).tolist())))
+
+    def __contains__(self, pos):
+        x, y = pos
+        world = self.world
+        return 0 <= x < world.width and 0 <= y < world.height and world.owner[y, x] == self.civ_id
+
+    def __repr__(self):
+        return f"TerritoryView(civ {self.civ_id}, {len(self)} tiles)"
+
+    def add(self, pos):
+        self.world.set_owner(pos[0], pos[1], self.world.civs[self.civ_id])
+
+    def discard(self, pos):
+        if pos in self:
+            self.world.set_owner(pos[0], pos[1], None)
+
+    def clear(self):
+        self.world.transfer_owner(self.world.civs[self.civ_id], None)
+
+    @property
+    def bbox(self):
+        return self.world.territory.bbox(self.civ_id)
+
+    @property
+    def border(self):
+        # The live border set; read it, do not modify it.
+        return self.world.territory.border(self.civ_id)
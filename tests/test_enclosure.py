@@ -0,0 +1,57 @@
+# tests/test_enclosure.py
+# The incremental enclosure index against the original whole-map flood fill,
+# on small random maps.
+#   python -m pytest tests/test_enclosure.py
+import random
+import numpy as np
+import pytest
+from benchmarks.enclosure import Civ, paint_walls
+from enclosure import EnclosureIndex, full_enclosure_scan
+from world import World
+
+def random_world(seed, width=90, height=60, civs=4):
+    rng = np.random.default_rng(seed)
+    land = rng.random((height, width)) < 0.75
+    # A few passes of neighbour averaging turn the noise into coasts, lakes and islands.
+    for _ in range(3):
+        padded = np.pad(land.astype(np.int8), 1)
+        land = (padded[:-2, 1:-1] + padded[2:, 1:-1] + padded[1:-1, :-2] + padded[1:-1, 2:] + land) >= 3
+    world = World(np.zeros((height, width), dtype=np.uint8), land)
+    civ_objs = [Civ(f"civ {i}") for i in range(civs)]
+    for civ in civ_objs:
+        world.add_civ(civ)
+    return world, civ_objs
+
+def summary(index):
+    return sorted((sorted(region.cells), sorted(region.edges.items())) for region in index.regions.values())
+
+@pytest.mark.parametrize("seed", range(6))
+def test_enclosed_cells_match_full_scan(seed):
+    world, civs = random_world(seed)
+    rng = random.Random(seed)
+    index = EnclosureIndex(world)
+    for turn in range(25):
+        # Few strokes take the incremental path, many the rebuild.
+        paint_walls(world, civs, rng, rng.choice((1, 3, 60)))
+        for _ in range(rng.randint(0, 20)):
+            x, y = rng.randrange(world.width), rng.randrange(world.height)
+            world.set_owner(x, y, None)
+        civ = rng.choice(civs)
+        civ_id = world.civ_id(civ)
+        expected = full_enclosure_scan(world, civ_id)
+        assert index.enclosed_cells(civ_id) == expected, f"turn {turn}"
+        for group in expected:
+            for i in group:
+                world.set_owner(i % world.width, i // world.width, civ)
+    index.refresh()
+    assert summary(index) == summary(EnclosureIndex(world))
+
+def test_transfer_relabels_region_edges():
+    world, civs = random_world(7)
+    paint_walls(world, civs, random.Random(7), 80)
+    index = EnclosureIndex(world)
+    world.transfer_owner(civs[0], civs[1])
+    index.refresh()
+    assert summary(index) == summary(EnclosureIndex(world))
+    for civ in civs[1:]:
+        assert index.enclosed_cells(world.civ_id(civ)) == full_enclosure_scan(world, world.civ_id(civ))
@@ -0,0 +1,33 @@
+# text_cache.py
+from collections import OrderedDict
+from functools import lru_cache
+import pygame
+
+MAX_CACHED_TEXTS = 1024
+
+_rendered = OrderedDict()
+
+@lru_cache(maxsize=32)
+def get_font(name, size, bold=False):
+    # pygame.font.SysFont searches the font system on every call, so share one Font per (name, size, bold).
+    return pygame.font.SysFont(name, size, bold=bold)
+
+def render_text(font, text, color, antialias=True):
+    """
+    Cached font.render(text, antialias, color). The returned surface is shared
+    between callers and must not be drawn on.
+    """
+    key = (font, text, tuple(color), antialias)
+    surface = _rendered.get(key)
+    if surface is None:
+        surface = font.render(text, antialias, color)
+        _rendered[key] = surface
+        if len(_rendered) > MAX_CACHED_TEXTS:
+            _rendered.popitem(last=False)
+    else:
+        _rendered.move_to_end(key)
+    return surface
+
+def clear_text_cache():
+    _rendered.clear()
+    get_font.cache_clear()
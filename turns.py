@@ -0,0 +1,150 @@
+# turns.py
+import time
+import numpy as np
+from unit import strengths
+from map_ import CLIMATE_CODES
+
+PHASES = ("collect", "movement", "combat", "ai", "claim", "enclosure", "upkeep")
+COUNTER_BONUS = 1.5   # damage multiplier against the unit type an attacker is strong against
+ICE_BONUS = 1.2       # Greenland's damage multiplier when attacking from tundra or ice cap
+ICE_CODES = [CLIMATE_CODES["ET (Tundra)"], CLIMATE_CODES["EF (Ice Cap)"]]
+
+class TurnPipeline:
+    """
+    Resolves a turn in fixed phases, each over every order at once: collect
+    the move orders and their routes, move the uncontested units, fight all
+    attacks simultaneously, move the AI, claim the walked-over land in one
+    masked assignment, claim enclosed land, then upkeep. Player attacks are
+    resolved before the AI moves, so every defender is still on the tile it
+    was attacked on. Every phase is timed; hooks are called as
+    hook(phase, seconds).
+    """
+    def __init__(self, game):
+        self.game = game
+        self.hooks = []
+        self.timings = dict.fromkeys(PHASES, 0.0)  # seconds spent in each phase last turn
+        self.rng = None
+        self.moves = []    # (unit, (x, y), route cost, steps) of every routed order
+        self.attacks = []  # (unit, defender, (x, y), route cost)
+        self.claims = []   # (civ id, steps) of the units that walked in unopposed
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        if hook in self.hooks:
+            self.hooks.remove(hook)
+
+    def run(self, rng):
+        # rng: the turn's numpy Generator, shared by the AI phases.
+        self.rng = rng
+        for phase in PHASES:
+            start = time.perf_counter()
+            getattr(self, phase)()
+            elapsed = time.perf_counter() - start
+            self.timings[phase] = elapsed
+            for hook in self.hooks:
+                hook(phase, elapsed)
+        self.rng = None
+
+    def collect(self):
+        # Routes are checked against the move points the unit had when ordered;
+        # an order whose destination can no longer be reached is dropped. Units
+        # ordered from the same tile share one search through game.route.
+        game = self.game
+        self.moves, self.attacks, self.claims = [], [], []
+        for civ in game.civs:
+            if not civ.alive or not civ.is_human:
+                continue
+            for unit in civ.units:
+                if unit.move_order is None:
+                    continue
+                dest = unit.move_order
+                unit.move_order = None
+                route = game.route(unit, dest)
+                if route is None:
+                    print("The destination can no longer be reached.")
+                    continue
+                self.moves.append((unit, dest, route[0], route[1]))
+
+    def movement(self):
+        # Orders onto an enemy-held tile become attacks; the rest move now.
+        game = self.game
+        occupancy = game.world.occupancy
+        movers, xs, ys = [], [], []
+        for unit, dest, cost, steps in self.moves:
+            defender = occupancy.first_enemy(dest[0], dest[1], unit.civ)
+            if defender is not None:
+                self.attacks.append((unit, defender, dest, cost))
+                continue
+            movers.append(unit)
+            xs.append(dest[0])
+            ys.append(dest[1])
+            unit.remaining_move = max(0, unit.remaining_move - cost)
+            self.claims.append((game.world.civ_ids[unit.civ], steps))
+        occupancy.move_many(movers, xs, ys)
+
+    def combat(self):
+        """
+        Every attack hits at once: a defender takes the summed damage of all
+        its attackers and strikes back at each of them. Attackers whose
+        defender falls move onto its tile.
+        """
+        if not self.attacks:
+            return
+        game = self.game
+        world = game.world
+        attackers = [attacker for attacker, _, _, _ in self.attacks]
+        defenders = list({defender.id: defender for _, defender, _, _ in self.attacks}.values())
+        slot = {defender.id: k for k, defender in enumerate(defenders)}
+        target = np.array([slot[defender.id] for _, defender, _, _ in self.attacks], dtype=np.int64)
+        ax = np.array([attacker.x for attacker in attackers], dtype=np.int64)
+        ay = np.array([attacker.y for attacker in attackers], dtype=np.int64)
+        attack = np.array([attacker.attack for attacker in attackers], dtype=np.float64)
+        counter = np.array([strengths.get(attacker.unit_type) == defenders[k].unit_type
+                            for attacker, k in zip(attackers, target.tolist())], dtype=bool)
+        greenland = np.array([attacker.civ.name == "Greenland" for attacker in attackers], dtype=bool)
+        ice = np.isin(world.climate[ay, ax], ICE_CODES)
+        damage = attack * np.where(counter, COUNTER_BONUS, 1.0) * np.where(greenland & ice, ICE_BONUS, 1.0)
+        taken = np.bincount(target, weights=damage, minlength=len(defenders))
+        for defender, hp_loss in zip(defenders, taken.tolist()):
+            defender.hp -= hp_loss
+        strike_back = np.array([defender.attack for defender in defenders], dtype=np.float64)[target]
+        movers, xs, ys = [], [], []
+        for (attacker, defender, dest, cost), dealt, hit in zip(self.attacks, damage.tolist(), strike_back.tolist()):
+            attacker.hp -= hit
+            print(f"{attacker.unit_type} attacked {defender.unit_type} for {dealt:.1f} damage. Defender HP: {defender.hp}")
+            print(f"Defender counter-attacked! Attacker HP: {attacker.hp}")
+            if defender.hp <= 0:
+                movers.append(attacker)
+                xs.append(dest[0])
+                ys.append(dest[1])
+                attacker.remaining_move = max(0, attacker.remaining_move - cost)
+        world.occupancy.move_many(movers, xs, ys)
+
+    def ai(self):
+        # The AI moves its units as one batch.
+        self.game.ai.move_units(self.rng)
+
+    def claim(self):
+        # Unowned tiles along the routes go to the unit that walked them; the
+        # first order in the list wins a tile two routes share.
+        if not self.claims:
+            return
+        steps = [step for _, route in self.claims for step in route]
+        civ_ids = np.repeat([civ_id for civ_id, _ in self.claims], [len(route) for _, route in self.claims])
+        cells = np.array(steps, dtype=np.int64).reshape(-1, 2)
+        self.game.world.claim(cells[:, 0], cells[:, 1], civ_ids)
+
+    def enclosure(self):
+        game = self.game
+        for civ in game.civs:
+            if civ.is_human:
+                game.update_surrounded_territory_group(civ)
+
+    def upkeep(self):
+        game = self.game
+        game.ai.place_capitals(self.rng)
+        game.turn += 1
+        game.reach_cache.clear()
+        game.update_season()
@@ -0,0 +1,292 @@
+# world.py
+import numpy as np
+from map_ import CLIMATE_NAMES, WATER_CODE, latitude_band_codes, row_latitudes
+from occupancy import OccupancyIndex
+from territory import TerritoryIndex, TerritoryView
+
+BUILDING_NAMES = (None, "Capital", "Residence", "Barracks", "Igluvijaq")
+BUILDING_CODES = {name: code for code, name in enumerate(BUILDING_NAMES)}
+NO_OWNER = 0
+
+class TileUnits:
+    """
+    The units standing on one tile, as a list-like view over the world's
+    OccupancyIndex. append/remove move units in and out of the index.
+    """
+    __slots__ = ("world", "x", "y")
+
+    def __init__(self, world, x, y):
+        self.world = world
+        self.x = x
+        self.y = y
+
+    def _units(self):
+        return self.world.occupancy.units_at(self.x, self.y)
+
+    def __len__(self):
+        return self.world.occupancy.count_at(self.x, self.y)
+
+    def __bool__(self):
+        return self.world.occupancy.count_at(self.x, self.y) > 0
+
+    def __iter__(self):
+        return iter(self._units())
+
+    def __getitem__(self, index):
+        return self._units()[index]
+
+    def __contains__(self, unit):
+        return self.world.occupancy.positions.get(unit.id) == (self.x, self.y)
+
+    def __repr__(self):
+        return repr(self._units())
+
+    def append(self, unit):
+        self.world.occupancy.add(unit, self.x, self.y)
+
+    def remove(self, unit):
+        if unit not in self:
+            raise ValueError("unit is not on this tile")
+        self.world.occupancy.remove(unit)
+
+    def clear(self):
+        for unit in self._units():
+            self.world.occupancy.remove(unit)
+
+class TileView:
+    """
+    Tile-like view of one land cell, created on demand by World.tile().
+    Reads and writes go straight to the world arrays.
+    """
+    __slots__ = ("world", "x", "y")
+
+    def __init__(self, world, x, y):
+        self.world = world
+        self.x = x
+        self.y = y
+
+    def __eq__(self, other):
+        return isinstance(other, TileView) and other.world is self.world and other.x == self.x and other.y == self.y
+
+    def __hash__(self):
+        return hash((self.x, self.y))
+
+    def __repr__(self):
+        return f"TileView({self.x}, {self.y}, {self.climate!r})"
+
+    @property
+    def climate(self):
+        return CLIMATE_NAMES[self.world.climate[self.y, self.x]]
+
+    @property
+    def owner(self):
+        return self.world.civs[self.world.owner[self.y, self.x]]
+
+    @owner.setter
+    def owner(self, civ):
+        self.world.set_owner(self.x, self.y, civ)
+
+    @property
+    def building(self):
+        return BUILDING_NAMES[self.world.building[self.y, self.x]]
+
+    @building.setter
+    def building(self, building):
+        self.world.set_building(self.x, self.y, building)
+
+    @property
+    def units(self):
+        return TileUnits(self.world, self.x, self.y)
+
+class WorldRow:
+    __slots__ = ("world", "y")
+
+    def __init__(self, world, y):
+        self.world = world
+        self.y = y
+
+    def __len__(self):
+        return self.world.width
+
+    def __getitem__(self, x):
+        return self.world.tile(x, self.y)
+
+    def __iter__(self):
+        return (self.world.tile(x, self.y) for x in range(self.world.width))
+
+class World:
+    """
+    Grid-backed store for the game map: one NumPy array per tile attribute plus
+    an OccupancyIndex of where the units stand. world[y][x] mimics the old
+    list of lists of Tile/None.
+    """
+    def __init__(self, climate_codes, land_mask):
+        self.land = np.asarray(land_mask, dtype=bool)
+        self.height, self.width = self.land.shape
+        climate = np.asarray(climate_codes, dtype=np.uint8)
+        # Land without a climate falls back to the latitude band, as Tile creation used to.
+        missing = self.land & (climate == WATER_CODE)
+        if missing.any():
+            bands = np.broadcast_to(latitude_band_codes(row_latitudes(self.height))[:, None], climate.shape)
+            climate = np.where(missing, bands, climate).astype(np.uint8)
+        self.climate = climate
+        self.owner = np.zeros((self.height, self.width), dtype=np.uint16)
+        self.building = np.zeros((self.height, self.width), dtype=np.uint8)
+        self.unit_count = np.zeros((self.height, self.width), dtype=np.uint16)
+        self.occupancy = OccupancyIndex(self.unit_count)
+        self.civs = [None]  # civ id -> Civilization; id 0 means unowned
+        self.civ_ids = {}
+        self.listeners = []  # called as listener(x, y) when a tile's owner or building changes
+        self.transfer_handlers = {}  # listener -> handler(old id, new id, window, mask) used by transfer_owner
+        self.reload_handlers = {}    # listener -> handler() used by load_grids
+        self.version = 0     # bumped on every owner or building change
+        self.territory = TerritoryIndex(self)
+
+    def add_listener(self, listener, on_transfer=None, on_reload=None):
+        # Bulk changes fall back to one listener call per changed tile when no handler is given.
+        self.listeners.append(listener)
+        if on_transfer is not None:
+            self.transfer_handlers[listener] = on_transfer
+        if on_reload is not None:
+            self.reload_handlers[listener] = on_reload
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+        self.transfer_handlers.pop(listener, None)
+        self.reload_handlers.pop(listener, None)
+
+    def tile_changed(self, x, y):
+        self.version += 1
+        for listener in self.listeners:
+            listener(x, y)
+
+    def add_civ(self, civ):
+        # The civ's territory becomes a view over this world's owner grid.
+        if civ not in self.civ_ids:
+            self.civ_ids[civ] = len(self.civs)
+            self.civs.append(civ)
+            civ.territory = TerritoryView(self, self.civ_ids[civ])
+        return self.civ_ids[civ]
+
+    def civ_id(self, civ):
+        if civ is None:
+            return NO_OWNER
+        return self.civ_ids.get(civ)
+
+    def set_owner(self, x, y, civ):
+        civ_id = self.civ_id(civ)
+        if civ_id is None:
+            civ_id = self.add_civ(civ)
+        if self.owner[y, x] != civ_id:
+            self.owner[y, x] = civ_id
+            self.tile_changed(x, y)
+
+    def set_building(self, x, y, building):
+        if building not in BUILDING_CODES:
+            raise ValueError(f"Unknown building: {building!r}")
+        if self.building[y, x] != BUILDING_CODES[building]:
+            self.building[y, x] = BUILDING_CODES[building]
+            self.tile_changed(x, y)
+
+    def claim(self, xs, ys, civ_ids):
+        """
+        Gives every unowned land tile (xs[k], ys[k]) to civ_ids[k] in one
+        masked assignment; when a tile is listed twice the first entry wins.
+        Returns the number of tiles claimed.
+        """
+        cells = np.asarray(ys, dtype=np.int64) * self.width + np.asarray(xs, dtype=np.int64)
+        cells, first = np.unique(cells, return_index=True)
+        civ_ids = np.asarray(civ_ids, dtype=self.owner.dtype)[first]
+        owner = self.owner.reshape(-1)
+        free = (owner[cells] == NO_OWNER) & self.land.reshape(-1)[cells]
+        cells = cells[free]
+        if not len(cells):
+            return 0
+        owner[cells] = civ_ids[free]
+        self.version += 1
+        for i in cells.tolist():
+            x, y = i % self.width, i // self.width
+            for listener in self.listeners:
+                listener(x, y)
+        return len(cells)
+
+    def transfer_owner(self, old, new):
+        """
+        Hands every tile of civ old to civ new (None: leaves them unowned) in
+        one masked assignment over old's bounding box. Transfer handlers get
+        that window as (row slice, column slice) and the mask of the tiles
+        that changed hands within it.
+        """
+        old_id = self.civ_id(old)
+        new_id = self.civ_id(new)
+        if new_id is None:
+            new_id = self.add_civ(new)
+        if old_id is None or old_id == new_id:
+            return
+        box = self.territory.bbox(old_id)
+        if box is None:
+            return
+        x0, y0, x1, y1 = box
+        window = (slice(y0, y1 + 1), slice(x0, x1 + 1))
+        mask = self.owner[window] == old_id
+        self.owner[window][mask] = new_id
+        self.version += 1
+        cells = None
+        for listener in self.listeners:
+            handler = self.transfer_handlers.get(listener)
+            if handler is not None:
+                handler(old_id, new_id, window, mask)
+                continue
+            if cells is None:
+                cells = (np.argwhere(mask) + (y0, x0)).tolist()
+            for y, x in cells:
+                listener(x, y)
+
+    def load_grids(self, owner, building):
+        # Bulk replacement (e.g. restoring a snapshot). Listeners with a reload
+        # handler rebuild once; the rest hear about every changed tile.
+        owner = np.asarray(owner, dtype=np.uint16)
+        building = np.asarray(building, dtype=np.uint8)
+        changed = np.argwhere((self.owner != owner) | (self.building != building)).tolist()
+        self.owner[...] = owner
+        self.building[...] = building
+        if not changed:
+            return
+        self.version += 1
+        for listener in self.listeners:
+            handler = self.reload_handlers.get(listener)
+            if handler is not None:
+                handler()
+                continue
+            for y, x in changed:
+                listener(x, y)
+
+    def clear_units(self):
+        self.unit_count[...] = 0
+        version = self.occupancy.version
+        self.occupancy = OccupancyIndex(self.unit_count)
+        self.occupancy.version = version + 1  # keeps caches keyed on the version from matching the new index
+
+    def tile(self, x, y):
+        if x < 0:
+            x += self.width
+        if y < 0:
+            y += self.height
+        if not self.land[y, x]:
+            return None
+        return TileView(self, x, y)
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, y):
+        if not -self.height <= y < self.height:
+            raise IndexError("world row out of range")
+        return WorldRow(self, y % self.height)
+
+    def __iter__(self):
+        return (WorldRow(self, y) for y in range(self.height))
+
+    def nbytes(self):
+        return self.land.nbytes + self.climate.nbytes + self.owner.nbytes + self.building.nbytes + self.unit_count.nbytes